@@ -1,54 +1,259 @@
 """
-6개월치 과거 데이터 백필
-예상 BigQuery 비용: ~3GB (무료 범위 내)
+과거 데이터 백필 (day/week 샤드 병렬 실행, 중단 후 재개 가능)
+- [start, end) 범위를 UTC 일 단위로 나누고, 아직 끝나지 않은 날들을 --shard 크기로 묶어 샤드 구성
+- 샤드마다 BigQuery job을 비동기로 제출하고 (동시 최대 --workers개) 완료 여부를 주기적으로 폴링
+- 완료된 job 결과 다운로드/분류/fold는 워커 풀에서 병렬로, DB 반영은 샤드 시간 순서대로
+  (오래된 샤드의 upsert가 최신 샤드의 delete를 덮어쓰지 않도록)
+- 반영이 끝난 날짜는 로컬 체크포인트 파일에 기록 → 재실행 시 남은 날짜만 처리
+
+사용법: python backfill.py --months 6 --shard week --workers 4
+예상 BigQuery 비용: 하루 day 테이블 ~수십 GB (dry run 예상치를 샤드마다 출력)
 """
 
+import argparse
+import json
 import os
-from datetime import datetime, timedelta
-from fetch_issues import fetch_good_first_issues, upsert_to_supabase
-from dotenv import load_dotenv
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from google.api_core.exceptions import Forbidden
+from google.cloud import bigquery
+
+from checkpoint import DEFAULT_STATE_PATH
+from fetch_issues import budgeter, plan_issue_events_query, start_query
+from issue_events import fold_issue_events
+from issue_sync import classify_event, membership, supabase, sync_issue_events, write_failures
+from metrics import metrics, record_run
+
+DEFAULT_CHECKPOINT_PATH = os.path.join(os.path.dirname(DEFAULT_STATE_PATH), "backfill_checkpoint.json")
+SHARD_DAYS = {"day": 1, "week": 7}
+POLL_INTERVAL_SECONDS = 2
+
+
+@dataclass
+class Shard:
+    days: list[datetime]
+    query: str = ""
+    planned_bytes: int = 0
+    job: bigquery.QueryJob | None = None
+    project: str = ""
+    started_at: float = 0.0
+    download: Future | None = None
+    rows: int = 0
+    error: Exception | None = None
+
+    @property
+    def start(self) -> datetime:
+        return self.days[0]
+
+    @property
+    def end(self) -> datetime:
+        return self.days[-1] + timedelta(days=1)
+
+    def __str__(self) -> str:
+        if len(self.days) == 1:
+            return self.start.strftime("%Y-%m-%d")
+        return f"{self.start.strftime('%Y-%m-%d')}~{self.days[-1].strftime('%Y-%m-%d')}"
+
+
+class BackfillCheckpoint:
+    """반영 완료된 날짜(YYYY-MM-DD) 목록을 JSON 파일로 유지 (샤드 크기를 바꿔도 재사용 가능)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.completed: set[str] = set()
+        if os.path.exists(path):
+            with open(path) as f:
+                self.completed = set(json.load(f).get("completed_days", []))
+
+    def is_done(self, day: datetime) -> bool:
+        return day.strftime("%Y-%m-%d") in self.completed
+
+    def mark_done(self, days: list[datetime]) -> None:
+        self.completed.update(day.strftime("%Y-%m-%d") for day in days)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"completed_days": sorted(self.completed)}, f)
+        os.replace(tmp_path, self.path)  # 중간에 죽어도 파일이 깨지지 않도록
+
+
+def plan_shards(start: datetime, end: datetime, shard_days: int, checkpoint: BackfillCheckpoint) -> list[Shard]:
+    """아직 끝나지 않은 날들을 연속 구간 안에서 shard_days 크기로 묶음"""
+    shards, run = [], []
+    day = start
+    while day < end:
+        if checkpoint.is_done(day):
+            if run:
+                shards.append(Shard(run))
+            run = []
+        else:
+            run.append(day)
+            if len(run) == shard_days:
+                shards.append(Shard(run))
+                run = []
+        day += timedelta(days=1)
+    if run:
+        shards.append(Shard(run))
+    return shards
+
+
+def submit(shard: Shard) -> None:
+    """dry run으로 바이트를 확인하고 job만 제출 (완료는 폴링으로 확인)"""
+    if not shard.query:
+        shard.query, shard.planned_bytes = plan_issue_events_query(shard.start, shard.end)
+    if not shard.query:
+        return
+    shard.job, shard.project = start_query(shard.query, shard.planned_bytes)
+    shard.started_at = time.monotonic()
+    print(f"[{shard}] submitted to {shard.project} (planned {shard.planned_bytes / 1e9:.2f} GB)")
 
-load_dotenv()
 
-# GCP 프로젝트 설정
-os.environ.setdefault("GOOGLE_CLOUD_PROJECT", "silver-pen-391310")
+def download(shard: Shard) -> list:
+    """완료된 job 결과를 스트리밍으로 받아 분류 + URL별 fold"""
+    def classified():
+        for row in shard.job.result():
+            shard.rows += 1
+            event = classify_event(row)
+            if event:
+                yield event
 
+    return list(fold_issue_events(classified()))
 
-def backfill_months(months: int = 6):
+
+def poll(shard: Shard, pool: ThreadPoolExecutor) -> None:
+    """job 완료 시 사용량 기록 후 결과 다운로드를 워커 풀에 넘김. 쿼터 초과면 다른 프로젝트로 재제출"""
+    if shard.job is None or shard.download is not None or not shard.job.done():
+        return
+
+    try:
+        shard.job.result(max_results=0)
+    except Forbidden as e:
+        if "quota" in str(e).lower():
+            print(f"[{shard}] quota exceeded on {shard.project}, resubmitting...")
+            metrics.count("bigquery.quota_exceeded")
+            budgeter.mark_exhausted(shard.project)
+            try:
+                submit(shard)
+            except Exception as resubmit_error:
+                shard.error = resubmit_error
+            return
+        shard.error = e
+    except Exception as e:
+        shard.error = e
+
+    if shard.error:
+        return
+    budgeter.record(shard.project, shard.job.total_bytes_billed or shard.job.total_bytes_processed or 0)
+    metrics.record_bigquery_job(shard.job, shard.project)
+    shard.download = pool.submit(download, shard)
+
+
+def apply(shard: Shard, checkpoint: BackfillCheckpoint, totals: dict) -> None:
+    """샤드 이벤트를 DB에 반영하고 체크포인트 기록 (쓰기 실패가 있었으면 기록하지 않음 → 재실행 시 다시 처리)"""
+    failures_before = sum(write_failures.values())
+    saved, closed, unlabeled = sync_issue_events(shard.download.result() if shard.download else [])
+    if sum(write_failures.values()) > failures_before:
+        print(f"[{shard}] some writes failed, not marked done")
+    else:
+        checkpoint.mark_done(shard.days)
+
+    scanned = (shard.job.total_bytes_processed or 0) if shard.job else 0
+    elapsed = time.monotonic() - shard.started_at if shard.started_at else 0
+    totals["bytes"] += scanned
+    totals["rows"] += shard.rows
+    metrics.add_rows("bigquery.issue_events", rows_in=shard.rows)
+    totals["saved"] += saved
+    totals["deleted"] += closed + unlabeled
+    print(f"[{shard}] {scanned / 1e9:.2f} GB scanned, {shard.rows} rows → "
+          f"{saved} upserted, {closed} closed, {unlabeled} unlabeled ({elapsed:.0f}s)")
+
+
+def backfill(start: datetime, end: datetime, shard_days: int, workers: int, checkpoint: BackfillCheckpoint) -> dict:
     """
-    과거 N개월치 데이터 백필
+    샤드를 최대 workers개까지 동시에 진행.
+    job 제출/폴링과 DB 반영은 메인 스레드, 결과 다운로드는 워커 풀.
     """
-    total_saved = 0
-    end_date = datetime.now() - timedelta(days=1)  # 어제부터
-    start_date = end_date - timedelta(days=months * 30)
-
-    print(f"Backfilling from {start_date.date()} to {end_date.date()}")
-    print(f"Total days: {(end_date - start_date).days}")
+    shards = plan_shards(start, end, shard_days, checkpoint)
+    print(f"Shards: {len(shards)} pending ({len(checkpoint.completed)} days already done)")
     print("=" * 50)
 
-    current = start_date
-    day_count = 0
+    totals = {"bytes": 0, "rows": 0, "saved": 0, "deleted": 0, "shards": 0}
+    pending = list(shards)
+    in_flight: list[Shard] = []  # 제출 ~ 반영 전, 시간 순서 유지
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while pending or in_flight:
+            while pending and len(in_flight) < workers:
+                shard = pending.pop(0)
+                try:
+                    submit(shard)
+                except Exception as e:
+                    shard.error = e
+                in_flight.append(shard)
+
+            for shard in in_flight:
+                if shard.error is None:
+                    poll(shard, pool)
+
+            # 앞에서부터 끝난 샤드만 순서대로 반영
+            while in_flight:
+                head = in_flight[0]
+                if head.error is None and head.download is not None and head.download.done():
+                    head.error = head.download.exception()
+                if head.error is not None:
+                    print(f"[{head}] ERROR - {head.error}")
+                    print(f"Backfill stopped at {head}; rerun to resume from here")
+                    for shard in in_flight[1:]:
+                        if shard.job is not None and not shard.job.done():
+                            shard.job.cancel()
+                    return totals
+                if head.job is not None and (head.download is None or not head.download.done()):
+                    break
+                apply(head, checkpoint, totals)
+                totals["shards"] += 1
+                in_flight.pop(0)
+
+            if in_flight:
+                time.sleep(POLL_INTERVAL_SECONDS)
+
+    return totals
+
+
+@record_run("backfill")
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--months", type=int, default=6)
+    parser.add_argument("--shard", choices=sorted(SHARD_DAYS), default="day")
+    parser.add_argument("--workers", type=int, default=4, help="동시에 진행할 샤드 수")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT_PATH)
+    parser.add_argument("--reset", action="store_true", help="체크포인트를 지우고 처음부터")
+    args = parser.parse_args()
+
+    if args.reset and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+    checkpoint = BackfillCheckpoint(args.checkpoint)
 
-    while current <= end_date:
-        date_str = current.strftime("%Y%m%d")
-        day_count += 1
+    # 어제까지 (오늘은 정기 ETL 담당)
+    end = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    start = end - timedelta(days=args.months * 30)
 
-        try:
-            issues = fetch_good_first_issues(date_str)
-            if issues:
-                saved = upsert_to_supabase(issues)
-                total_saved += saved
-                print(f"[{day_count}] {date_str}: {saved} issues saved")
-            else:
-                print(f"[{day_count}] {date_str}: no issues")
-        except Exception as e:
-            print(f"[{day_count}] {date_str}: ERROR - {e}")
+    print(f"Backfilling from {start.date()} to {(end - timedelta(days=1)).date()}")
+    print(f"Total days: {(end - start).days}, shard: {args.shard}, workers: {args.workers}")
 
-        current += timedelta(days=1)
+    started = time.monotonic()
+    membership.refresh(supabase)
+    totals = backfill(start, end, SHARD_DAYS[args.shard], args.workers, checkpoint)
+    membership.save()
 
     print("=" * 50)
-    print(f"Backfill complete! Total: {total_saved} issues")
+    print(f"Backfill done: {totals['shards']} shards, {totals['bytes'] / 1e9:.2f} GB scanned, "
+          f"{totals['rows']} rows, {totals['saved']} upserted, {totals['deleted']} deleted "
+          f"({time.monotonic() - started:.0f}s)")
+    print(f"BigQuery usage (rolling 30d): {budgeter.summary()}")
 
 
 if __name__ == "__main__":
-    backfill_months(6)
\ No newline at end of file
+    main()
@@ -0,0 +1,108 @@
+"""
+청크 단위 DB 쓰기 + 실패 청크 이분 재시도
+"""
+
+import time
+from typing import Callable
+
+from metrics import metrics
+
+MAX_TRANSIENT_RETRIES = 3
+
+
+class AdaptivePacer:
+    """
+    관측한 오류율에 따라 요청 간격 조절 (고정 sleep 대신)
+    - 일시적 오류(타임아웃, 5xx, 429 등): 간격 2배 (min_delay ~ max_delay)
+    - 성공: 간격 절반, min_delay 아래로 내려가면 대기 없음
+    """
+
+    def __init__(self, min_delay: float = 0.25, max_delay: float = 8.0):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.delay = 0.0
+        self.total_wait = 0.0
+
+    def wait(self) -> None:
+        if self.delay:
+            time.sleep(self.delay)
+            self.total_wait += self.delay
+            metrics.add_wait("supabase.pacing", self.delay)
+
+    def success(self) -> None:
+        self.delay = self.delay / 2 if self.delay / 2 >= self.min_delay else 0.0
+
+    def failure(self) -> None:
+        self.delay = min(self.max_delay, max(self.min_delay, self.delay * 2))
+
+
+def is_data_error(error: Exception) -> bool:
+    """행 데이터 때문에 실패했는지 (Postgres SQLSTATE 22xxx/23xxx: 재시도해도 같은 결과)"""
+    code = str(getattr(error, "code", "") or "")
+    return code.startswith("22") or code.startswith("23")
+
+
+def is_violation(error: Exception, code: str, constraint: str) -> bool:
+    """constraint(인덱스/제약 이름)에 대한 SQLSTATE code 위반인지"""
+    if str(getattr(error, "code", "") or "") != code:
+        return False
+    text = f"{getattr(error, 'message', '')} {getattr(error, 'details', '')} {error}"
+    return constraint in text
+
+
+def is_unique_violation(error: Exception, constraint: str) -> bool:
+    """constraint의 unique 위반(23505)인지"""
+    return is_violation(error, "23505", constraint)
+
+
+def is_foreign_key_violation(error: Exception, constraint: str) -> bool:
+    """constraint의 FK 위반(23503)인지"""
+    return is_violation(error, "23503", constraint)
+
+
+def write_in_chunks(rows: list, write_fn: Callable[[list], None], chunk_size: int,
+                    label: str = "rows", pacer: AdaptivePacer | None = None,
+                    data_error: Callable[[Exception], bool] = is_data_error) -> tuple[int, list]:
+    """
+    rows를 chunk_size 단위로 write_fn에 전달.
+    - 데이터 오류(data_error, 기본 22xxx/23xxx)로 실패한 청크는 반으로 나눠 재시도 → 문제 행을 O(log n) 요청으로 격리
+    - 그 밖의 일시적 오류는 나누지 않고 같은 청크를 pacer 간격으로 최대 MAX_TRANSIENT_RETRIES번 재시도,
+      그래도 실패하면 청크 전체를 실패로 (나눠 봐야 같은 오류로 요청만 늘어남)
+    pacer가 없으면 이 호출 안에서만 쓰는 pacer 사용.
+
+    Returns: (성공한 행 수, 실패한 (행, 오류) 목록)
+    """
+    pacer = pacer or AdaptivePacer()
+    written = 0
+    failed = []
+
+    def write(chunk: list, retries: int = 0):
+        nonlocal written
+        pacer.wait()
+        try:
+            write_fn(chunk)
+            written += len(chunk)
+            pacer.success()
+        except Exception as e:
+            if not data_error(e):
+                if retries < MAX_TRANSIENT_RETRIES:
+                    pacer.failure()
+                    metrics.count("supabase.retries")
+                    write(chunk, retries + 1)
+                    return
+                print(f"  Failed to write {len(chunk)} {label} after {retries} retries: {e}")
+                failed.extend((row, e) for row in chunk)
+                return
+            if len(chunk) == 1:
+                print(f"  Failed to write 1 {label}: {e}")
+                failed.append((chunk[0], e))
+                return
+            mid = len(chunk) // 2
+            metrics.count("supabase.chunk_splits")
+            write(chunk[:mid])
+            write(chunk[mid:])
+
+    for i in range(0, len(rows), chunk_size):
+        write(rows[i:i + chunk_size])
+
+    return written, failed
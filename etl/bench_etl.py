@@ -0,0 +1,230 @@
+"""
+ETL 전체 벤치마크 (로컬 가짜 Supabase/BigQuery/GitHub, bench_fakes.py)
+규모(이벤트 수)마다 같은 합성 세계에 대해 실제 진입점을 순서대로 실행:
+  fetch_issues.main → fetch_issues_github.main → enrich_repos.main
+- 각 진입점은 별도 프로세스 (모듈 import 시점의 클라이언트/상태가 섞이지 않도록, RSS도 따로 측정)
+- 가짜 Supabase/GitHub는 이 프로세스의 스레드, BigQuery는 자식 프로세스 안에서 bigquery.Client를 교체
+- wall time, peak RSS, 서비스별 요청 수/바이트, 입력 행/초, DB에 쓴 행 수를 출력
+- --save로 결과를 저장하고 --compare로 이전 결과와 비교 (wall time/요청 수가 --threshold 이상 늘면 exit 1)
+
+사용법: python bench_etl.py --scales 10000 100000 1000000 [--latency-ms 5] [--save bench.json]
+        python bench_etl.py --scales 10000 --compare bench.json
+"""
+
+import argparse
+import importlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_fakes import FakeBigQueryClient, FakeGitHubAPI, FakePostgrest, SyntheticWorld, WorldConfig, \
+    install_fake_bigquery
+
+SCRIPTS = ["fetch_issues", "fetch_issues_github", "enrich_repos"]
+ETL_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def world_config(args, events: int) -> WorldConfig:
+    return WorldConfig(
+        events=events, seed=args.seed, gfi_rate=args.gfi_rate, variant_rate=args.variant_rate,
+        churn=args.churn, repo_skew=args.repo_skew, drift=args.drift, transfer_rate=args.transfer_rate,
+    )
+
+
+def run_child(args) -> None:
+    """(자식 프로세스) 진입점 하나를 실행하고 결과를 JSON 파일로"""
+    if args.child == "fetch_issues":
+        install_fake_bigquery(SyntheticWorld(world_config(args, args.events)))
+
+    module = importlib.import_module(args.child)
+    started = time.monotonic()
+    module.main()
+    wall = time.monotonic() - started
+
+    result = {
+        "wall": wall,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "bigquery": {"queries": FakeBigQueryClient.queries, "dry_runs": FakeBigQueryClient.dry_runs,
+                     "rows": FakeBigQueryClient.rows_returned},
+    }
+    with open(args.result, "w") as f:
+        json.dump(result, f)
+
+
+def run_script(script: str, args, events: int, env: dict, log) -> dict:
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        result_path = f.name
+    command = [sys.executable, os.path.abspath(__file__), "--child", script, "--events", str(events),
+               "--result", result_path] + world_args(args)
+    started = time.monotonic()
+    proc = subprocess.run(command, cwd=ETL_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+    elapsed = time.monotonic() - started
+    if proc.returncode != 0:
+        raise RuntimeError(f"{script} exited with {proc.returncode} (see log)")
+    with open(result_path) as f:
+        result = json.load(f)
+    os.remove(result_path)
+    result["process_wall"] = elapsed
+    return result
+
+
+def world_args(args) -> list[str]:
+    return ["--seed", str(args.seed), "--gfi-rate", str(args.gfi_rate), "--variant-rate", str(args.variant_rate),
+            "--churn", str(args.churn), "--repo-skew", str(args.repo_skew), "--drift", str(args.drift),
+            "--transfer-rate", str(args.transfer_rate)]
+
+
+def run_scale(args, events: int, log) -> list[dict]:
+    """규모 하나: 빈 DB에서 세 진입점을 순서대로 (앞 단계가 쓴 데이터를 다음 단계가 사용)"""
+    world = SyntheticWorld(world_config(args, events))
+    latency = args.latency_ms / 1000
+    started = time.monotonic()
+    db = FakePostgrest(latency)
+    github = FakeGitHubAPI(world, latency)
+    print(f"[{events} events] world ready in {time.monotonic() - started:.1f}s "
+          f"({len(github.corpus)} open good-first issues on fake GitHub)")
+
+    db_url = db.start()
+    github_url = github.start()
+    results = []
+    with tempfile.TemporaryDirectory() as state_dir:
+        env = {key: value for key, value in os.environ.items() if not key.startswith(("GCP_", "GITHUB_"))}
+        env.update({
+            "SUPABASE_URL": db_url,
+            "SUPABASE_KEY": "bench",
+            "GITHUB_API_URL": github_url,
+            "GITHUB_TOKEN": "bench",
+            "ETL_STATE_BACKEND": "sqlite",
+            "ETL_STATE_PATH": os.path.join(state_dir, "etl_state.sqlite3"),
+            "ENRICH_CACHE_PATH": os.path.join(state_dir, "repo_metadata.sqlite3"),
+            "MEMBERSHIP_PATH": os.path.join(state_dir, "issue_membership.bin"),
+            "PYTHONUNBUFFERED": "1",
+        })
+
+        for script in args.scripts:
+            db.counter.reset()
+            github.counter.reset()
+            written_before = db.rows_written
+            served_before = github.items_served
+            unchecked_before = sum(1 for row in db.tables["repos"].rows.values() if row.get("checked_at") is None)
+            print(f"  {script}...", end="", flush=True)
+            result = run_script(script, args, events, env, log)
+
+            if script == "fetch_issues":
+                rows_in = result["bigquery"]["rows"]
+            elif script == "fetch_issues_github":
+                rows_in = github.items_served - served_before
+            else:
+                rows_in = unchecked_before
+
+            result.update({
+                "events": events,
+                "script": script,
+                "rows_in": rows_in,
+                "rows_written": db.rows_written - written_before,
+                "rows_per_sec": rows_in / result["wall"] if result["wall"] else 0,
+                "supabase": db.counter.snapshot(),
+                "github": github.counter.snapshot(),
+                "issues_stored": len(db.tables["issues"].rows),
+            })
+            results.append(result)
+            print(f" {result['wall']:.1f}s")
+
+    db.stop()
+    github.stop()
+    return results
+
+
+def describe(result: dict) -> str:
+    bq = result["bigquery"]
+    bq_part = f", bq {bq['queries']}q+{bq['dry_runs']}dry" if bq["queries"] or bq["dry_runs"] else ""
+    return (f"{result['script']:<20} {result['wall']:7.1f}s  rss {result['peak_rss_mb']:6.0f} MB  "
+            f"in {result['rows_in']:>8} ({result['rows_per_sec']:>8.0f}/s)  written {result['rows_written']:>8}  "
+            f"supabase {result['supabase']['total']:>6} req ({result['supabase']['bytes_out'] / 1e6:.1f} MB out)  "
+            f"github {result['github']['total']:>5} req{bq_part}")
+
+
+def compare(results: list[dict], baseline_path: str, threshold: float) -> list[str]:
+    """같은 (규모, 진입점)의 wall time/요청 수가 threshold 비율 이상 늘었으면 회귀로 보고"""
+    with open(baseline_path) as f:
+        baseline = {(r["events"], r["script"]): r for r in json.load(f)}
+
+    regressions = []
+    for result in results:
+        before = baseline.get((result["events"], result["script"]))
+        if not before:
+            continue
+        checks = {
+            "wall": (before["wall"], result["wall"]),
+            "supabase requests": (before["supabase"]["total"], result["supabase"]["total"]),
+            "github requests": (before["github"]["total"], result["github"]["total"]),
+            "peak rss": (before["peak_rss_mb"], result["peak_rss_mb"]),
+        }
+        for name, (old, new) in checks.items():
+            if old and new > old * (1 + threshold):
+                regressions.append(f"{result['script']} @ {result['events']}: {name} {old:.1f} → {new:.1f} "
+                                   f"(+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--scripts", nargs="+", default=SCRIPTS, choices=SCRIPTS)
+    parser.add_argument("--latency-ms", type=float, default=5, help="가짜 Supabase/GitHub 요청당 지연")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--gfi-rate", type=float, default=0.5)
+    parser.add_argument("--variant-rate", type=float, default=0.3)
+    parser.add_argument("--churn", type=float, default=0.4)
+    parser.add_argument("--repo-skew", type=float, default=2.0)
+    parser.add_argument("--drift", type=float, default=0.05)
+    parser.add_argument("--transfer-rate", type=float, default=0.01)
+    parser.add_argument("--log", default=os.path.join(tempfile.gettempdir(), "bench_etl.log"),
+                        help="ETL 출력 로그 파일")
+    parser.add_argument("--save", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="회귀로 볼 증가 비율")
+    # 자식 프로세스용
+    parser.add_argument("--child", choices=SCRIPTS, help=argparse.SUPPRESS)
+    parser.add_argument("--events", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    results = []
+    with open(args.log, "w") as log:
+        for events in args.scales:
+            results.extend(run_scale(args, events, log))
+
+    print("=" * 50)
+    for events in args.scales:
+        print(f"{events} events:")
+        for result in results:
+            if result["events"] == events:
+                print(f"  {describe(result)}")
+    print(f"ETL output: {args.log}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved results to {args.save}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print("Regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            raise SystemExit(1)
+        print(f"No regressions against {args.compare} (threshold {args.threshold * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+이벤트 fold 리플레이 벤치마크
+합성 이벤트 로그(열림/닫힘/재오픈/라벨 추가·제거 churn)를 두 방식으로 재생해 비교
+- legacy: upsert 집합과 delete 집합을 따로 모은 뒤 upsert → delete 순서로 반영 (기존 방식)
+- fold: URL별 발생 시각 순으로 최종 상태 하나만 반영 (issue_events.fold_issue_events)
+
+사용법: python bench_event_fold.py --issues 100000 --churn 0.3
+"""
+
+import argparse
+import random
+import time
+
+from issue_events import fold_issue_events
+
+ACTIONS = ["labeled_gfi", "unlabeled_gfi", "closed", "reopened", "labeled_other"]
+
+
+def generate_events(issues: int, churn: float, seed: int) -> list[tuple]:
+    """
+    (timestamp, url, action, is_open, has_gfi) 이벤트 로그 생성 (시각 순으로 섞임)
+    churn: 이슈가 첫 이벤트 이후 추가 상태 변화를 겪을 확률
+    """
+    rng = random.Random(seed)
+    events = []
+
+    for i in range(issues):
+        url = f"https://github.com/o{i % 997}/r{i % 31}/issues/{i}"
+        ts = rng.uniform(0, 3 * 3600)
+        is_open, has_gfi = True, rng.random() < 0.6
+        events.append((ts, url, "opened", is_open, has_gfi))
+
+        while rng.random() < churn:
+            ts += rng.uniform(1, 600)
+            action = rng.choice(ACTIONS)
+            if action == "labeled_gfi":
+                has_gfi = True
+            elif action == "unlabeled_gfi":
+                has_gfi = False
+            elif action == "closed":
+                is_open = False
+            elif action == "reopened":
+                is_open = True
+            events.append((ts, url, action, is_open, has_gfi))
+
+    events.sort(key=lambda e: e[0])
+    return events
+
+
+def ground_truth(events: list[tuple]) -> set[str]:
+    """마지막 상태가 open + good first 라벨인 URL 집합"""
+    final = {}
+    for _, url, _, is_open, has_gfi in events:
+        final[url] = is_open and has_gfi
+    return {url for url, stored in final.items() if stored}
+
+
+def classify(event: tuple):
+    """issue_sync.classify_event와 같은 규칙으로 (kind, url, issue) 분류"""
+    _, url, action, is_open, has_gfi = event
+    if action == "closed":
+        return "closed", url, None
+    if action == "unlabeled_gfi":
+        return "unlabeled", url, None
+    if action in ("opened", "labeled_gfi", "labeled_other", "reopened") and is_open and has_gfi:
+        return "upsert", url, {"url": url}
+    return None
+
+
+def replay_legacy(events: list[tuple]) -> tuple[set[str], int]:
+    upserts, deletes = set(), set()
+    for event in events:
+        classified = classify(event)
+        if not classified:
+            continue
+        kind, url, _ = classified
+        (upserts if kind == "upsert" else deletes).add(url)
+    return upserts - deletes, len(upserts) + len(deletes)
+
+
+def replay_fold(events: list[tuple]) -> tuple[set[str], int]:
+    # BigQuery의 ORDER BY url, created_at, event_id에 해당 (같은 시각은 안정 정렬로 생성 순서 = id 순)
+    ordered = sorted(events, key=lambda e: (e[1], e[0]))
+    classified = (classify(event) for event in ordered)
+
+    stored, writes = set(), 0
+    for kind, url, _ in fold_issue_events(c for c in classified if c):
+        writes += 1
+        if kind == "upsert":
+            stored.add(url)
+    return stored, writes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--issues", type=int, default=100000)
+    parser.add_argument("--churn", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    events = generate_events(args.issues, args.churn, args.seed)
+    expected = ground_truth(events)
+    print(f"Synthetic log: {args.issues} issues, {len(events)} events, churn={args.churn}")
+    print(f"Expected stored issues: {len(expected)}")
+    print("=" * 50)
+
+    for name, replay in (("legacy", replay_legacy), ("fold", replay_fold)):
+        start = time.perf_counter()
+        stored, writes = replay(events)
+        elapsed = time.perf_counter() - start
+        wrong = len(stored ^ expected)
+        print(f"{name:>6}: writes={writes:>8}  wrong_final_state={wrong:>6}  "
+              f"{elapsed:.2f}s ({len(events) / elapsed:,.0f} events/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,873 @@
+"""
+ETL 벤치마크용 합성 데이터 + 로컬 가짜 서비스 (bench_etl.py)
+- SyntheticWorld: IssuesEvent 생성기 (라벨 구성, 닫힘/재오픈 churn, 레포 쏠림). 이슈 index만으로 재생성 가능
+  → 가짜 서버(부모 프로세스)와 ETL(자식 프로세스)이 같은 세계를 각자 만들어 씀
+- FakePostgrest: ETL이 쓰는 만큼의 PostgREST (select/upsert/delete 필터, count, RPC, unique/FK 제약)
+- FakeGitHubAPI: /rate_limit, /search/issues, /repos/{owner}/{name}, /graphql (alias 배치 쿼리)
+- FakeBigQueryClient: bigquery.Client 대신 설치, 쿼리 범위 안에 세계의 이벤트를 후보 행으로 스트리밍
+"""
+
+import bisect
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+GOOD_FIRST_LABEL = "good first issue"
+GOOD_FIRST_VARIANTS = ["good-first-issue", "Good First Issue", "beginner friendly", "easy", "first-timers-only"]
+OTHER_LABELS = ["bug", "enhancement", "documentation", "help wanted", "question"]
+LANGUAGES = ["Python", "JavaScript", "TypeScript", "Go", "Rust", "Java", "C++", None]
+SEARCH_SPAN = timedelta(days=30)
+
+
+# ============================================
+# 합성 세계
+# ============================================
+
+@dataclass
+class WorldConfig:
+    events: int  # 생성할 IssuesEvent 수 (대략)
+    seed: int = 7
+    gfi_rate: float = 0.5  # 열릴 때 good-first 계열 라벨이 붙어 있는 비율
+    variant_rate: float = 0.3  # good-first 라벨 중 표기 변형("good-first-issue" 등) 비율
+    churn: float = 0.4  # 이슈마다 추가 이벤트(닫힘/재오픈/라벨 변경)가 이어질 확률
+    repo_skew: float = 2.0  # 클수록 소수 레포에 이슈가 몰림
+    drift: float = 0.05  # 수집 이후 GitHub에서 닫힌 열린 이슈 비율 (정합성 확인 대상)
+    transfer_rate: float = 0.01  # 다른 레포로 이전된 이슈 비율 (github_id 충돌 경로)
+
+    @property
+    def repos(self) -> int:
+        return max(10, self.events // 50)
+
+
+@dataclass
+class SyntheticIssue:
+    index: int
+    repo: str  # GH Archive 이벤트 기준 레포
+    github_repo: str  # 현재 GitHub 기준 레포 (이전된 이슈는 다름)
+    created_frac: float  # 수집 범위 안에서 생성 시점 (0~1)
+    title: str
+    comments: int
+    events: list  # [(offset 0~1, action, labels, changed_label, state)]
+    open_on_github: bool
+    labels: list[str]  # 최종 라벨
+
+    @property
+    def number(self) -> int:
+        return self.index + 1
+
+    @property
+    def github_id(self) -> int:
+        return 10 ** 9 + self.index
+
+    def url(self, repo: str | None = None) -> str:
+        return f"https://github.com/{repo or self.repo}/issues/{self.number}"
+
+
+class SyntheticWorld:
+    def __init__(self, config: WorldConfig):
+        self.config = config
+
+    def issue(self, index: int) -> SyntheticIssue:
+        """index만으로 결정되는 이슈 하나 (부모/자식 프로세스에서 같은 결과)"""
+        cfg = self.config
+        rng = random.Random(cfg.seed * 1_000_003 + index)
+        r = int(cfg.repos * rng.random() ** cfg.repo_skew)
+        repo = f"org{r % 997}/repo{r}"
+        github_repo = f"org{r % 997}/moved{r}" if rng.random() < cfg.transfer_rate else repo
+
+        labels = [rng.choice(OTHER_LABELS)] if rng.random() < 0.5 else []
+        if rng.random() < cfg.gfi_rate:
+            labels.append(rng.choice(GOOD_FIRST_VARIANTS) if rng.random() < cfg.variant_rate else GOOD_FIRST_LABEL)
+
+        state = "open"
+        events = [(0.0, "opened", list(labels), None, state)]
+        offset = 0.0
+        while rng.random() < cfg.churn and len(events) < 8:
+            offset += rng.uniform(0, (1 - offset) / 2)
+            gfi = [label for label in labels if label == GOOD_FIRST_LABEL or label in GOOD_FIRST_VARIANTS]
+            choice = rng.random()
+            changed = None
+            if choice < 0.35:
+                action = "closed" if state == "open" else "reopened"
+                state = "closed" if state == "open" else "open"
+            elif choice < 0.6 and not gfi:
+                action, changed = "labeled", GOOD_FIRST_LABEL
+                labels.append(changed)
+            elif choice < 0.8 and gfi:
+                action, changed = "unlabeled", gfi[0]
+                labels.remove(changed)
+            else:
+                action, changed = "labeled", rng.choice(OTHER_LABELS)
+                if changed not in labels:
+                    labels.append(changed)
+            events.append((offset, action, list(labels), changed, state))
+
+        open_on_github = state == "open" and rng.random() >= cfg.drift
+        return SyntheticIssue(
+            index=index, repo=repo, github_repo=github_repo, created_frac=rng.random(),
+            title=f"Synthetic issue {index} " + "x" * rng.randint(5, 60), comments=rng.randint(0, 12),
+            events=events, open_on_github=open_on_github, labels=labels,
+        )
+
+    def issues(self):
+        """이벤트 수가 config.events에 도달할 때까지 이슈를 순서대로 생성"""
+        total = 0
+        index = 0
+        while total < self.config.events:
+            issue = self.issue(index)
+            total += len(issue.events)
+            index += 1
+            yield issue
+
+    def archive_events(self, start: datetime, end: datetime):
+        """[start, end) 범위로 펼친 GH Archive 형식 IssuesEvent (이슈별로 연속, 이슈 안에서는 시각 순)"""
+        span = (end - start).total_seconds()
+        event_id = 0
+        for issue in self.issues():
+            for offset, action, labels, changed, state in issue.events:
+                frac = issue.created_frac + (1 - issue.created_frac) * offset
+                created_at = start + timedelta(seconds=span * frac)
+                payload = {
+                    "action": action,
+                    "issue": {
+                        "id": issue.github_id,
+                        "number": issue.number,
+                        "title": issue.title,
+                        "html_url": issue.url(),
+                        "user": {"login": f"user{issue.index % 5000}"},
+                        "labels": [{"name": label} for label in labels],
+                        "state": state,
+                        "created_at": format_time(start + timedelta(seconds=span * issue.created_frac)),
+                        "comments": issue.comments,
+                    },
+                }
+                if changed:
+                    payload["label"] = {"name": changed}
+                event_id += 1
+                yield {"id": str(event_id), "type": "IssuesEvent", "repo": {"name": issue.repo}, "payload": payload,
+                       "created_at": format_time(created_at)}
+
+    @staticmethod
+    def repo_metadata(repo: str) -> dict | None:
+        """레포 이름으로 결정되는 메타데이터 (None = 삭제된 레포)"""
+        rng = random.Random(zlib.crc32(repo.encode()))
+        if rng.random() < 0.02:
+            return None
+        return {"stars": int(10 ** (rng.random() * 5)), "language": rng.choice(LANGUAGES)}
+
+
+def format_time(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+# ============================================
+# 공통 HTTP 서버
+# ============================================
+
+class RequestCounter:
+    """서비스별 요청 수/바이트 집계"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.requests: dict[str, int] = {}
+            self.bytes_in = 0
+            self.bytes_out = 0
+
+    def record(self, key: str, bytes_in: int, bytes_out: int):
+        with self.lock:
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {"requests": dict(self.requests), "total": sum(self.requests.values()),
+                    "bytes_in": self.bytes_in, "bytes_out": self.bytes_out}
+
+
+class FakeService:
+    """ThreadingHTTPServer 위에서 handle(method, path, params, headers, body)를 호출"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.counter = RequestCounter()
+        self.server: ThreadingHTTPServer | None = None
+
+    def handle(self, method: str, path: str, params: list, headers, body: bytes) -> tuple[int, dict, object]:
+        raise NotImplementedError
+
+    def count_key(self, method: str, path: str) -> str:
+        return f"{method} {path}"
+
+    def start(self) -> str:
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def log_message(self, *args):
+                pass
+
+            def _dispatch(self, method: str):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                parsed = urlparse(self.path)
+                if service.latency:
+                    time.sleep(service.latency)
+                try:
+                    status, headers, payload = service.handle(
+                        method, parsed.path, parse_qsl(parsed.query, keep_blank_values=True), self.headers, body
+                    )
+                except Exception as e:
+                    status, headers, payload = 500, {}, {"message": f"fake server error: {e!r}"}
+                data = b"" if payload is None else json.dumps(payload).encode()
+                service.counter.record(service.count_key(method, parsed.path), len(body), len(data))
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def do_PATCH(self):
+                self._dispatch("PATCH")
+
+            def do_DELETE(self):
+                self._dispatch("DELETE")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+# ============================================
+# Supabase (PostgREST)
+# ============================================
+
+class PostgrestError(Exception):
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+
+def normalize_time(value) -> str | None:
+    """timestamptz 값을 고정 길이 UTC 문자열로 (문자열 비교 = 시각 비교)"""
+    if value in (None, ""):
+        return None
+    ts = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f+00:00")
+
+
+def split_top_level(text: str) -> list[str]:
+    """쉼표로 나누되 따옴표/괄호 안은 유지"""
+    parts, depth, quoted, current = [], 0, False, []
+    for ch in text:
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and ch == ",":
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(ch)
+    if current:
+        parts.append("".join(current))
+    return parts
+
+
+def unquote(value: str) -> str:
+    return value[1:-1] if len(value) >= 2 and value[0] == value[-1] == '"' else value
+
+
+class Table:
+    def __init__(self, name: str, key: str, ints=(), times=(), bools=(), unique=()):
+        self.name = name
+        self.key = key
+        self.ints = set(ints)
+        self.times = set(times)
+        self.bools = set(bools)
+        self.unique = {column: {} for column in unique}  # column → value → key
+        self.rows: dict = {}
+        self.next_id = 1
+        self.version = 0  # insert/update 시 증가 (정렬 캐시 무효화)
+        self._sorted: dict = {}
+
+    def coerce(self, column: str, value):
+        if value is None or value == "null":
+            return None
+        if column in self.ints:
+            return int(value)
+        if column in self.times:
+            return normalize_time(value)
+        if column in self.bools:
+            return value if isinstance(value, bool) else str(value).lower() == "true"
+        return value
+
+    def sorted_keys(self, order: list[tuple[str, bool]]) -> list:
+        """order 기준 정렬된 (정렬 키, 행 키) 목록. 삭제는 무효화하지 않음 (조회 시 존재 확인)"""
+        cache_key = tuple(order)
+        cached = self._sorted.get(cache_key)
+        if cached and cached[0] == self.version:
+            return cached[1]
+        entries = sorted(
+            ((tuple(row.get(column) is None for column, _ in order),
+              tuple(row.get(column) for column, _ in order)), key)
+            for key, row in self.rows.items()
+        )
+        if any(desc for _, desc in order):
+            entries.reverse()  # 벤치에서 쓰는 desc 정렬은 단일 컬럼뿐
+        self._sorted[cache_key] = (self.version, entries)
+        return entries
+
+
+class FakePostgrest(FakeService):
+    """ETL이 쓰는 PostgREST 기능만 구현한 메모리 DB"""
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(latency)
+        self.lock = threading.Lock()
+        self.tables = {
+            "issues": Table("issues", "id", ints=("id", "github_id", "issue_number", "comment_count"),
+                            times=("created_at", "updated_at", "fetched_at"), bools=("is_open",),
+                            unique=("url", "github_id")),
+            "repos": Table("repos", "repo_full_name", ints=("stars", "reconcile_failures"),
+                           times=("created_at", "checked_at", "reconcile_retry_at")),
+        }
+        self.rows_written = 0
+
+    def count_key(self, method: str, path: str) -> str:
+        return f"{method} {path.removeprefix('/rest/v1/')}"
+
+    def handle(self, method, path, params, headers, body):
+        if not path.startswith("/rest/v1/"):
+            return 404, {}, {"message": "not found"}
+        name = path.removeprefix("/rest/v1/")
+        prefer = headers.get("Prefer") or ""
+        payload = json.loads(body) if body else None
+        try:
+            with self.lock:
+                if name.startswith("rpc/"):
+                    return 200, {}, self.rpc(name.removeprefix("rpc/"), payload or {})
+                table = self.tables.get(name)
+                if table is None:
+                    raise PostgrestError(404, "42P01", f'relation "public.{name}" does not exist')
+                if method == "GET":
+                    return self.select(table, params, prefer)
+                if method == "POST":
+                    return self.upsert(table, params, prefer, payload)
+                if method == "DELETE":
+                    return self.delete(table, params, prefer)
+        except PostgrestError as e:
+            return e.status, {}, {"code": e.code, "message": str(e), "details": None, "hint": None}
+        return 405, {}, {"message": f"{method} not supported"}
+
+    # ---- 필터 ----
+
+    def parse_filters(self, table: Table, params: list) -> tuple[list, dict]:
+        options = {}
+        filters = []
+        for key, value in params:
+            if key in ("select", "order", "limit", "offset", "on_conflict", "columns"):
+                options[key] = value
+            elif key == "or":
+                filters.append(("or", self.parse_expression(table, value.strip()[1:-1])))
+            else:
+                filters.append(self.parse_condition(table, key, value))
+        return filters, options
+
+    def parse_condition(self, table: Table, column: str, value: str):
+        negate = value.startswith("not.")
+        if negate:
+            value = value[4:]
+        op, _, arg = value.partition(".")
+        if op == "in":
+            arg = {table.coerce(column, unquote(v)) for v in split_top_level(arg[1:-1])}
+        elif op == "is":
+            arg = None if arg == "null" else arg == "true"
+        else:
+            arg = table.coerce(column, unquote(arg))
+        return (op, column, arg, negate)
+
+    def parse_expression(self, table: Table, text: str) -> list:
+        """or=(a.gt.1,and(a.eq.1,b.gt.2)) 안쪽"""
+        terms = []
+        for part in split_top_level(text):
+            if part.startswith("and("):
+                terms.append(("and", [self.parse_condition(table, *term.split(".", 1))
+                                      for term in split_top_level(part[4:-1])]))
+            else:
+                column, _, value = part.partition(".")
+                terms.append(self.parse_condition(table, column, value))
+        return terms
+
+    def matches(self, row: dict, condition) -> bool:
+        if condition[0] == "or":
+            return any(self.matches(row, term) for term in condition[1])
+        if condition[0] == "and":
+            return all(self.matches(row, term) for term in condition[1])
+        op, column, arg, negate = condition
+        value = row.get(column)
+        if op == "is":
+            result = value is arg
+        elif op == "in":
+            result = value in arg
+        elif value is None:
+            result = False
+        elif op == "eq":
+            result = value == arg
+        elif op == "gt":
+            result = value > arg
+        elif op == "gte":
+            result = value >= arg
+        elif op == "lt":
+            result = value < arg
+        elif op == "lte":
+            result = value <= arg
+        else:
+            raise PostgrestError(400, "PGRST100", f"unsupported operator {op}")
+        return not result if negate else result
+
+    def candidates(self, table: Table, filters: list, order: list, limit: int | None) -> list:
+        """인덱스로 후보 행 키를 좁힌 뒤 필터/정렬/limit 적용"""
+        for condition in filters:
+            op, column = condition[0], condition[1] if condition[0] not in ("or", "and") else None
+            if op in ("in", "eq") and not condition[3]:
+                values = condition[2] if op == "in" else {condition[2]}
+                if column == table.key:
+                    keys = [value for value in values if value in table.rows]
+                elif column in table.unique:
+                    index = table.unique[column]
+                    keys = [index[value] for value in values if value in index]
+                else:
+                    continue
+                rows = [table.rows[key] for key in keys if key in table.rows]
+                rows = [row for row in rows if all(self.matches(row, c) for c in filters)]
+                return self.sort(rows, order)[:limit] if limit else self.sort(rows, order)
+
+        if not order:
+            rows = (row for row in table.rows.values() if all(self.matches(row, c) for c in filters))
+            result = []
+            for row in rows:
+                result.append(row)
+                if limit and len(result) >= limit:
+                    break
+            return result
+
+        entries = table.sorted_keys(order)
+        start = self.keyset_start(entries, filters, order)
+        result = []
+        for _, key in entries[start:]:
+            row = table.rows.get(key)
+            if row is not None and all(self.matches(row, c) for c in filters):
+                result.append(row)
+                if limit and len(result) >= limit:
+                    break
+        return result
+
+    @staticmethod
+    def keyset_start(entries: list, filters: list, order: list) -> int:
+        """정렬 첫 컬럼의 하한(gt/gte, 또는 (a, b) > (x, y) 형태 or)으로 시작 위치 bisect"""
+        if not order or order[0][1]:
+            return 0
+        first = order[0][0]
+        bound = None
+        for condition in filters:
+            if condition[0] in ("gt", "gte") and condition[1] == first and not condition[3]:
+                bound = condition[2]
+            elif condition[0] == "or":
+                terms = condition[1]
+                if terms and terms[0][0] == "gt" and terms[0][1] == first:
+                    bound = terms[0][2]  # (a > x) or (a = x and b > y) → a >= x부터
+        if bound is None:
+            return 0
+        return bisect.bisect_left(entries, ((False,), (bound,)),
+                                  key=lambda entry: (entry[0][0][:1], entry[0][1][:1]))
+
+    @staticmethod
+    def sort(rows: list, order: list) -> list:
+        for column, desc in reversed(order):
+            rows = sorted(rows, key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+        return rows
+
+    @staticmethod
+    def parse_order(value: str | None) -> list[tuple[str, bool]]:
+        order = []
+        for part in (value or "").split(","):
+            if part:
+                column, _, direction = part.partition(".")
+                order.append((column, direction.startswith("desc")))
+        return order
+
+    @staticmethod
+    def project(rows: list, select: str | None) -> list:
+        columns = [c.strip() for c in (select or "*").split(",")]
+        if "*" in columns:
+            return [dict(row) for row in rows]
+        return [{column: row.get(column) for column in columns} for row in rows]
+
+    # ---- 요청 ----
+
+    def select(self, table: Table, params: list, prefer: str):
+        filters, options = self.parse_filters(table, params)
+        order = self.parse_order(options.get("order"))
+        limit = int(options["limit"]) if "limit" in options else None
+        rows = self.candidates(table, filters, order, limit)
+        headers = {}
+        if "count=" in prefer:
+            total = sum(1 for row in table.rows.values() if all(self.matches(row, c) for c in filters))
+            headers["Content-Range"] = f"0-{max(len(rows) - 1, 0)}/{total}"
+        return 200, headers, self.project(rows, options.get("select"))
+
+    def delete(self, table: Table, params: list, prefer: str):
+        filters, _ = self.parse_filters(table, params)
+        rows = self.candidates(table, filters, [], None)
+        for row in rows:
+            self.remove(table, row)
+        headers = {"Content-Range": f"*/{len(rows)}"} if "count=" in prefer else {}
+        if "return=minimal" in prefer:
+            return 204, headers, None
+        return 200, headers, rows
+
+    def remove(self, table: Table, row: dict):
+        del table.rows[row[table.key]]
+        for column, index in table.unique.items():
+            if row.get(column) is not None and index.get(row[column]) == row[table.key]:
+                del index[row[column]]
+
+    def upsert(self, table: Table, params: list, prefer: str, payload):
+        _, options = self.parse_filters(table, params)
+        rows = payload if isinstance(payload, list) else [payload]
+        conflict = options.get("on_conflict") or table.key
+        ignore = "resolution=ignore-duplicates" in prefer
+        rows = [{column: table.coerce(column, value) for column, value in row.items()} for row in rows]
+
+        # 트랜잭션처럼: 제약 위반이 하나라도 있으면 아무것도 쓰지 않음
+        plan = []
+        for row in rows:
+            existing_key = self.lookup(table, conflict, row.get(conflict))
+            if table.name == "issues" and row.get("repo_full_name") not in self.tables["repos"].rows:
+                raise PostgrestError(409, "23503", 'insert or update on table "issues" violates foreign key '
+                                                   'constraint "fk_issues_repo"')
+            for column in table.unique:
+                if column == conflict or row.get(column) is None:
+                    continue
+                other = table.unique[column].get(row[column])
+                if other is not None and other != existing_key:
+                    raise PostgrestError(409, "23505", "duplicate key value violates unique constraint "
+                                                       f'"idx_{table.name}_{column}"')
+            plan.append((existing_key, row))
+
+        written = []
+        for existing_key, row in plan:
+            if existing_key is not None:
+                if ignore:
+                    continue
+                target = table.rows[existing_key]
+                self.unindex(table, target)
+                target.update(row)
+                self.index(table, target)
+            else:
+                target = dict(row)
+                if table.key == "id":
+                    target["id"] = table.next_id
+                    table.next_id += 1
+                if table.name == "repos":
+                    target.setdefault("checked_at", None)
+                    target.setdefault("stars", None)
+                    target.setdefault("language", None)
+                table.rows[target[table.key]] = target
+                self.index(table, target)
+            written.append(target)
+
+        table.version += 1
+        self.rows_written += len(written)
+        if "return=minimal" in prefer:
+            return 201, {}, None
+        return 201, {}, [dict(row) for row in written]
+
+    @staticmethod
+    def lookup(table: Table, column: str, value):
+        if value is None:
+            return None
+        if column == table.key:
+            return value if value in table.rows else None
+        return table.unique.get(column, {}).get(value)
+
+    @staticmethod
+    def index(table: Table, row: dict):
+        for column, index in table.unique.items():
+            if row.get(column) is not None:
+                index[row[column]] = row[table.key]
+
+    @staticmethod
+    def unindex(table: Table, row: dict):
+        for column, index in table.unique.items():
+            if row.get(column) is not None and index.get(row[column]) == row[table.key]:
+                del index[row[column]]
+
+    def rpc(self, name: str, args: dict):
+        now = normalize_time(datetime.now(timezone.utc))
+        if name == "bulk_update_repo_metadata":
+            repos = self.tables["repos"]
+            updated = 0
+            for item in args.get("payload") or []:
+                row = repos.rows.get(item["repo_full_name"])
+                if row:
+                    row.update(stars=item.get("stars"), language=item.get("language"), checked_at=now)
+                    updated += 1
+            repos.version += 1
+            self.rows_written += updated
+            return updated
+        if name == "bulk_update_issues_by_github_id":
+            issues = self.tables["issues"]
+            updated = 0
+            for item in args.get("payload") or []:
+                key = issues.unique["github_id"].get(int(item["github_id"]))
+                if key is None:
+                    continue
+                row = issues.rows[key]
+                self.unindex(issues, row)
+                row.update({column: issues.coerce(column, value) for column, value in item.items()})
+                self.index(issues, row)
+                updated += 1
+            issues.version += 1
+            self.rows_written += updated
+            return updated
+        if name == "record_reconcile_results":
+            repos = self.tables["repos"]
+            updated = 0
+            for repo in args.get("blocked") or []:
+                row = repos.rows.get(repo)
+                if row:
+                    failures = row.get("reconcile_failures") or 0
+                    hours = min(args["base_hours"] * 2 ** failures, args["max_hours"])
+                    row.update(reconcile_failures=failures + 1,
+                               reconcile_retry_at=normalize_time(datetime.now(timezone.utc) + timedelta(hours=hours)))
+                    updated += 1
+            for repo in args.get("recovered") or []:
+                row = repos.rows.get(repo)
+                if row:
+                    row.update(reconcile_failures=0, reconcile_retry_at=None)
+            repos.version += 1
+            return updated
+        if name == "refresh_stats":
+            return None
+        raise PostgrestError(404, "PGRST202", f"Could not find the function public.{name}")
+
+
+# ============================================
+# GitHub
+# ============================================
+
+class FakeGitHubAPI(FakeService):
+    """세계의 현재 상태를 보여주는 GitHub REST/Search/GraphQL (한도는 넉넉하게 고정)"""
+
+    GRAPHQL_FIELD = re.compile(r"(r\d+): repository\(owner: \$(o\d+), name: \$(n\d+)\) \{ (.*) \}$")
+    ISSUE_FIELD = re.compile(r"(i\d+): issue\(number: (\d+)\)")
+
+    def __init__(self, world: SyntheticWorld, latency: float = 0.0):
+        super().__init__(latency)
+        self.world = world
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        # Search 대상: GitHub에서 열려 있고 정확히 "good first issue" 라벨이 붙은 이슈 (생성 시각 오름차순)
+        corpus = []
+        for issue in world.issues():
+            if issue.open_on_github and GOOD_FIRST_LABEL in issue.labels:
+                created = now - SEARCH_SPAN * (1 - issue.created_frac)
+                corpus.append((created.replace(microsecond=0), issue.index))
+        corpus.sort()
+        self.created = [created for created, _ in corpus]
+        self.corpus = [index for _, index in corpus]
+        self.items_served = 0
+
+    def count_key(self, method: str, path: str) -> str:
+        return f"{method} /repos/*" if path.startswith("/repos/") else f"{method} {path}"
+
+    def rate_headers(self) -> dict:
+        return {"X-RateLimit-Limit": "1000000", "X-RateLimit-Remaining": "1000000",
+                "X-RateLimit-Reset": str(int(time.time()) + 60)}
+
+    def handle(self, method, path, params, headers, body):
+        if path == "/rate_limit":
+            budget = {"limit": 1000000, "remaining": 1000000, "reset": int(time.time()) + 60}
+            return 200, self.rate_headers(), {"resources": {"core": budget, "search": budget, "graphql": budget}}
+        if path == "/search/issues":
+            return 200, self.rate_headers(), self.search(dict(params))
+        if path.startswith("/repos/"):
+            metadata = self.world.repo_metadata(path.removeprefix("/repos/"))
+            if metadata is None:
+                return 404, self.rate_headers(), {"message": "Not Found"}
+            return 200, self.rate_headers(), {"stargazers_count": metadata["stars"], "language": metadata["language"]}
+        if path == "/graphql":
+            request = json.loads(body)
+            return 200, self.rate_headers(), self.graphql(request["query"], request.get("variables") or {})
+        return 404, {}, {"message": "Not Found"}
+
+    def search_item(self, index: int, created: datetime) -> dict:
+        issue = self.world.issue(index)
+        return {
+            "id": issue.github_id,
+            "number": issue.number,
+            "title": issue.title,
+            "html_url": issue.url(issue.github_repo),
+            "repository_url": f"https://api.github.com/repos/{issue.github_repo}",
+            "labels": [{"name": label} for label in issue.labels],
+            "created_at": format_time(created),
+            "updated_at": format_time(created + timedelta(hours=1)),
+            "state": "open",
+            "comments": issue.comments,
+        }
+
+    def search(self, params: dict) -> dict:
+        lo, hi = 0, len(self.created)
+        match = re.search(r"created:(\S+)\.\.(\S+)", params.get("q", ""))
+        if match:
+            start, end = (datetime.strptime(v, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+                          for v in match.groups())
+            lo = bisect.bisect_left(self.created, start)
+            hi = bisect.bisect_right(self.created, end)
+        page = int(params.get("page", 1))
+        per_page = int(params.get("per_page", 30))
+        offset = (page - 1) * per_page
+        items = []
+        if offset < 1000:
+            # sort=created, order=desc
+            for position in range(hi - 1 - offset, max(hi - 1 - offset - per_page, lo - 1), -1):
+                items.append(self.search_item(self.corpus[position], self.created[position]))
+        with self.counter.lock:
+            self.items_served += len(items)
+        return {"total_count": hi - lo, "incomplete_results": False, "items": items}
+
+    def graphql(self, query: str, variables: dict) -> dict:
+        data, errors = {}, []
+        for line in query.splitlines():
+            match = self.GRAPHQL_FIELD.search(line.strip())
+            if not match:
+                continue
+            alias, owner_var, name_var, fields = match.groups()
+            repo = f"{variables[owner_var]}/{variables[name_var]}"
+            if "stargazerCount" in fields:
+                metadata = self.world.repo_metadata(repo)
+                if metadata is None:
+                    data[alias] = None
+                    errors.append({"type": "NOT_FOUND", "path": [alias]})
+                else:
+                    language = {"name": metadata["language"]} if metadata["language"] else None
+                    data[alias] = {"stargazerCount": metadata["stars"], "primaryLanguage": language}
+                continue
+
+            node = {}
+            for issue_alias, number in self.ISSUE_FIELD.findall(fields):
+                issue = self.world.issue(int(number) - 1)
+                if issue.github_repo != repo:
+                    node[issue_alias] = None
+                    errors.append({"type": "NOT_FOUND", "path": [alias, issue_alias]})
+                else:
+                    node[issue_alias] = {"state": "OPEN" if issue.open_on_github else "CLOSED"}
+            data[alias] = node
+        body = {"data": data}
+        if errors:
+            body["errors"] = errors
+        return body
+
+
+# ============================================
+# BigQuery
+# ============================================
+
+class FakeRowIterator:
+    def __init__(self, rows, total_bytes: int):
+        self._rows = rows
+        self.total_bytes_processed = total_bytes
+        self.total_rows = None  # 제너레이터라 미리 알 수 없음
+
+    def __iter__(self):
+        return iter(self._rows)
+
+
+class FakeQueryJob:
+    def __init__(self, client: "FakeBigQueryClient", query: str, dry_run: bool):
+        self.client = client
+        self.query = query
+        self.total_bytes_processed = client.bytes_per_event * client.world.config.events
+        self.total_bytes_billed = 0 if dry_run else self.total_bytes_processed
+        self.slot_millis = 0 if dry_run else client.world.config.events // 10
+        self.cache_hit = False
+        self.started = self.ended = None
+        self.job_id = f"fake-{id(self)}"
+
+    def done(self) -> bool:
+        return True
+
+    def result(self, **kwargs) -> FakeRowIterator:
+        start, end = (datetime.fromisoformat(v) for v in re.findall(r"TIMESTAMP\('([^']+)'\)", self.query)[:2])
+        return FakeRowIterator(self.client.rows(start, end), self.total_bytes_processed)
+
+
+class FakeBigQueryClient:
+    """google.cloud.bigquery.Client 자리에 설치 (install_fake_bigquery). 쿼리/행 수를 집계"""
+
+    world: SyntheticWorld | None = None
+    bytes_per_event = 2000  # GH Archive IssuesEvent payload 평균 크기 근사
+    queries = 0
+    dry_runs = 0
+    rows_returned = 0
+
+    def __init__(self, project: str | None = None, credentials=None, **kwargs):
+        self.project = project
+
+    def query(self, query: str, job_config=None) -> FakeQueryJob:
+        dry_run = bool(job_config and getattr(job_config, "dry_run", False))
+        if dry_run:
+            FakeBigQueryClient.dry_runs += 1
+        else:
+            FakeBigQueryClient.queries += 1
+        return FakeQueryJob(self, query, dry_run)
+
+    def get_job(self, job_id: str, **kwargs):
+        raise NotImplementedError
+
+    def rows(self, start: datetime, end: datetime):
+        from gharchive_files import to_row  # 쿼리 WHERE와 같은 후보 조건 + 같은 컬럼 이름
+        for event in self.world.archive_events(start, end):
+            row = to_row(event)
+            if row:
+                FakeBigQueryClient.rows_returned += 1
+                yield row
+
+
+def install_fake_bigquery(world: SyntheticWorld) -> None:
+    """fetch_issues import 전에 호출: bigquery.Client를 가짜로 교체 (GCP 인증/네트워크 없음)"""
+    from google.cloud import bigquery
+    FakeBigQueryClient.world = world
+    bigquery.Client = FakeBigQueryClient
@@ -0,0 +1,105 @@
+"""
+GH Archive 파일 파싱 처리량 벤치마크 (gharchive_files.py)
+시간별 .json.gz 파일을 워커 수별로 파싱해 events/sec (wall)과 events/sec/core (워커 CPU 시간 기준) 비교
+- 디렉터리를 주면 실제 파일 사용 (https://data.gharchive.org/2024-01-01-{0..23}.json.gz 등)
+- 없으면 이벤트 종류 비율을 흉내 낸 합성 파일 생성 (IssuesEvent ~3%, good-first 후보는 그중 일부)
+
+사용법: python bench_gharchive_files.py [--dir ./gharchive] [--files 8 --events 200000] [--workers 1 2 4]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import tempfile
+import time
+
+from gharchive_files import list_archive_files, read_archive_rows
+
+OTHER_TYPES = ["PushEvent", "CreateEvent", "WatchEvent", "PullRequestEvent", "IssueCommentEvent", "ForkEvent"]
+LABELS = ["bug", "enhancement", "good first issue", "help wanted", "documentation", "beginner friendly"]
+
+
+def synthetic_event(rng: random.Random, hour: str, i: int) -> dict:
+    created_at = f"{hour}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}Z"
+    repo = f"org{rng.randint(0, 5000)}/repo{rng.randint(0, 50)}"
+    if rng.random() >= 0.03:
+        # 실제 파일처럼 본문 크기가 제각각인 다른 이벤트
+        return {"id": str(i), "type": rng.choice(OTHER_TYPES), "repo": {"name": repo},
+                "payload": {"ref": "refs/heads/main", "commits": [{"message": "x" * rng.randint(20, 400)}]},
+                "created_at": created_at}
+
+    number = rng.randint(1, 5000)
+    labels = [{"name": name} for name in rng.sample(LABELS, rng.randint(0, 2))]
+    action = rng.choice(["opened", "closed", "labeled", "unlabeled", "reopened", "edited"])
+    payload = {
+        "action": action,
+        "issue": {
+            "id": rng.randint(1, 10 ** 10),
+            "number": number,
+            "title": "Issue title " + "y" * rng.randint(5, 80),
+            "html_url": f"https://github.com/{repo}/issues/{number}",
+            "user": {"login": f"user{rng.randint(0, 10 ** 5)}"},
+            "labels": labels,
+            "state": "closed" if action == "closed" else "open",
+            "created_at": created_at,
+            "comments": rng.randint(0, 20),
+            "body": "z" * rng.randint(50, 1500),
+        },
+    }
+    if action in ("labeled", "unlabeled"):
+        payload["label"] = {"name": rng.choice(LABELS)}
+    return {"id": str(i), "type": "IssuesEvent", "repo": {"name": repo}, "payload": payload,
+            "created_at": created_at}
+
+
+def write_synthetic_files(directory: str, files: int, events: int, seed: int) -> None:
+    rng = random.Random(seed)
+    for h in range(files):
+        hour = f"2024-01-{1 + h // 24:02d}T{h % 24:02d}"
+        name = f"2024-01-{1 + h // 24:02d}-{h % 24}.json.gz"
+        with gzip.open(os.path.join(directory, name), "wt", compresslevel=6) as f:
+            for i in range(events):
+                f.write(json.dumps(synthetic_event(rng, hour, i), separators=(",", ":")) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", help="실제 GH Archive 파일 디렉터리 (없으면 합성 파일)")
+    parser.add_argument("--files", type=int, default=8, help="합성 파일 수")
+    parser.add_argument("--events", type=int, default=200000, help="합성 파일당 이벤트 수")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = args.dir
+        if not directory:
+            directory = tmp
+            started = time.monotonic()
+            write_synthetic_files(directory, args.files, args.events, args.seed)
+            print(f"Generated {args.files} files x {args.events} events in {time.monotonic() - started:.1f}s")
+
+        files = list_archive_files(directory)
+        print(f"Files: {len(files)}, {sum(os.path.getsize(p) for p in files) / 1e6:.0f} MB gz")
+        print("=" * 50)
+
+        results = []
+        for workers in args.workers:
+            totals = {}
+            started = time.monotonic()
+            rows = read_archive_rows(files, workers, totals)
+            wall = time.monotonic() - started
+            results.append((workers, wall, totals, len(rows)))
+
+        print("=" * 50)
+        for workers, wall, totals, candidates in results:
+            print(f"workers={workers}: {totals['lines']} events in {wall:.1f}s "
+                  f"({totals['lines'] / wall:.0f} events/s wall, "
+                  f"{totals['lines'] / totals['seconds']:.0f} events/s/core), "
+                  f"{totals['issues_events']} IssuesEvent, {candidates} candidates")
+
+
+if __name__ == "__main__":
+    main()
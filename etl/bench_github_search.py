@@ -0,0 +1,192 @@
+"""
+GitHub Search 수집 처리량 벤치마크 (로컬 가짜 GitHub 서버)
+가짜 서버는 실제 Search API처럼
+- created:A..B 범위 필터, 쿼리당 1000건 페이지 제한
+- 요청당 지연 (--latency-ms)
+- 윈도우당 요청 한도 (--limit / --window, X-RateLimit-Remaining/Reset 헤더, 초과 시 403 + Retry-After)
+를 흉내 내고, fetch_issues_github.fetch_good_first_issues를 워커 수별로 실행해
+수집 건수/호출 수/처리량/한도 대비 사용률/403 횟수/새 TCP 연결 수를 비교한다.
+
+사용법: python bench_github_search.py --issues 20000 --workers 1 4 8
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class FakeGitHub:
+    """Search API만 흉내 내는 가짜 서버 상태"""
+
+    def __init__(self, issues: int, latency: float, limit: int, window: float, seed: int):
+        rng = random.Random(seed)
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        self.issues = []
+        for i in range(issues):
+            # 최근 이슈가 훨씬 많은 분포
+            created = now - timedelta(seconds=int(rng.random() ** 4 * 10 * 365 * 86400))
+            self.issues.append((created, {
+                "id": i,
+                "number": i,
+                "title": f"Issue {i}",
+                "html_url": f"https://github.com/owner/repo{i % 500}/issues/{i}",
+                "repository_url": f"https://api.github.com/repos/owner/repo{i % 500}",
+                "labels": [{"name": "good first issue"}],
+                "created_at": created.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "updated_at": created.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "state": "open",
+                "comments": 0,
+            }))
+        self.issues.sort(key=lambda pair: pair[0], reverse=True)
+        self.created = [created for created, _ in self.issues]  # 내림차순
+
+        self.latency = latency
+        self.limit = limit
+        self.window = window
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.requests = 0
+            self.rejected = 0
+            self.connections = 0
+            self.window_start = time.time()
+            self.window_used = 0
+
+    def take(self) -> tuple[bool, int, float]:
+        """요청 한도 차감. Returns: (허용 여부, 남은 횟수, 리셋 시각)"""
+        with self.lock:
+            now = time.time()
+            if now >= self.window_start + self.window:
+                self.window_start = now
+                self.window_used = 0
+            reset_at = self.window_start + self.window
+            self.requests += 1
+            if self.window_used >= self.limit:
+                self.rejected += 1
+                return False, 0, reset_at
+            self.window_used += 1
+            return True, self.limit - self.window_used, reset_at
+
+    def search(self, query: str, page: int, per_page: int) -> dict:
+        matches = self.issues
+        match = re.search(r"created:(\S+)\.\.(\S+)", query)
+        if match:
+            start, end = (datetime.strptime(v, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+                          for v in match.groups())
+            # created 내림차순 목록에서 [start, end] 구간 위치 찾기
+            lo, hi = 0, len(self.created)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self.created[mid] > end:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            first = lo
+            lo, hi = first, len(self.created)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self.created[mid] >= start:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            matches = self.issues[first:lo]
+
+        offset = (page - 1) * per_page
+        items = [issue for _, issue in matches[offset:offset + per_page]] if offset < 1000 else []
+        return {"total_count": len(matches), "incomplete_results": False, "items": items}
+
+
+def serve(fake: FakeGitHub) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def log_message(self, *args):
+            pass
+
+        def setup(self):
+            super().setup()
+            with fake.lock:
+                fake.connections += 1
+
+        def do_GET(self):
+            time.sleep(fake.latency)
+            allowed, remaining, reset_at = fake.take()
+            if not allowed:
+                body = b'{"message": "API rate limit exceeded"}'
+                self.send_response(403)
+                self.send_header("Retry-After", str(math.ceil(reset_at - time.time())))
+            else:
+                params = parse_qs(urlparse(self.path).query)
+                body = json.dumps(fake.search(
+                    params["q"][0], int(params.get("page", ["1"])[0]), int(params.get("per_page", ["30"])[0])
+                )).encode()
+                self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("X-RateLimit-Limit", str(fake.limit))
+            self.send_header("X-RateLimit-Remaining", str(remaining))
+            self.send_header("X-RateLimit-Reset", f"{reset_at:.3f}")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--issues", type=int, default=20000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--limit", type=int, default=30, help="윈도우당 요청 한도")
+    parser.add_argument("--window", type=float, default=2.0, help="한도 윈도우(초), 실제 API는 60")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    fake = FakeGitHub(args.issues, args.latency_ms / 1000, args.limit, args.window, args.seed)
+    server = serve(fake)
+
+    # 가짜 서버를 바라보도록 설정한 뒤 import (DB 연결은 사용하지 않음)
+    os.environ["GITHUB_API_URL"] = f"http://127.0.0.1:{server.server_port}"
+    os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+    os.environ.setdefault("SUPABASE_KEY", "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYW5vbiJ9.bench")
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import fetch_issues_github
+    from github_api import RateLimiter
+
+    budget = args.limit / args.window
+    print(f"Fake GitHub: {args.issues} issues, {args.latency_ms:.0f}ms latency, "
+          f"{args.limit} req/{args.window:g}s ({budget:.1f} req/s budget)")
+    print("=" * 80)
+
+    for workers in args.workers:
+        fake.reset()
+        fetch_issues_github.SEARCH_WORKERS = workers
+        fetch_issues_github.search_limiter = RateLimiter(rate=budget, burst=workers)
+
+        start = time.perf_counter()
+        issues, _ = fetch_issues_github.fetch_good_first_issues()
+        elapsed = time.perf_counter() - start
+
+        served = fake.requests - fake.rejected
+        print(f"workers={workers:>2}: {len(issues)}/{args.issues} issues, {fake.requests} requests in {elapsed:.1f}s "
+              f"→ {served / elapsed:.1f} req/s ({served / elapsed / budget * 100:.0f}% of budget), "
+              f"{fake.rejected} rejected, {fake.connections} connections")
+        print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
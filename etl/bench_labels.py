@@ -0,0 +1,134 @@
+"""
+라벨 판정 마이크로 벤치마크
+실제 GitHub 라벨 분포를 흉내 낸 코퍼스(소수의 인기 라벨 + 긴 꼬리)로
+- reference: 기존 구현 (replace 4회 + 정규식 + split/join + 부분 문자열/집합 검사)
+- compiled: labels.py (단일 정규식, 캐시 없음)
+- cached: labels.py (단일 정규식 + LRU 캐시)
+를 비교하고, 모든 고유 라벨에 대해 판정 결과가 같은지 확인한다.
+
+사용법: python bench_labels.py --lookups 2000000
+"""
+
+import argparse
+import random
+import re
+import string
+import time
+
+from labels import is_good_first_label, normalize_label
+
+COMMON_LABELS = [
+    "bug", "enhancement", "documentation", "question", "duplicate", "wontfix", "invalid",
+    "help wanted", "good first issue", "Good First Issue", "good-first-issue", "good first issue :+1:",
+    "hacktoberfest", "dependencies", "javascript", "python", "stale", "needs triage",
+    "type: bug", "type: feature", "status: needs triage", "priority: high", "priority/P2",
+    "kind/bug", "kind/feature", "area/networking", "area/docs", "lifecycle/stale",
+    "difficulty: easy", "difficulty/medium", "Difficulty: Hard", "first-timers-only", "first timers only",
+    "beginner", "beginner friendly", "Beginner-Friendly", "beginners only", "beginners",
+    "newcomer", "good for newcomers", "starter", "starter-task", "up-for-grabs", "up for grabs",
+    "low-hanging-fruit", "Low Hanging Fruit", "first-contribution", "first contributor",
+    "good first contributor issue", "E-easy", "E-mentor", "easy fix", "easy-pick",
+    "🐛 bug", "✨ enhancement", "📖 docs", "good first issue 🌱", "status:good-first-issue",
+    "GoodFirstIssue", "good_first_issue", "contributions welcome", "first-issue", "issue: first",
+    "", "  ", "P1", "v2.0", "breaking change", "needs-reproduction", "uneasy", "teasy",
+]
+
+
+def reference_normalize_label(label: str) -> str:
+    normalized = (label or "").strip().lower()
+    normalized = normalized.replace("_", " ").replace("-", " ").replace("/", " ").replace(":", " ")
+    normalized = re.sub(r"[^a-z0-9\s]", " ", normalized)
+    return " ".join(normalized.split())
+
+
+def reference_is_good_first_label(label: str) -> bool:
+    """기존 fetch_issues.is_good_first_label 구현 그대로"""
+    normalized = reference_normalize_label(label)
+    if not normalized:
+        return False
+
+    if "good first issue" in normalized or "goodfirstissue" in normalized:
+        return True
+    if "first timers only" in normalized:
+        return True
+    if "up for grabs" in normalized:
+        return True
+    if "low hanging fruit" in normalized:
+        return True
+
+    tokens = normalized.split()
+    token_set = set(tokens)
+
+    if "beginner" in token_set:
+        return True
+    if "beginners" in token_set and "only" in token_set:
+        return True
+    if "newcomer" in token_set or "newcomers" in token_set:
+        return True
+    if "starter" in token_set or "starters" in token_set:
+        return True
+    if "first" in token_set and ("issue" in token_set or "contributor" in token_set or "contributors" in token_set):
+        return True
+    if "easy" in token_set:
+        return True
+
+    return False
+
+
+def build_corpus(distinct: int, lookups: int, seed: int) -> tuple[list[str], list[str]]:
+    """(고유 라벨 목록, Zipf 분포로 뽑은 조회 시퀀스)"""
+    rng = random.Random(seed)
+    words = ["area", "kind", "type", "status", "comp", "team", "scope", "module", "first", "easy",
+             "issue", "good", "only", "beginners", "contributor", "triage", "feature", "ui", "api"]
+    separators = [" ", "-", "_", "/", ": ", ":"]
+
+    vocab = list(COMMON_LABELS)
+    while len(vocab) < distinct:
+        parts = [rng.choice(words) for _ in range(rng.randint(1, 4))]
+        label = rng.choice(separators).join(parts)
+        if rng.random() < 0.3:
+            label = label.title()
+        if rng.random() < 0.1:
+            label += " " + "".join(rng.choices(string.ascii_lowercase + string.digits + "!?🚀é", k=4))
+        vocab.append(label)
+
+    weights = [1 / (rank + 1) for rank in range(len(vocab))]
+    return vocab, rng.choices(vocab, weights=weights, k=lookups)
+
+
+def run(name: str, fn, sequence: list[str]) -> float:
+    start = time.perf_counter()
+    accepted = sum(1 for label in sequence if fn(label))
+    elapsed = time.perf_counter() - start
+    print(f"{name:>10}: {elapsed:.3f}s  {len(sequence) / elapsed / 1e6:.2f}M labels/s  accepted={accepted}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--distinct", type=int, default=5000)
+    parser.add_argument("--lookups", type=int, default=2000000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    vocab, sequence = build_corpus(args.distinct, args.lookups, args.seed)
+
+    mismatches = [
+        label for label in vocab
+        if reference_is_good_first_label(label) != is_good_first_label.__wrapped__(label)
+        or reference_normalize_label(label) != normalize_label(label)
+    ]
+    print(f"Corpus: {len(vocab)} distinct labels, {len(sequence)} lookups")
+    print(f"Verdict mismatches vs reference: {len(mismatches)} {mismatches[:5]}")
+    print("=" * 50)
+
+    baseline = run("reference", reference_is_good_first_label, sequence)
+    compiled = run("compiled", is_good_first_label.__wrapped__, sequence)
+    is_good_first_label.cache_clear()
+    cached = run("cached", is_good_first_label, sequence)
+    print(f"Speedup: compiled {baseline / compiled:.1f}x, cached {baseline / cached:.1f}x "
+          f"(cache {is_good_first_label.cache_info()})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+BigQuery 프로젝트별 쿼리 바이트 예산 관리
+- 최근 30일(rolling) 프로젝트별 누적 스캔 바이트 기록
+- 쿼리마다 dry run 예상치를 받아 남은 예산이 가장 많은 프로젝트로 라우팅
+저장소: supabase(bq_usage 테이블, bq_usage.sql) 또는 sqlite (ETL_STATE_BACKEND와 동일하게 선택)
+"""
+
+import os
+import sqlite3
+from datetime import date, timedelta
+
+from checkpoint import DEFAULT_STATE_PATH
+
+# 무료 티어: 프로젝트당 1 TiB/월
+MONTHLY_BUDGET_BYTES = int(os.environ.get("BQ_MONTHLY_BUDGET_BYTES", str(1 << 40)))
+ROLLING_DAYS = 30
+
+
+class SupabaseUsageStore:
+    def __init__(self, client):
+        self.client = client
+
+    def load(self, since: date) -> dict[str, int]:
+        result = self.client.table("bq_usage") \
+            .select("project, bytes") \
+            .gte("day", since.isoformat()) \
+            .execute()
+        usage = {}
+        for row in result.data or []:
+            usage[row["project"]] = usage.get(row["project"], 0) + int(row["bytes"])
+        return usage
+
+    def add(self, project: str, day: date, used_bytes: int) -> None:
+        self.client.rpc("add_bq_usage", {
+            "p_project": project,
+            "p_day": day.isoformat(),
+            "p_bytes": used_bytes,
+        }).execute()
+
+
+class SqliteUsageStore:
+    def __init__(self, path: str = DEFAULT_STATE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS bq_usage (
+                project TEXT NOT NULL,
+                day TEXT NOT NULL,
+                bytes INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (project, day)
+            )
+        """)
+        self.conn.commit()
+
+    def load(self, since: date) -> dict[str, int]:
+        rows = self.conn.execute(
+            "SELECT project, SUM(bytes) FROM bq_usage WHERE day >= ? GROUP BY project",
+            (since.isoformat(),)
+        ).fetchall()
+        return {project: int(total) for project, total in rows}
+
+    def add(self, project: str, day: date, used_bytes: int) -> None:
+        self.conn.execute(
+            """
+            INSERT INTO bq_usage (project, day, bytes) VALUES (?, ?, ?)
+            ON CONFLICT (project, day) DO UPDATE SET bytes = bytes + excluded.bytes
+            """,
+            (project, day.isoformat(), used_bytes)
+        )
+        self.conn.commit()
+
+
+def get_usage_store(client=None):
+    """checkpoint 저장소와 같은 백엔드 사용"""
+    if os.environ.get("ETL_STATE_BACKEND", "supabase") == "sqlite":
+        return SqliteUsageStore(os.environ.get("ETL_STATE_PATH", DEFAULT_STATE_PATH))
+    return SupabaseUsageStore(client)
+
+
+class QueryBudgeter:
+    """프로젝트별 rolling 30일 사용량을 추적해 쿼리를 배정"""
+
+    def __init__(self, projects: list[str], store, monthly_budget: int = MONTHLY_BUDGET_BYTES):
+        self.projects = projects
+        self.store = store
+        self.monthly_budget = monthly_budget
+        self.exhausted: set[str] = set()
+
+        try:
+            self.used = store.load(date.today() - timedelta(days=ROLLING_DAYS))
+        except Exception as e:
+            print(f"Error loading BigQuery usage: {e}")
+            self.used = {}
+
+    def remaining(self, project: str) -> int:
+        if project in self.exhausted:
+            return 0
+        return self.monthly_budget - self.used.get(project, 0)
+
+    def candidates(self, estimated_bytes: int) -> list[int]:
+        """
+        실행 후보 프로젝트 인덱스를 남은 예산이 많은 순으로 반환.
+        예상치를 감당할 수 있는 프로젝트가 우선, 없으면 남은 예산 순으로 시도.
+        쿼터 초과(exhausted) 프로젝트는 예상치와 무관하게 제외 (예상치 0이면 remaining 0도 감당하는 것으로 보이므로)
+        """
+        order = [i for i in range(len(self.projects)) if self.projects[i] not in self.exhausted]
+        order.sort(key=lambda i: self.remaining(self.projects[i]), reverse=True)
+        fits = [i for i in order if self.remaining(self.projects[i]) >= estimated_bytes]
+        rest = [i for i in order if i not in fits]
+        return fits + rest
+
+    def mark_exhausted(self, project: str) -> None:
+        """쿼터 초과 응답을 받은 프로젝트는 이번 실행에서 제외"""
+        self.exhausted.add(project)
+
+    def record(self, project: str, used_bytes: int) -> None:
+        self.used[project] = self.used.get(project, 0) + used_bytes
+        try:
+            self.store.add(project, date.today(), used_bytes)
+        except Exception as e:
+            print(f"Error recording BigQuery usage: {e}")
+
+    def summary(self) -> str:
+        return ", ".join(
+            f"{project}: {self.used.get(project, 0) / 1e9:.1f} GB used / {self.remaining(project) / 1e9:.1f} GB left"
+            for project in self.projects
+        )
@@ -0,0 +1,31 @@
+-- ============================================
+-- BigQuery usage ledger (fetch_issues.py 쿼리 예산 관리)
+-- Run this in Supabase SQL Editor
+-- ============================================
+
+-- 프로젝트/일자별 스캔 바이트 (rolling 30일 합계로 남은 무료 한도 계산)
+CREATE TABLE IF NOT EXISTS bq_usage (
+    project TEXT NOT NULL,
+    day DATE NOT NULL,
+    bytes BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (project, day)
+);
+
+-- ETL(service_role) 전용
+ALTER TABLE bq_usage ENABLE ROW LEVEL SECURITY;
+
+-- 동시 실행에도 안전하게 누적
+CREATE OR REPLACE FUNCTION public.add_bq_usage(p_project text, p_day date, p_bytes bigint)
+RETURNS void
+LANGUAGE sql
+SET search_path = public
+AS $func$
+    INSERT INTO bq_usage (project, day, bytes)
+    VALUES (p_project, p_day, p_bytes)
+    ON CONFLICT (project, day) DO UPDATE SET bytes = bq_usage.bytes + EXCLUDED.bytes;
+$func$;
+
+REVOKE EXECUTE ON FUNCTION public.add_bq_usage(text, date, bigint) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.add_bq_usage(text, date, bigint) TO service_role;
+
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,56 @@
+-- ============================================
+-- github_id 충돌 이슈 일괄 반영 (fetch_issues_github.py)
+-- Run this in Supabase SQL Editor
+-- ============================================
+
+-- 레포 이전/이름 변경으로 URL이 바뀐 이슈는 url 기준 upsert가
+-- idx_issues_github_id(unique) 충돌로 실패 → github_id 기준 set-based UPDATE 한 번으로 반영
+-- payload: fetch_issues_github.transform_issue 행 목록 (+ content_hash)
+CREATE OR REPLACE FUNCTION public.bulk_update_issues_by_github_id(payload jsonb)
+RETURNS integer
+LANGUAGE plpgsql
+SET search_path = public
+AS $func$
+DECLARE
+    updated integer;
+BEGIN
+    UPDATE issues i
+    SET issue_number = r.issue_number,
+        title = r.title,
+        url = r.url,
+        repo_full_name = r.repo_full_name,
+        repo_owner = r.repo_owner,
+        repo_name = r.repo_name,
+        labels = r.labels,
+        created_at = r.created_at,
+        updated_at = r.updated_at,
+        is_open = r.is_open,
+        comment_count = r.comment_count,
+        content_hash = r.content_hash
+    FROM jsonb_to_recordset(payload) AS r(
+        github_id bigint,
+        issue_number integer,
+        title text,
+        url text,
+        repo_full_name text,
+        repo_owner text,
+        repo_name text,
+        labels text[],
+        created_at timestamptz,
+        updated_at timestamptz,
+        is_open boolean,
+        comment_count integer,
+        content_hash text
+    )
+    WHERE i.github_id = r.github_id;
+
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
+END;
+$func$;
+
+-- ETL(service_role)에서만 호출
+REVOKE EXECUTE ON FUNCTION public.bulk_update_issues_by_github_id(jsonb) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.bulk_update_issues_by_github_id(jsonb) TO service_role;
+
+NOTIFY pgrst, 'reload schema';
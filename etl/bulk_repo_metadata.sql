@@ -0,0 +1,31 @@
+-- ============================================
+-- Bulk repo metadata update (enrich_repos.py)
+-- Run this in Supabase SQL Editor
+-- ============================================
+
+-- payload: [{"repo_full_name": "...", "stars": 123, "language": "Go"}, ...]
+-- 레포 N개를 한 번의 set-based UPDATE로 반영 (레포당 1회 왕복 → 청크당 1회)
+CREATE OR REPLACE FUNCTION public.bulk_update_repo_metadata(payload jsonb)
+RETURNS integer
+LANGUAGE plpgsql
+SET search_path = public
+AS $func$
+DECLARE
+    updated integer;
+BEGIN
+    UPDATE issues i
+    SET stars = r.stars,
+        language = r.language
+    FROM jsonb_to_recordset(payload) AS r(repo_full_name text, stars integer, language text)
+    WHERE i.repo_full_name = r.repo_full_name;
+
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
+END;
+$func$;
+
+-- ETL(service_role)에서만 호출
+REVOKE EXECUTE ON FUNCTION public.bulk_update_repo_metadata(jsonb) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.bulk_update_repo_metadata(jsonb) TO service_role;
+
+NOTIFY pgrst, 'reload schema';
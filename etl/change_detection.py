@@ -0,0 +1,83 @@
+"""
+이슈 변경 감지 (content_hash.sql)
+- 이슈 내용(url, repo, title, labels, comment_count, is_open)의 해시를 issues.content_hash에 함께 저장
+- upsert 전에 github_id로 저장된 해시를 조회해 새 이슈/바뀐 이슈만 전송
+  (updated_at만 바뀐 동일 행은 쓰지 않음 → 쓰기/WAL/대역폭 절감)
+"""
+
+import hashlib
+import json
+
+HASH_FIELDS = ("url", "repo_full_name", "title", "labels", "comment_count", "is_open")
+HASH_LOOKUP_CHUNK_SIZE = 300
+
+
+def content_hash(issue: dict) -> str:
+    """DB에 반영되는 내용 기준 해시 (라벨 순서는 무시, 레포 이전으로 URL만 바뀐 경우도 변경으로 취급)"""
+    payload = [
+        issue.get("url") or "",
+        issue.get("repo_full_name") or "",
+        issue.get("title") or "",
+        sorted(issue.get("labels") or []),
+        int(issue.get("comment_count") or 0),
+        bool(issue.get("is_open", True)),
+    ]
+    return hashlib.sha1(json.dumps(payload, separators=(",", ":")).encode()).hexdigest()
+
+
+class ChangeStats:
+    """실행 전체의 변경/미변경 행 수 집계"""
+
+    def __init__(self):
+        self.total = 0
+        self.unchanged = 0
+
+    def record(self, total: int, unchanged: int) -> None:
+        self.total += total
+        self.unchanged += unchanged
+
+    def summary(self) -> str:
+        ratio = self.unchanged / self.total * 100 if self.total else 0
+        return f"{self.unchanged}/{self.total} rows unchanged ({ratio:.1f}%), {self.total - self.unchanged} written"
+
+
+def fetch_stored_hashes(client, github_ids: list[int]) -> dict[int, str]:
+    """github_id → 저장된 content_hash"""
+    stored = {}
+    for i in range(0, len(github_ids), HASH_LOOKUP_CHUNK_SIZE):
+        chunk = github_ids[i:i + HASH_LOOKUP_CHUNK_SIZE]
+        result = client.table("issues") \
+            .select("github_id, content_hash") \
+            .in_("github_id", chunk) \
+            .execute()
+        for row in result.data or []:
+            stored[row["github_id"]] = row["content_hash"]
+    return stored
+
+
+def filter_changed(client, issues: list[dict], stats: ChangeStats | None = None) -> list[dict]:
+    """
+    각 행에 content_hash를 채우고, 저장된 해시와 다른 행(또는 새 행)만 반환.
+    해시 조회가 실패하면 전체를 변경된 것으로 취급 (기존처럼 모두 upsert).
+    """
+    for issue in issues:
+        issue["content_hash"] = content_hash(issue)
+
+    github_ids = list({issue["github_id"] for issue in issues if issue.get("github_id")})
+    try:
+        stored = fetch_stored_hashes(client, github_ids)
+    except Exception as e:
+        print(f"  Hash lookup error: {e}")
+        stored = {}
+
+    changed = [
+        issue for issue in issues
+        if not issue.get("github_id") or stored.get(issue["github_id"]) != issue["content_hash"]
+    ]
+
+    unchanged = len(issues) - len(changed)
+    if stats:
+        stats.record(len(issues), unchanged)
+    if issues:
+        print(f"  Skipping {unchanged}/{len(issues)} unchanged issues ({unchanged / len(issues) * 100:.1f}%)")
+    return changed
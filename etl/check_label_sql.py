@@ -0,0 +1,96 @@
+"""
+BigQuery 라벨 UDF 일관성 검사
+labels.bigquery_label_udfs()로 만든 SQL 판정이 Python 판정(is_good_first_label, 기준)과
+같은지 고정 라벨 세트 + 랜덤 코퍼스로 확인한다. 테이블을 읽지 않으므로 스캔 바이트 0.
+
+사용법: python check_label_sql.py --distinct 5000
+(GCP 인증 필요 - GOOGLE_APPLICATION_CREDENTIALS 또는 gcloud 기본 인증)
+오프라인 검사(생성 SQL을 Python으로 평가)는 tests/test_label_sql.py, CI에서 실행
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from google.cloud import bigquery
+from dotenv import load_dotenv
+
+from bench_labels import COMMON_LABELS, build_corpus
+from labels import bigquery_label_udfs, is_good_first_label
+
+load_dotenv()
+
+GCP_PROJECT_PRIMARY = os.environ.get("GCP_PROJECT_PRIMARY", "silver-pen-391310")
+
+
+def check_labels(client: bigquery.Client, labels: list[str]) -> list[tuple[str, bool, bool]]:
+    """라벨 단위 판정 비교. Returns: [(label, python, sql)] 불일치 목록"""
+    query = f"""
+    {bigquery_label_udfs()}
+    SELECT label, is_good_first_label(label) AS verdict
+    FROM UNNEST(@labels) AS label
+    """
+    job_config = bigquery.QueryJobConfig(query_parameters=[
+        bigquery.ArrayQueryParameter("labels", "STRING", labels)
+    ])
+    sql_verdicts = {row.label: row.verdict for row in client.query(query, job_config=job_config).result()}
+
+    return [
+        (label, is_good_first_label(label), sql_verdicts.get(label))
+        for label in labels
+        if is_good_first_label(label) != sql_verdicts.get(label)
+    ]
+
+
+def check_label_arrays(client: bigquery.Client, label_sets: list[list[str]]) -> list[tuple[str, bool, bool]]:
+    """이벤트 payload의 labels JSON 배열 단위 판정 비교 (has_good_first_label)"""
+    payloads = [json.dumps([{"id": i, "name": name} for i, name in enumerate(names)]) for names in label_sets]
+    query = f"""
+    {bigquery_label_udfs()}
+    SELECT labels_json, has_good_first_label(labels_json) AS verdict
+    FROM UNNEST(@payloads) AS labels_json
+    """
+    job_config = bigquery.QueryJobConfig(query_parameters=[
+        bigquery.ArrayQueryParameter("payloads", "STRING", payloads)
+    ])
+    sql_verdicts = {row.labels_json: row.verdict for row in client.query(query, job_config=job_config).result()}
+
+    mismatches = []
+    for names, payload in zip(label_sets, payloads):
+        expected = any(is_good_first_label(name) for name in names)
+        if expected != sql_verdicts.get(payload):
+            mismatches.append((payload, expected, sql_verdicts.get(payload)))
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--distinct", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    client = bigquery.Client(project=GCP_PROJECT_PRIMARY)
+
+    vocab, _ = build_corpus(args.distinct, 0, args.seed)
+    labels = sorted(set(vocab))
+    label_sets = [[]] + [[label] for label in COMMON_LABELS] + [
+        labels[i:i + 3] for i in range(0, min(len(labels), 3000), 3)
+    ]
+
+    label_mismatches = check_labels(client, labels)
+    array_mismatches = check_label_arrays(client, label_sets)
+
+    print(f"Labels: {len(labels)} checked, {len(label_mismatches)} mismatches")
+    for label, expected, actual in label_mismatches[:20]:
+        print(f"  {label!r}: python={expected} sql={actual}")
+    print(f"Label arrays: {len(label_sets)} checked, {len(array_mismatches)} mismatches")
+    for payload, expected, actual in array_mismatches[:20]:
+        print(f"  {payload}: python={expected} sql={actual}")
+
+    if label_mismatches or array_mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
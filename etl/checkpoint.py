@@ -0,0 +1,88 @@
+"""
+소스별 동기화 watermark 저장소
+- supabase: etl_state 테이블 (etl_state.sql)
+- sqlite: 로컬 파일 (테스트/로컬 실행용)
+ETL_STATE_BACKEND=supabase|sqlite, ETL_STATE_PATH로 선택
+"""
+
+import os
+import sqlite3
+from datetime import datetime, timezone
+
+DEFAULT_STATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "etl_state.sqlite3")
+
+
+def parse_timestamp(value) -> datetime | None:
+    """ISO 문자열/datetime → timezone-aware datetime"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+
+class SupabaseCheckpointStore:
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, source: str) -> datetime | None:
+        result = self.client.table("etl_state") \
+            .select("watermark") \
+            .eq("source", source) \
+            .limit(1) \
+            .execute()
+        if result.data:
+            return parse_timestamp(result.data[0]["watermark"])
+        return None
+
+    def set(self, source: str, watermark: datetime) -> None:
+        self.client.table("etl_state").upsert({
+            "source": source,
+            "watermark": watermark.isoformat(),
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }, on_conflict="source").execute()
+
+
+class SqliteCheckpointStore:
+    def __init__(self, path: str = DEFAULT_STATE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS etl_state (
+                source TEXT PRIMARY KEY,
+                watermark TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def get(self, source: str) -> datetime | None:
+        row = self.conn.execute("SELECT watermark FROM etl_state WHERE source = ?", (source,)).fetchone()
+        return parse_timestamp(row[0]) if row else None
+
+    def set(self, source: str, watermark: datetime) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO etl_state (source, watermark, updated_at) VALUES (?, ?, ?)",
+            (source, watermark.isoformat(), datetime.now(timezone.utc).isoformat())
+        )
+        self.conn.commit()
+
+
+def get_checkpoint_store(client=None):
+    """환경 변수에 맞는 watermark 저장소 반환"""
+    backend = os.environ.get("ETL_STATE_BACKEND", "supabase")
+    if backend == "sqlite":
+        return SqliteCheckpointStore(os.environ.get("ETL_STATE_PATH", DEFAULT_STATE_PATH))
+    return SupabaseCheckpointStore(client)
+
+
+class WatermarkTracker:
+    """처리한 이벤트 중 가장 늦은 시각 추적 (동기화 성공 후에만 저장)"""
+
+    def __init__(self):
+        self.value: datetime | None = None
+
+    def observe(self, timestamp) -> None:
+        ts = parse_timestamp(timestamp)
+        if ts and (self.value is None or ts > self.value):
+            self.value = ts
@@ -0,0 +1,10 @@
+-- ============================================
+-- 이슈 변경 감지용 content hash (change_detection.py)
+-- Run this in Supabase SQL Editor
+-- ============================================
+
+-- url, repo_full_name, title, labels, comment_count, is_open 해시 (ETL이 계산해서 함께 저장)
+-- 기존 행은 NULL → 다음 동기화 때 한 번 다시 쓰이면서 채워짐
+ALTER TABLE issues ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+NOTIFY pgrst, 'reload schema';
@@ -4,102 +4,280 @@ GitHub API로 레포 메타데이터(stars, language) 보강
 
 import os
 import time
-import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 from supabase import create_client
+from batching import write_in_chunks
+from github_api import (
+    GITHUB_API_URL, MAX_RATE_LIMIT_RETRIES, RateLimiter, is_rate_limited, post_graphql, rate_limit_reset_time,
+    session,
+)
+from metrics import instrument_supabase, metrics, record_run
+from repo_cache import CacheEntry, RepoMetadataCache
 
 load_dotenv()
 
-supabase = create_client(
+supabase = instrument_supabase(create_client(
     os.environ["SUPABASE_URL"],
     os.environ["SUPABASE_KEY"]
-)
+))
 
 GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
 HEADERS = {"Authorization": f"token {GITHUB_TOKEN}"} if GITHUB_TOKEN else {}
 
+# 보강 백엔드: graphql(100개/요청) 또는 rest(1개/요청). GraphQL은 토큰 필수
+ENRICH_BACKEND = os.environ.get("ENRICH_BACKEND", "graphql" if GITHUB_TOKEN else "rest")
+GRAPHQL_BATCH_SIZE = 100
+
+# 동시 요청 워커 수
+ENRICH_WORKERS = int(os.environ.get("ENRICH_WORKERS", "8"))
 
-def get_unique_repos() -> list[str]:
-    """DB에서 stars나 language가 없는 unique repo 목록 가져오기 (pagination 적용)"""
-    all_repos = set()
+# 워커 공유 토큰 버킷 (첫 응답 헤더를 받기 전까지는 기존 속도 ~1.4/초로 시작)
+# REST(core)와 GraphQL은 쿼터가 분리되어 있어 버킷도 따로 둔다
+limiter = RateLimiter(rate=1.4, burst=ENRICH_WORKERS)
+graphql_limiter = RateLimiter(rate=1.4, burst=ENRICH_WORKERS)
+
+# bulk_update_repo_metadata RPC 한 번에 보낼 레포 수
+BULK_UPDATE_CHUNK_SIZE = 1000
+
+# 로컬 메타데이터 캐시 (만료 후에는 ETag로 재검증, 304는 rate limit 미차감)
+ENRICH_CACHE_PATH = os.environ.get(
+    "ENRICH_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "repo_metadata.sqlite3")
+)
+ENRICH_CACHE_TTL_HOURS = float(os.environ.get("ENRICH_CACHE_TTL_HOURS", "24"))
+cache = RepoMetadataCache(ENRICH_CACHE_PATH, ttl_seconds=ENRICH_CACHE_TTL_HOURS * 3600)
+
+
+def get_unchecked_repos() -> list[str]:
+    """
+    아직 보강을 시도하지 않은(checked_at IS NULL) 레포 목록 (repo_checked_at.sql)
+    idx_repos_unchecked partial index를 repo_full_name keyset으로 페이지 조회
+    → 조회 비용이 테이블 크기가 아니라 새 레포 수에 비례
+    """
+    repos = []
     page_size = 1000
-    offset = 0
 
     while True:
-        result = supabase.from_("issues") \
+        query = supabase.from_("repos") \
             .select("repo_full_name") \
-            .or_("stars.is.null,language.is.null") \
-            .range(offset, offset + page_size - 1) \
-            .execute()
+            .is_("checked_at", "null")
+        if repos:
+            query = query.gt("repo_full_name", repos[-1])
+        result = query.order("repo_full_name").limit(page_size).execute()
 
         if not result.data:
             break
 
-        for row in result.data:
-            all_repos.add(row["repo_full_name"])
+        repos.extend(row["repo_full_name"] for row in result.data)
 
         if len(result.data) < page_size:
             break
 
-        offset += page_size
-        print(f"Fetched {len(all_repos)} unique repos so far...")
+        print(f"Fetched {len(repos)} repos so far...")
 
-    return list(all_repos)
+    return repos
 
 
-def fetch_repo_metadata(repo_full_name: str) -> dict | None:
-    """GitHub API로 레포 메타데이터 가져오기"""
-    url = f"https://api.github.com/repos/{repo_full_name}"
+def fetch_repo_metadata(repo_full_name: str, cached: CacheEntry | None = None) -> dict | None:
+    """
+    GitHub API로 레포 메타데이터 가져오기 (rate limit 시 모든 워커가 함께 대기 후 재시도)
+    cached가 있으면 ETag/Last-Modified로 조건부 요청 → 304면 캐시 값 재사용
+    """
+    url = f"{GITHUB_API_URL}/repos/{repo_full_name}"
+    headers = dict(HEADERS)
+    if cached and cached.etag:
+        headers["If-None-Match"] = cached.etag
+    if cached and cached.last_modified:
+        headers["If-Modified-Since"] = cached.last_modified
 
-    try:
-        resp = requests.get(url, headers=HEADERS, timeout=10)
+    for _ in range(MAX_RATE_LIMIT_RETRIES):
+        limiter.acquire()
+        try:
+            resp = session.get(url, headers=headers, timeout=10)
+        except Exception as e:
+            print(f"Exception for {repo_full_name}: {e}")
+            return None
+
+        limiter.update_from_headers(resp.headers)
 
-        if resp.status_code == 200:
+        if resp.status_code == 304 and cached:
+            cache.touch(repo_full_name)
+            return cached.metadata
+        elif resp.status_code == 200:
             data = resp.json()
-            return {
+            metadata = {
                 "stars": data.get("stargazers_count", 0),
                 "language": data.get("language"),
             }
+            cache.put(repo_full_name, metadata, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+            return metadata
         elif resp.status_code == 404:
+            cache.put(repo_full_name, None)
             return None  # 삭제된 레포
-        elif resp.status_code == 403:
-            # Rate limit
-            reset_time = int(resp.headers.get("X-RateLimit-Reset", 0))
-            wait = max(reset_time - time.time(), 60)
-            print(f"Rate limited. Waiting {wait:.0f}s...")
-            time.sleep(wait)
-            return fetch_repo_metadata(repo_full_name)  # 재시도
+        elif is_rate_limited(resp):
+            limiter.pause_until(rate_limit_reset_time(resp))
+            metrics.count("github.retries")
+            continue
         else:
             print(f"Error {resp.status_code} for {repo_full_name}")
             return None
-    except Exception as e:
-        print(f"Exception for {repo_full_name}: {e}")
-        return None
-
 
-def update_repo_metadata(repo_full_name: str, metadata: dict) -> bool:
-    """DB에서 해당 레포의 모든 이슈 업데이트 (에러 핸들링 포함)"""
-    for attempt in range(3):
-        try:
-            supabase.from_("issues") \
-                .update(metadata) \
-                .eq("repo_full_name", repo_full_name) \
-                .execute()
-            return True
-        except Exception as e:
-            if attempt < 2:
-                print(f"Retry {attempt + 1} for {repo_full_name}: {e}")
-                time.sleep(5 * (attempt + 1))
+    print(f"Gave up on {repo_full_name} after {MAX_RATE_LIMIT_RETRIES} rate-limited attempts")
+    return None
+
+
+def build_repo_metadata_query(repos: list[str]) -> tuple[str, dict]:
+    """
+    레포 목록을 alias 쿼리 하나로 변환
+    r0: repository(owner: $o0, name: $n0) { stargazerCount primaryLanguage { name } }
+    (레포 이름은 문자열 치환 대신 변수로 전달)
+    """
+    params = []
+    fields = []
+    variables = {}
+
+    for i, repo_full_name in enumerate(repos):
+        owner, _, name = repo_full_name.partition("/")
+        params.append(f"$o{i}: String!, $n{i}: String!")
+        fields.append(f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ stargazerCount primaryLanguage {{ name }} }}")
+        variables[f"o{i}"] = owner
+        variables[f"n{i}"] = name
+
+    query = f"query({', '.join(params)}) {{\n  " + "\n  ".join(fields) + "\n}"
+    return query, variables
+
+
+def fetch_repos_metadata_graphql(repos: list[str]) -> dict[str, dict | None]:
+    """
+    GraphQL alias 쿼리로 최대 100개 레포 메타데이터를 한 번에 조회.
+    조회 실패한 레포는 alias 단위로 None 처리. NOT_FOUND(삭제/비공개)만 캐시에 삭제로 기록하고
+    그 밖의 오류(FORBIDDEN 등)는 REST의 404 외 오류처럼 기록하지 않음 → enrichment_row가 건너뛰고 다음 실행에서 재시도.
+    요청 자체가 실패하면 해당 청크만 REST로 폴백.
+    """
+    query, variables = build_repo_metadata_query(repos)
+    body = post_graphql(query, variables, HEADERS, graphql_limiter, f"chunk of {len(repos)}")
+    if body is None:
+        return {repo: fetch_repo_metadata(repo) for repo in repos}
+
+    data = body.get("data") or {}
+
+    # alias별 에러 (NOT_FOUND = 삭제/비공개/이름 변경된 레포)
+    failed_aliases = {}
+    for error in body.get("errors") or []:
+        path = error.get("path") or []
+        if path:
+            failed_aliases[path[0]] = error.get("type", "ERROR")
+
+    if not data and not failed_aliases:
+        # 쿼리 전체 실패 (타임아웃, 복잡도 초과 등)
+        print(f"GraphQL query failed for chunk of {len(repos)}: {body.get('errors')}")
+        return {repo: fetch_repo_metadata(repo) for repo in repos}
+
+    results = {}
+    not_found = []
+    for i, repo_full_name in enumerate(repos):
+        alias = f"r{i}"
+        node = data.get(alias)
+        if node is None:
+            error_type = failed_aliases.get(alias, "NOT_FOUND")
+            if error_type == "NOT_FOUND":
+                not_found.append(repo_full_name)
             else:
-                print(f"Failed to update {repo_full_name}: {e}")
-                return False
-    return False
+                print(f"GraphQL {error_type} for {repo_full_name}")
+            results[repo_full_name] = None
+            continue
+        language = node.get("primaryLanguage") or {}
+        results[repo_full_name] = {
+            "stars": node.get("stargazerCount", 0),
+            "language": language.get("name"),
+        }
+
+    for repo_full_name, metadata in results.items():
+        if metadata is not None:
+            cache.put(repo_full_name, metadata)
+    for repo_full_name in not_found:
+        cache.put(repo_full_name, None)
+    return results
+
+
+def iter_repo_metadata(pool: ThreadPoolExecutor, repos: list[str]):
+    """
+    (repo, metadata) 쌍을 완료 순서대로 생성
+    - 캐시 hit(미만료): API 호출 없음
+    - 만료됐지만 ETag/Last-Modified 있음: REST 조건부 요청으로 재검증
+    - miss: 설정된 백엔드로 조회
+    """
+    misses = []
+    revalidate = {}
+
+    for repo in repos:
+        entry = cache.get(repo)
+        if entry and entry.is_fresh:
+            cache.hits += 1
+            yield repo, entry.metadata
+        elif entry and (entry.etag or entry.last_modified):
+            revalidate[repo] = entry
+        else:
+            cache.misses += 1
+            misses.append(repo)
+
+    futures = {pool.submit(fetch_repo_metadata, repo, entry): repo for repo, entry in revalidate.items()}
+    for future in as_completed(futures):
+        yield futures[future], future.result()
+
+    yield from _fetch_uncached(pool, misses)
+
+
+def _fetch_uncached(pool: ThreadPoolExecutor, repos: list[str]):
+    """캐시에 없는 레포를 설정된 백엔드로 조회"""
+    if ENRICH_BACKEND == "graphql":
+        chunks = [repos[i:i + GRAPHQL_BATCH_SIZE] for i in range(0, len(repos), GRAPHQL_BATCH_SIZE)]
+        futures = [pool.submit(fetch_repos_metadata_graphql, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result().items()
+    else:
+        futures = {pool.submit(fetch_repo_metadata, repo): repo for repo in repos}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def enrichment_row(repo_full_name: str, metadata: dict | None) -> dict | None:
+    """
+    bulk_update_repo_metadata에 보낼 행 (checked_at이 함께 기록됨)
+    - 메타데이터 있음: stars/language (language가 없는 레포도 그대로 NULL로 기록)
+    - 삭제된 레포(캐시에 404로 기록됨): stars/language NULL → 다시 조회하지 않음
+    - 일시적 실패: None → 다음 실행에서 재시도
+    """
+    if metadata:
+        return {"repo_full_name": repo_full_name, **metadata}
+    entry = cache.get(repo_full_name)
+    if entry and entry.metadata is None:
+        return {"repo_full_name": repo_full_name, "stars": None, "language": None}
+    return None
+
+
+def bulk_update_repo_metadata(rows: list[dict]) -> int:
+    """
+    {repo_full_name, stars, language} 목록을 청크 단위 set-based UPDATE로 반영
+    (repo_checked_at.sql의 RPC, 레포당 repos 1행 + checked_at 갱신). 실패한 청크는 이분해서 재시도.
+    Returns: 반영된 레포 수
+    """
+    def write(chunk: list[dict]):
+        supabase.rpc("bulk_update_repo_metadata", {"payload": chunk}).execute()
+
+    written, failed = write_in_chunks(rows, write, BULK_UPDATE_CHUNK_SIZE, label="repo")
+    metrics.add_rows("repos.enrich", rows_in=len(rows), rows_out=written)
+    if failed:
+        print(f"Failed to update {len(failed)} repos: {[row['repo_full_name'] for row, _ in failed[:10]]}")
+    return written
 
 
 def check_rate_limit():
     """현재 rate limit 상태 확인"""
-    resp = requests.get("https://api.github.com/rate_limit", headers=HEADERS)
+    resp = session.get(f"{GITHUB_API_URL}/rate_limit", headers=HEADERS, timeout=30)
     if resp.status_code == 200:
+        limiter.update_from_headers(resp.headers)
         data = resp.json()
         core = data["resources"]["core"]
         print(f"Rate limit: {core['remaining']}/{core['limit']} (resets in {core['reset'] - time.time():.0f}s)")
@@ -107,6 +285,7 @@ def check_rate_limit():
     return 0
 
 
+@record_run("enrich_repos")
 def main():
     print("=" * 50)
     print("GitHub Repo Metadata Enrichment")
@@ -117,33 +296,42 @@ def main():
         print("Rate limit too low. Try again later.")
         return
 
-    repos = get_unique_repos()
-    print(f"Found {len(repos)} repos to enrich")
+    # 새 레포는 파이프라인(pipeline.py)에서 바로 보강 → 여기서는 놓친 레포만
+    repos = get_unchecked_repos()
+    print(f"Found {len(repos)} unchecked repos to enrich")
 
     enriched = 0
-    skipped = 0
+    pending = []
 
-    for i, repo in enumerate(repos):
-        if i % 100 == 0 and i > 0:
-            check_rate_limit()
+    print(f"Enrichment backend: {ENRICH_BACKEND}")
 
-        metadata = fetch_repo_metadata(repo)
-
-        if metadata:
-            if update_repo_metadata(repo, metadata):
-                enriched += 1
-                if enriched % 50 == 0:
-                    print(f"Progress: {enriched}/{len(repos)} enriched")
-            else:
-                skipped += 1
-        else:
-            skipped += 1
-
-        # Rate limit 방지 (토큰 있으면 5000/시간 = ~1.4/초)
-        time.sleep(0.5)
+    # 네트워크 I/O는 워커 풀에서 병렬로, DB 업데이트는 메인 스레드에서 청크 단위로 처리
+    try:
+        with ThreadPoolExecutor(max_workers=ENRICH_WORKERS) as pool:
+            for repo, metadata in iter_repo_metadata(pool, repos):
+                row = enrichment_row(repo, metadata)
+                if not row:
+                    continue
+
+                pending.append(row)
+                if len(pending) >= BULK_UPDATE_CHUNK_SIZE:
+                    enriched += bulk_update_repo_metadata(pending)
+                    cache.flush()
+                    pending = []
+                    print(f"Progress: {enriched}/{len(repos)} enriched "
+                          f"(rate limit remaining: {limiter.remaining})")
+
+        enriched += bulk_update_repo_metadata(pending)
+    finally:
+        # 실패/중단돼도 이번 실행에서 받은 ETag/메타데이터는 저장
+        cache.close()
+    skipped = len(repos) - enriched
 
     print("=" * 50)
     print(f"Done! Enriched: {enriched}, Skipped: {skipped}")
+    print(f"Rate limit wait: {limiter.total_wait + graphql_limiter.total_wait:.0f}s "
+          f"(across {ENRICH_WORKERS} workers)")
+    print(cache.summary())
     check_rate_limit()
 
 
@@ -0,0 +1,17 @@
+-- ============================================
+-- ETL sync checkpoint (watermark) table
+-- Run this in Supabase SQL Editor
+-- ============================================
+
+-- source: 'bigquery' | 'github_search'
+-- watermark: 해당 소스에서 마지막으로 처리한 이벤트 시각
+CREATE TABLE IF NOT EXISTS etl_state (
+    source TEXT PRIMARY KEY,
+    watermark TIMESTAMPTZ NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- ETL(service_role) 전용: 정책 없이 RLS만 켜서 anon/authenticated 접근 차단
+ALTER TABLE etl_state ENABLE ROW LEVEL SECURITY;
+
+NOTIFY pgrst, 'reload schema';
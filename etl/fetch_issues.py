@@ -8,22 +8,23 @@ import os
 import json
 import base64
 import tempfile
-import re
 from datetime import datetime, timedelta, timezone
+from typing import Iterator
 from google.cloud import bigquery
 from google.oauth2 import service_account
-from google.api_core.exceptions import Forbidden
-from supabase import create_client, Client
+from google.api_core.exceptions import Forbidden, NotFound
 from dotenv import load_dotenv
+from bq_budget import QueryBudgeter, get_usage_store
+from checkpoint import WatermarkTracker, get_checkpoint_store
+from issue_events import IssueEvent
+from issue_sync import change_stats, classify_rows, membership, supabase, sync_issue_events, write_failures
+from labels import bigquery_label_udfs
+from metrics import metrics, record_run
+from query_planner import TableSegment, describe_plan, plan_tables
+from retention import delete_expired_in_windows
 
 load_dotenv()
 
-# Supabase 연결
-supabase: Client = create_client(
-    os.environ["SUPABASE_URL"],
-    os.environ["SUPABASE_KEY"]
-)
-
 # GCP 프로젝트 설정 (다중 fallback 지원)
 GCP_PROJECT_PRIMARY = os.environ.get("GCP_PROJECT_PRIMARY", "silver-pen-391310")
 
@@ -55,82 +56,63 @@ if os.environ.get("GCP_FALLBACK_CREDENTIALS_3"):
 bq_client = None
 current_fallback_index = -1  # -1 = primary, 0+ = fallback index
 
+# 프로젝트별 클라이언트 캐시 (credentials 디코딩/클라이언트 생성은 프로젝트당 1회)
+_bq_clients: dict[int, bigquery.Client] = {}
+
 
 def get_bq_client(fallback_index: int = -1) -> bigquery.Client:
-    """BigQuery 클라이언트 반환 (다중 폴백 지원)"""
+    """BigQuery 클라이언트 반환 (다중 폴백 지원, 프로젝트별로 생성한 클라이언트 재사용)"""
     global bq_client, current_fallback_index
 
     current_fallback_index = fallback_index
 
-    if fallback_index >= 0 and fallback_index < len(FALLBACK_CONFIGS):
-        config = FALLBACK_CONFIGS[fallback_index]
-        print(f"Using GCP fallback project #{fallback_index + 1}: {config['project']}")
+    if fallback_index not in _bq_clients:
+        if fallback_index >= 0 and fallback_index < len(FALLBACK_CONFIGS):
+            config = FALLBACK_CONFIGS[fallback_index]
+            print(f"Creating client for GCP fallback project #{fallback_index + 1}: {config['project']}")
+
+            # Base64 디코딩하여 credentials 생성
+            creds_json = base64.b64decode(config["credentials_b64"]).decode('utf-8')
+            creds_dict = json.loads(creds_json)
+            credentials = service_account.Credentials.from_service_account_info(creds_dict)
+            _bq_clients[fallback_index] = bigquery.Client(project=config["project"], credentials=credentials)
+        else:
+            print(f"Creating client for GCP primary project: {GCP_PROJECT_PRIMARY}")
+            _bq_clients[fallback_index] = bigquery.Client(project=GCP_PROJECT_PRIMARY)
+
+    bq_client = _bq_clients[fallback_index]
+    return bq_client
 
-        # Base64 디코딩하여 credentials 생성
-        creds_json = base64.b64decode(config["credentials_b64"]).decode('utf-8')
-        creds_dict = json.loads(creds_json)
-        credentials = service_account.Credentials.from_service_account_info(creds_dict)
-        bq_client = bigquery.Client(project=config["project"], credentials=credentials)
-    else:
-        print(f"Using GCP primary project: {GCP_PROJECT_PRIMARY}")
-        bq_client = bigquery.Client(project=GCP_PROJECT_PRIMARY)
 
-    return bq_client
+def project_name(fallback_index: int) -> str:
+    if fallback_index >= 0:
+        return FALLBACK_CONFIGS[fallback_index]["project"] or f"fallback-{fallback_index + 1}"
+    return GCP_PROJECT_PRIMARY
+
 
+# 모든 프로젝트 클라이언트 미리 생성 (primary 먼저 → 기본 클라이언트)
+PROJECT_INDEXES = [-1] + list(range(len(FALLBACK_CONFIGS)))
+for _index in reversed(PROJECT_INDEXES):
+    try:
+        get_bq_client(_index)
+    except Exception as _e:
+        print(f"Failed to create client for {project_name(_index)}: {_e}")
+        if _index == -1:
+            raise
 
-# 초기 클라이언트 생성
-bq_client = get_bq_client()
+# 프로젝트별 rolling 30일 스캔량 기반 쿼리 라우팅
+budgeter = QueryBudgeter([project_name(i) for i in PROJECT_INDEXES], get_usage_store(supabase))
 
 # 설정
 RETENTION_DAYS = 365  # 데이터 보관 기간
 INITIAL_LOAD_DAYS = 30  # 초기 로드 시 가져올 기간 (BigQuery 쿼터 제한)
 MIN_SYNC_HOURS = 3  # 최소 동기화 범위 (여유분)
+WATERMARK_LAG_MINUTES = 30  # watermark 이전으로 되돌아가 다시 볼 범위 (GH Archive 적재 지연 대비)
+CHECKPOINT_SOURCE = "bigquery"
+
+# 소스별 watermark 저장소 (etl_state 테이블 또는 로컬 SQLite)
+checkpoint_store = get_checkpoint_store(supabase)
 
-def normalize_label(label: str) -> str:
-    """라벨명을 비교 가능한 canonical key로 정규화."""
-    normalized = (label or "").strip().lower()
-    normalized = normalized.replace("_", " ").replace("-", " ").replace("/", " ").replace(":", " ")
-    normalized = re.sub(r"[^a-z0-9\s]", " ", normalized)
-    return " ".join(normalized.split())
-
-
-def is_good_first_label(label: str) -> bool:
-    """라벨명이 good-first 계열인지 판정."""
-    normalized = normalize_label(label)
-    if not normalized:
-        return False
-
-    if "good first issue" in normalized or "goodfirstissue" in normalized:
-        return True
-    if "first timers only" in normalized:
-        return True
-    if "up for grabs" in normalized:
-        return True
-    if "low hanging fruit" in normalized:
-        return True
-
-    tokens = normalized.split()
-    token_set = set(tokens)
-
-    # beginner/newcomer/starter 계열
-    if "beginner" in token_set:
-        return True
-    if "beginners" in token_set and "only" in token_set:
-        return True
-    if "newcomer" in token_set or "newcomers" in token_set:
-        return True
-    if "starter" in token_set or "starters" in token_set:
-        return True
-
-    # first-issue / first-contributor / first-time-contributor
-    if "first" in token_set and ("issue" in token_set or "contributor" in token_set or "contributors" in token_set):
-        return True
-
-    # easy 계열 (입문 난이도 표현)
-    if "easy" in token_set:
-        return True
-
-    return False
 
 
 def get_table_name(dt: datetime) -> str:
@@ -160,226 +142,233 @@ def get_last_sync_time() -> datetime:
     return initial
 
 
-def run_query_with_fallback(query: str):
-    """쿼리 실행 (쿼터 초과 시 다음 폴백 프로젝트로 재시도)"""
-    global bq_client, current_fallback_index
+def get_sync_cutoff(now: datetime) -> datetime:
+    """
+    조회 시작 시점 결정
+    - watermark가 있으면 [watermark - lag, now)
+    - 없으면 (첫 실행) 기존 방식: DB의 마지막 이슈 시각, 최소 MIN_SYNC_HOURS 여유분
+    """
+    try:
+        watermark = checkpoint_store.get(CHECKPOINT_SOURCE)
+    except Exception as e:
+        print(f"Error reading watermark: {e}")
+        watermark = None
 
-    # Primary부터 시작하여 모든 fallback 순차 시도
-    start_index = current_fallback_index
-    max_index = len(FALLBACK_CONFIGS) - 1
+    if watermark:
+        print(f"Watermark ({CHECKPOINT_SOURCE}): {watermark.isoformat()}")
+        return watermark - timedelta(minutes=WATERMARK_LAG_MINUTES)
 
-    for attempt_index in range(start_index, max_index + 1):
+    last_sync = get_last_sync_time()
+
+    # 최소 3시간 여유분 확보 (이벤트 지연 대비)
+    min_cutoff = now - timedelta(hours=MIN_SYNC_HOURS)
+    return min(last_sync, min_cutoff)
+
+
+def run_query_with_fallback(query: str, estimated_bytes: int | None = None):
+    """
+    쿼리 실행: dry run 예상 바이트를 기준으로 남은 월 예산이 가장 많은 프로젝트에 배정.
+    그래도 쿼터 초과가 나면 해당 프로젝트를 제외하고 다음 후보로 재시도.
+    """
+    if estimated_bytes is None:
+        estimated_bytes = estimate_query_bytes(query)
+
+    last_error = None
+    for position in budgeter.candidates(estimated_bytes):
+        index = PROJECT_INDEXES[position]
+        project = budgeter.projects[position]
+        if index not in _bq_clients:
+            continue
+
+        client = get_bq_client(index)
+        print(f"  Routing query to {project} "
+              f"(estimated {estimated_bytes / 1e9:.2f} GB, {budgeter.remaining(project) / 1e9:.1f} GB left)")
         try:
-            query_job = bq_client.query(query)
-            return query_job.result()
+            query_job = client.query(query)
+            results = query_job.result()
         except Forbidden as e:
-            if "quota" in str(e).lower():
-                next_index = current_fallback_index + 1
-                if next_index <= max_index:
-                    print(f"Quota exceeded, switching to fallback project #{next_index + 1}...")
-                    bq_client = get_bq_client(fallback_index=next_index)
-                    continue
-                else:
-                    print(f"All {len(FALLBACK_CONFIGS) + 1} projects quota exceeded!")
-                    raise e
-            else:
+            if "quota" not in str(e).lower():
                 raise e
+            print(f"Quota exceeded on {project}, switching to next project...")
+            metrics.count("bigquery.quota_exceeded")
+            budgeter.mark_exhausted(project)
+            last_error = e
+            continue
 
-    # 마지막 fallback으로 최종 시도
-    try:
-        query_job = bq_client.query(query)
-        return query_job.result()
-    except Exception as e:
-        raise e
+        budgeter.record(project, query_job.total_bytes_billed or results.total_bytes_processed or 0)
+        metrics.record_bigquery_job(query_job, project, results.total_rows)
+        return results
 
+    print(f"All {len(PROJECT_INDEXES)} projects quota exceeded!")
+    if last_error:
+        raise last_error
+    raise RuntimeError("No BigQuery project available")
 
-def get_tables_for_range(start: datetime, end: datetime) -> list[str]:
-    """시간 범위에 해당하는 BigQuery 테이블 목록"""
-    tables = []
-    current = start.date()
-    end_date = end.date()
 
-    while current <= end_date:
-        tables.append(f"githubarchive.day.{current.strftime('%Y%m%d')}")
-        current += timedelta(days=1)
+def start_query(query: str, estimated_bytes: int) -> tuple[bigquery.QueryJob, str]:
+    """
+    쿼리 job을 남은 예산이 가장 많은 프로젝트에 제출만 하고 바로 반환 (완료 대기 없음).
+    완료 확인/사용량 기록/쿼터 초과 처리는 호출자 몫 (backfill 병렬 실행용).
+    Returns: (job, project)
+    """
+    for position in budgeter.candidates(estimated_bytes):
+        index = PROJECT_INDEXES[position]
+        project = budgeter.projects[position]
+        if index in _bq_clients and project not in budgeter.exhausted:
+            return _bq_clients[index].query(query), project
+    raise RuntimeError("No BigQuery project available")
 
-    return tables
 
+def estimate_query_bytes(query: str) -> int:
+    """dry run으로 스캔 예상 바이트 조회 (과금 없음)"""
+    job_config = bigquery.QueryJobConfig(dry_run=True, use_query_cache=False)
+    metrics.record_dry_run()
+    return bq_client.query(query, job_config=job_config).total_bytes_processed or 0
 
-def fetch_all_issue_events(cutoff: datetime) -> tuple[list[dict], list[str], list[str]]:
-    """
-    단일 쿼리로 모든 이슈 이벤트 가져오기 (쿼터 최적화)
-    - 새로 생성/라벨링된 good first issues
-    - 닫힌 이슈 URL
-    - 라벨 제거된 이슈 URL
 
-    Returns: (new_issues, closed_urls, unlabeled_urls)
+def build_issue_events_query(cutoff: datetime, end: datetime, segments: list[TableSegment]) -> str:
+    """
+    [cutoff, end) 범위 IssuesEvent 조회 쿼리 (URL, 발생 시각, 이벤트 id 순 정렬)
+    created_at은 초 단위라 같은 초의 open/close가 섞일 수 있음 → GitHub 이벤트 id(발생 순으로 증가)로 순서 고정
     """
-    now = datetime.now(timezone.utc)
-    tables = get_tables_for_range(cutoff, now)
-    print(f"  Querying {len(tables)} tables: {tables[0]} ~ {tables[-1]}")
-
     # 최적화: SELECT * 대신 필요한 컬럼만, 각 테이블에서 IssuesEvent만 먼저 필터링
     table_union = " UNION ALL ".join([
-        f"""SELECT repo.name as repo_name, payload, created_at
-            FROM `{t}`
+        f"""SELECT id, repo.name as repo_name, payload, created_at
+            FROM `{segment.table}`
             WHERE type = 'IssuesEvent'
-              AND created_at >= TIMESTAMP('{cutoff.isoformat()}')"""
-        for t in tables
+              AND created_at >= TIMESTAMP('{cutoff.isoformat()}')
+              AND created_at < TIMESTAMP('{end.isoformat()}'){segment.suffix_filter}"""
+        for segment in segments
     ])
 
-    query = f"""
-    WITH events AS ({table_union})
-    SELECT
-        repo_name,
-        JSON_EXTRACT_SCALAR(payload, '$.action') as action,
-        JSON_EXTRACT_SCALAR(payload, '$.issue.id') as github_id,
-        JSON_EXTRACT_SCALAR(payload, '$.issue.number') as issue_number,
-        JSON_EXTRACT_SCALAR(payload, '$.issue.title') as title,
-        JSON_EXTRACT_SCALAR(payload, '$.issue.html_url') as url,
-        JSON_EXTRACT_SCALAR(payload, '$.issue.user.login') as author,
-        JSON_EXTRACT(payload, '$.issue.labels') as labels_json,
-        JSON_EXTRACT_SCALAR(payload, '$.issue.state') as state,
-        JSON_EXTRACT_SCALAR(payload, '$.issue.created_at') as issue_created_at,
-        JSON_EXTRACT_SCALAR(payload, '$.issue.comments') as comment_count,
-        JSON_EXTRACT_SCALAR(payload, '$.label.name') as removed_label
-    FROM events
-    WHERE JSON_EXTRACT_SCALAR(payload, '$.action') IN ('opened', 'labeled', 'reopened', 'closed', 'unlabeled')
+    # 라벨 판정을 BigQuery에서 먼저 수행해 후보 행만 내려받음 (labels.py 규칙으로 생성한 UDF)
+    # - opened/labeled/reopened: 열린 이슈 + good-first 라벨
+    # - closed: good-first 라벨이 붙은 채로 닫힌 이슈 (나머지는 저장된 적 없는 이슈)
+    # - unlabeled: 제거된 라벨이 good-first
+    # 최종 판정은 classify_event (Python)
+    return f"""
+    {bigquery_label_udfs()}
+    WITH events AS ({table_union}),
+    extracted AS (
+        SELECT
+            repo_name,
+            created_at as event_created_at,
+            SAFE_CAST(id AS INT64) as event_id,
+            JSON_EXTRACT_SCALAR(payload, '$.action') as action,
+            JSON_EXTRACT_SCALAR(payload, '$.issue.id') as github_id,
+            JSON_EXTRACT_SCALAR(payload, '$.issue.number') as issue_number,
+            JSON_EXTRACT_SCALAR(payload, '$.issue.title') as title,
+            JSON_EXTRACT_SCALAR(payload, '$.issue.html_url') as url,
+            JSON_EXTRACT_SCALAR(payload, '$.issue.user.login') as author,
+            JSON_EXTRACT(payload, '$.issue.labels') as labels_json,
+            JSON_EXTRACT_SCALAR(payload, '$.issue.state') as state,
+            JSON_EXTRACT_SCALAR(payload, '$.issue.created_at') as issue_created_at,
+            JSON_EXTRACT_SCALAR(payload, '$.issue.comments') as comment_count,
+            JSON_EXTRACT_SCALAR(payload, '$.label.name') as removed_label
+        FROM events
+        WHERE JSON_EXTRACT_SCALAR(payload, '$.action') IN ('opened', 'labeled', 'reopened', 'closed', 'unlabeled')
+    )
+    SELECT * FROM extracted
+    WHERE CASE action
+        WHEN 'unlabeled' THEN is_good_first_label(removed_label)
+        WHEN 'closed' THEN has_good_first_label(labels_json)
+        ELSE state = 'open' AND has_good_first_label(labels_json)
+    END
+    ORDER BY url, event_created_at, event_id
+    """
+
+
+def plan_issue_events_query(cutoff: datetime, end: datetime) -> tuple[str, int]:
     """
+    테이블 조합을 계획하고 dry run으로 예상 바이트 확인.
+    아직 적재되지 않은 hour 테이블(최근 1~2시간)은 제외 → watermark 덕분에 다음 실행에서 다시 조회됨.
+    Returns: (query, planned_bytes)
+    """
+    segments = plan_tables(cutoff, end)
+    query = build_issue_events_query(cutoff, end, segments)
 
+    try:
+        return query, estimate_query_bytes(query)
+    except NotFound:
+        available = []
+        for segment in segments:
+            try:
+                estimate_query_bytes(build_issue_events_query(cutoff, end, [segment]))
+                available.append(segment)
+            except NotFound:
+                print(f"  Skipping missing table: {segment}")
+        segments = available
+
+    if not segments:
+        return "", 0
+    query = build_issue_events_query(cutoff, end, segments)
+    return query, estimate_query_bytes(query)
+
+
+def fetch_issue_event_rows(cutoff: datetime, end: datetime | None = None) -> Iterator:
+    """
+    [cutoff, end) 범위 IssuesEvent 행을 BigQuery 결과 페이지 단위로 스트리밍 (URL, 발생 시각 순).
+    테이블은 query_planner로 hour/day/month 중 스캔량이 가장 적은 조합을 고르고,
+    실행 전 dry run 예상치와 실행 후 실제 스캔량을 함께 출력한다.
+    """
+    end = end or datetime.now(timezone.utc)
+    print(f"  Query plan: {describe_plan(plan_tables(cutoff, end))}")
     print(f"Fetching all issue events since {cutoff.isoformat()}...")
 
     try:
-        results = run_query_with_fallback(query)
+        query, planned_bytes = plan_issue_events_query(cutoff, end)
+        if not query:
+            print("  No tables available yet")
+            return
+        print(f"  Planned scan: {planned_bytes / 1e9:.2f} GB")
+
+        results = run_query_with_fallback(query, planned_bytes)
         if results is None:
-            return [], [], []
+            return
     except Exception as e:
         print(f"BigQuery error: {e}")
-        return [], [], []
-
-    new_issues = []
-    closed_urls = set()
-    unlabeled_urls = set()
+        return
 
+    rows = 0
     for row in results:
-        action = row.action
-        url = row.url
+        rows += 1
+        yield row
+    metrics.add_rows("bigquery.issue_events", rows_in=rows)
 
-        if not url:
-            continue
+    actual_bytes = results.total_bytes_processed or 0
+    print(f"  Bytes scanned: planned {planned_bytes / 1e9:.2f} GB, actual {actual_bytes / 1e9:.2f} GB "
+          f"({actual_bytes / 1e12 * 100:.2f}% of 1 TB/month free tier)")
 
-        # 닫힌 이슈
-        if action == 'closed':
-            closed_urls.add(url)
-            continue
-
-        # 라벨 제거된 이슈 (good first issue 관련 라벨만)
-        if action == 'unlabeled':
-            removed_label = row.removed_label or ""
-            if is_good_first_label(removed_label):
-                unlabeled_urls.add(url)
-            continue
-
-        # 새 이슈 / 라벨 추가 / 재오픈 (opened, labeled, reopened)
-        if action in ('opened', 'labeled', 'reopened') and row.state == 'open':
-            labels = []
-            if row.labels_json:
-                try:
-                    labels_data = json.loads(row.labels_json)
-                    labels = [l.get("name", "") for l in labels_data if isinstance(l, dict)]
-                except json.JSONDecodeError:
-                    labels = []
-
-            has_good_first_label = any(is_good_first_label(label) for label in labels)
-
-            if has_good_first_label:
-
-                repo_parts = row.repo_name.split("/")
-                owner = repo_parts[0] if len(repo_parts) > 0 else ""
-                repo = repo_parts[1] if len(repo_parts) > 1 else row.repo_name
-
-                new_issues.append({
-                    "github_id": int(row.github_id) if row.github_id else None,
-                    "issue_number": int(row.issue_number) if row.issue_number else 0,
-                    "repo_full_name": row.repo_name,
-                    "repo_owner": owner,
-                    "repo_name": repo,
-                    "title": row.title[:500] if row.title else "",
-                    "url": url,
-                    "labels": labels,
-                    "created_at": row.issue_created_at,
-                    "updated_at": datetime.now(timezone.utc).isoformat(),
-                    "comment_count": int(row.comment_count) if row.comment_count else 0,
-                    "is_open": True
-                })
-
-    # 중복 제거
-    seen = set()
-    unique_issues = []
-    for issue in new_issues:
-        key = issue["url"]
-        if key not in seen:
-            seen.add(key)
-            unique_issues.append(issue)
-
-    print(f"  Found {len(unique_issues)} new/updated issues, {len(closed_urls)} closed, {len(unlabeled_urls)} unlabeled")
-    return unique_issues, list(closed_urls), list(unlabeled_urls)
-
-
-def upsert_issues(issues: list[dict]) -> int:
-    """이슈를 DB에 upsert"""
-    if not issues:
-        return 0
-
-    batch_size = 100
-    total = 0
-
-    for i in range(0, len(issues), batch_size):
-        batch = issues[i:i + batch_size]
-        try:
-            result = supabase.table("issues").upsert(
-                batch,
-                on_conflict="url"
-            ).execute()
-            total += len(result.data) if result.data else 0
-        except Exception as e:
-            print(f"  Upsert error: {e}")
-
-    return total
-
-
-def delete_issues(urls: list[str]) -> int:
-    """이슈 삭제"""
-    if not urls:
-        return 0
 
-    batch_size = 100
-    total = 0
+def fetch_all_issue_events(cutoff: datetime, end: datetime | None = None,
+                           tracker: WatermarkTracker | None = None) -> Iterator[IssueEvent]:
+    """
+    단일 쿼리로 모든 이슈 이벤트를 스트리밍 (쿼터 최적화)
+    - 새로 생성/라벨링된 good first issues
+    - 닫힌 이슈 URL
+    - 라벨 제거된 이슈 URL
 
-    for i in range(0, len(urls), batch_size):
-        batch = urls[i:i + batch_size]
-        try:
-            result = supabase.table("issues").delete().in_("url", batch).execute()
-            total += len(result.data) if result.data else 0
-        except Exception as e:
-            print(f"  Delete error: {e}")
+    BigQuery 결과를 페이지 단위로 받아 바로 분류하므로 전체 결과를 메모리에 올리지 않는다.
+    라벨 조건은 BigQuery UDF로 먼저 걸러 good-first 후보 행만 내려받는다 (check_label_sql.py로 일치 확인).
+    URL별로 묶고 URL 안에서는 발생 시각 순으로 정렬해 받아, 이슈마다 이벤트를 최종 상태로
+    fold한다 → URL당 정확히 한 번의 쓰기 (upsert 또는 delete).
+    조회 범위는 [cutoff, end). tracker가 주어지면 처리한 이벤트의 최대 시각을 기록.
 
-    return total
+    Yields: (kind, url, issue) - kind는 'upsert' | 'closed' | 'unlabeled', issue는 upsert일 때만
+    """
+    yield from classify_rows(fetch_issue_event_rows(cutoff, end), tracker)
 
 
 def cleanup_old_issues(days: int = RETENTION_DAYS):
     """
     N일 이상 된 이슈 삭제 (open/closed 무관)
+    created_at 구간별 삭제 + 개수만 반환 (retention.py)
     """
-    cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
 
     try:
-        result = supabase.table("issues") \
-            .delete() \
-            .lt("created_at", cutoff) \
-            .execute()
-
-        deleted = len(result.data) if result.data else 0
+        deleted = delete_expired_in_windows(supabase, cutoff)
+        metrics.add_rows("issues.retention", rows_out=deleted)
         print(f"Cleaned up {deleted} issues older than {days} days")
         return deleted
     except Exception as e:
@@ -387,41 +376,41 @@ def cleanup_old_issues(days: int = RETENTION_DAYS):
         return 0
 
 
+@record_run("fetch_issues")
 def main():
     """메인 ETL 실행"""
     print("=" * 50)
     print(f"GoodFirst ETL - {datetime.now(timezone.utc).isoformat()}")
     print("=" * 50)
 
-    # DB에서 마지막 동기화 시점 조회
-    last_sync = get_last_sync_time()
     now = datetime.now(timezone.utc)
-
-    # 최소 3시간 여유분 확보 (이벤트 지연 대비)
-    min_cutoff = now - timedelta(hours=MIN_SYNC_HOURS)
-    cutoff = min(last_sync, min_cutoff)
+    cutoff = get_sync_cutoff(now)
 
     days_to_sync = (now - cutoff).days
     print(f"Syncing from: {cutoff.isoformat()} ({days_to_sync} days)")
 
-    # 단일 쿼리로 모든 이벤트 가져오기 (쿼터 최적화: 3쿼리 → 1쿼리)
-    issues, closed_urls, unlabeled_urls = fetch_all_issue_events(cutoff)
-
-    # 1. 새 이슈 / 재오픈된 이슈 저장
-    saved = upsert_issues(issues)
-    print(f"✓ Upserted {saved} issues")
-
-    # 2. 닫힌 이슈 삭제
-    deleted_closed = delete_issues(closed_urls)
-    print(f"✓ Deleted {deleted_closed} closed issues")
-
-    # 3. 라벨 제거된 이슈 삭제
-    deleted_unlabeled = delete_issues(unlabeled_urls)
+    # 단일 쿼리로 모든 이벤트를 스트리밍하며 반영 (쿼터 최적화: 3쿼리 → 1쿼리)
+    # 1. 새 이슈 / 재오픈된 이슈 저장, 2. 닫힌 이슈 삭제, 3. 라벨 제거된 이슈 삭제
+    membership.refresh(supabase)
+    tracker = WatermarkTracker()
+    saved, deleted_closed, deleted_unlabeled = sync_issue_events(fetch_all_issue_events(cutoff, now, tracker))
+    membership.save()
+    print(f"✓ Upserted {saved} issues ({change_stats.summary()})")
+    print(f"✓ Deleted {deleted_closed} closed issues ({membership.summary()})")
     print(f"✓ Deleted {deleted_unlabeled} unlabeled issues")
 
+    # 모든 쓰기가 성공했을 때만 watermark 전진
+    if any(write_failures.values()):
+        print(f"Write failures {write_failures}, watermark not advanced (next run re-reads this range)")
+    elif tracker.value:
+        checkpoint_store.set(CHECKPOINT_SOURCE, tracker.value)
+        print(f"✓ Watermark advanced to {tracker.value.isoformat()}")
+
     # 4. 1년 이상 된 이슈 정리
     cleanup_old_issues()
 
+    print(f"BigQuery usage (rolling 30d): {budgeter.summary()}")
+
     print("=" * 50)
     print("ETL complete!")
 
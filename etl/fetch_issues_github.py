@@ -4,17 +4,27 @@ GitHub API로 Good First Issues 수집 (BigQuery 대체)
 
 import os
 import time
-import requests
-from datetime import datetime, timedelta
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
+from postgrest.types import CountMethod, ReturnMethod
 from supabase import create_client
+from batching import AdaptivePacer
+from change_detection import ChangeStats, filter_changed
+from checkpoint import WatermarkTracker, get_checkpoint_store
+from github_api import (
+    GITHUB_API_URL, MAX_RATE_LIMIT_RETRIES, RateLimiter, is_rate_limited, post_graphql, rate_limit_reset_time,
+    session,
+)
+from issue_sync import write_issue_rows
+from metrics import instrument_supabase, metrics, record_run
 
 load_dotenv()
 
-supabase = create_client(
+supabase = instrument_supabase(create_client(
     os.environ["SUPABASE_URL"],
     os.environ["SUPABASE_KEY"]
-)
+))
 
 GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
 HEADERS = {
@@ -22,91 +32,170 @@ HEADERS = {
     "Accept": "application/vnd.github.v3+json"
 } if GITHUB_TOKEN else {}
 
-# 주요 언어 목록 (검색 분할용)
-LANGUAGES = [
-    "TypeScript", "JavaScript", "Python", "Go", "Rust", "Java",
-    "C++", "C#", "Ruby", "PHP", "Swift", "Kotlin", "Scala",
-    "Shell", "HTML", "CSS", "Vue", "Dart", "Elixir", "Haskell"
-]
-
-
-def search_issues(query: str, per_page: int = 100, max_results: int = 1000) -> list:
-    """GitHub Search API로 이슈 검색"""
-    url = "https://api.github.com/search/issues"
-    all_issues = []
-    page = 1
-
-    while len(all_issues) < max_results:
-        params = {
-            "q": query,
-            "sort": "created",
-            "order": "desc",
-            "per_page": per_page,
-            "page": page
-        }
-
-        resp = requests.get(url, headers=HEADERS, params=params, timeout=30)
-
-        if resp.status_code == 403:
-            # Rate limit
-            reset_time = int(resp.headers.get("X-RateLimit-Reset", 0))
-            wait = max(reset_time - time.time(), 60)
-            print(f"Rate limited. Waiting {wait:.0f}s...")
-            time.sleep(wait)
+# 증분 동기화: 마지막으로 본 이슈 updated_at(watermark) - lag 이후만 검색
+# GITHUB_FULL_RESYNC=1이면 watermark 무시하고 전체 재동기화
+WATERMARK_LAG_MINUTES = 30
+CHECKPOINT_SOURCE = "github_search"
+FULL_RESYNC = os.environ.get("GITHUB_FULL_RESYNC") == "1"
+
+checkpoint_store = get_checkpoint_store(supabase)
+
+# 변경 없는 이슈 skip 통계 (실행 단위)
+change_stats = ChangeStats()
+
+# Search API 분할 조회
+# - 쿼리당 최대 1000건까지만 페이지 조회 가능 → total_count가 넘으면 created: 범위를 이등분
+# - 첫 페이지 응답으로 개수 확인과 수집을 함께 하고, 나머지 페이지는 병렬로 조회
+SEARCH_URL = f"{GITHUB_API_URL}/search/issues"
+SEARCH_QUERY = 'label:"good first issue" is:open is:issue'
+SEARCH_PER_PAGE = 100
+SEARCH_RESULT_CAP = 1000
+SEARCH_EPOCH = datetime(2008, 1, 1, tzinfo=timezone.utc)  # GitHub 서비스 시작 이전
+SEARCH_WORKERS = int(os.environ.get("GITHUB_SEARCH_WORKERS", "4"))
+
+# Search API 한도: 인증 30회/분, 비인증 10회/분
+# 응답의 X-RateLimit-Remaining/Reset으로 남은 쿼터를 리셋 시각까지 균등 분배, 429/403은 Retry-After까지 정지
+search_limiter = RateLimiter(rate=(30 if GITHUB_TOKEN else 10) / 60, burst=SEARCH_WORKERS)
+
+
+# 닫힌 이슈 정합성 확인: GraphQL 요청당 100개, DB는 1000개씩 keyset 페이지
+RECONCILE_BATCH_SIZE = 100
+RECONCILE_PAGE_SIZE = 1000
+RECONCILE_WORKERS = int(os.environ.get("GITHUB_RECONCILE_WORKERS", "4"))
+graphql_limiter = RateLimiter(rate=1.4, burst=RECONCILE_WORKERS)
+# NOT_FOUND 외의 오류(FORBIDDEN 등)를 받은 레포는 12시간, 24시간, ... 최대 30일 뒤 다시 확인 (reconcile_backoff.sql)
+RECONCILE_BACKOFF_HOURS = 12
+RECONCILE_BACKOFF_MAX_HOURS = 30 * 24
+
+
+def search_page(query: str, page: int) -> dict | None:
+    """
+    Search API 한 페이지 조회 (모든 워커가 search_limiter와 keep-alive 세션 공유)
+    rate limit 응답은 최대 MAX_RATE_LIMIT_RETRIES번 재시도. 요청 예외/오류 응답/재시도 소진은 None
+    """
+    params = {
+        "q": query,
+        "sort": "created",
+        "order": "desc",
+        "per_page": SEARCH_PER_PAGE,
+        "page": page
+    }
+
+    for _ in range(MAX_RATE_LIMIT_RETRIES):
+        search_limiter.acquire()
+        try:
+            resp = session.get(SEARCH_URL, headers=HEADERS, params=params, timeout=30)
+        except Exception as e:
+            print(f"Search exception for {query} (page {page}): {e}")
+            return None
+        search_limiter.update_from_headers(resp.headers)
+
+        if is_rate_limited(resp):
+            search_limiter.pause_until(rate_limit_reset_time(resp))
+            metrics.count("github.retries")
             continue
 
         if resp.status_code != 200:
             print(f"Error {resp.status_code}: {resp.text[:200]}")
-            break
-
-        data = resp.json()
-        items = data.get("items", [])
-
-        if not items:
-            break
-
-        all_issues.extend(items)
-        print(f"  Fetched {len(all_issues)}/{data.get('total_count', '?')} issues")
-
-        if len(items) < per_page:
-            break
-
-        page += 1
-        time.sleep(2)  # Rate limit 방지
-
-    return all_issues[:max_results]
-
-
-def fetch_good_first_issues() -> list:
-    """모든 good first issues 수집"""
-    all_issues = []
-
-    # 1. 언어별로 검색 (검색 결과 1000개 제한 우회)
-    for lang in LANGUAGES:
-        print(f"Searching {lang}...")
-        query = f'label:"good first issue" is:open is:issue language:{lang}'
-        issues = search_issues(query, max_results=500)
-        all_issues.extend(issues)
-        print(f"  Found {len(issues)} issues for {lang}")
-        time.sleep(1)
-
-    # 2. 언어 없는 이슈도 검색 (최근 것만)
-    print("Searching recent issues without language filter...")
-    query = 'label:"good first issue" is:open is:issue created:>=' + \
-            (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
-    issues = search_issues(query, max_results=500)
-    all_issues.extend(issues)
-
-    # 중복 제거
-    seen = set()
-    unique_issues = []
-    for issue in all_issues:
-        if issue["id"] not in seen:
-            seen.add(issue["id"])
-            unique_issues.append(issue)
-
-    print(f"Total unique issues: {len(unique_issues)}")
-    return unique_issues
+            return None
+
+        return resp.json()
+
+    print(f"Gave up on search {query} (page {page}) after {MAX_RATE_LIMIT_RETRIES} rate-limited attempts")
+    return None
+
+
+def search_page_items(query: str, page: int) -> list | None:
+    """나머지 페이지 조회. 실패하면 None"""
+    data = search_page(query, page)
+    return data.get("items", []) if data is not None else None
+
+
+def format_search_time(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def search_shard(base_query: str, start: datetime, end: datetime) -> tuple[list, list, list] | None:
+    """
+    created:[start, end] 범위의 첫 페이지 검색.
+    결과가 1000건을 넘으면 수집하지 않고 이등분한 하위 범위를 반환.
+    Returns: (첫 페이지 issues, 하위 범위 목록, 남은 페이지 [(query, page)]), 첫 페이지 조회 실패면 None
+    """
+    query = f"{base_query} created:{format_search_time(start)}..{format_search_time(end)}"
+    data = search_page(query, 1)
+    if data is None:
+        return None
+
+    total = data.get("total_count", 0)
+    if total > SEARCH_RESULT_CAP and end - start > timedelta(seconds=1):
+        mid = start + timedelta(seconds=(end - start).total_seconds() // 2)
+        return [], [(start, mid), (mid + timedelta(seconds=1), end)], []
+
+    if data.get("incomplete_results"):
+        print(f"  Incomplete results for {query} (search timed out)")
+    if total > SEARCH_RESULT_CAP:
+        print(f"  {total} issues created at {format_search_time(start)}, only {SEARCH_RESULT_CAP} reachable")
+
+    pages = -(-min(total, SEARCH_RESULT_CAP) // SEARCH_PER_PAGE)
+    return data.get("items", []), [], [(query, page) for page in range(2, pages + 1)]
+
+
+def fetch_good_first_issues(since: datetime | None = None) -> tuple[list, int]:
+    """
+    모든 good first issues 수집 (since가 있으면 그 이후 업데이트된 이슈만)
+    created: 범위를 결과 1000건 이하가 될 때까지 재귀적으로 이등분하고,
+    샤드 첫 페이지/나머지 페이지를 모두 SEARCH_WORKERS개 스레드로 동시에 조회.
+    고정 sleep 없이 search_limiter가 허용하는 속도로만 호출.
+    Returns: (issues, 실패한 검색 호출 수)
+    """
+    updated = f" updated:>={format_search_time(since)}" if since else ""
+    base_query = SEARCH_QUERY + updated
+
+    unique_issues: dict[int, dict] = {}
+    shards = 0
+    calls = 0
+    failed_calls = 0
+    next_report = 50
+    started = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as pool:
+        futures = {pool.submit(search_shard, base_query, SEARCH_EPOCH, datetime.now(timezone.utc))}
+        while futures:
+            done, futures = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                calls += 1
+                result = future.result()
+                if result is None:
+                    # 실패한 범위/페이지는 빠짐 → 호출자가 watermark를 전진시키지 않도록 집계
+                    failed_calls += 1
+                    continue
+                if isinstance(result, tuple):
+                    issues, sub_ranges, rest_pages = result
+                    for start, end in sub_ranges:
+                        futures.add(pool.submit(search_shard, base_query, start, end))
+                    for query, page in rest_pages:
+                        futures.add(pool.submit(search_page_items, query, page))
+                    if not sub_ranges:
+                        shards += 1
+                else:
+                    issues = result
+
+                for issue in issues:
+                    unique_issues[issue["id"]] = issue
+
+            if calls >= next_report:
+                print(f"  Fetched {len(unique_issues)} issues ({shards} shards, {calls} calls)")
+                next_report += 50
+
+    elapsed = time.monotonic() - started
+    print(f"Total unique issues: {len(unique_issues)} "
+          f"({shards} shards, {calls} search calls in {elapsed:.0f}s, "
+          f"rate limit waits {search_limiter.total_wait:.0f}s)")
+    if failed_calls:
+        print(f"  {failed_calls} search calls failed, their created: ranges/pages are missing")
+        metrics.count("github.search_failures", failed_calls)
+    metrics.add_rows("github.search", rows_in=len(unique_issues))
+    return list(unique_issues.values()), failed_calls
 
 
 def transform_issue(issue: dict) -> dict:
@@ -131,101 +220,256 @@ def transform_issue(issue: dict) -> dict:
     }
 
 
-def upsert_issues(issues: list):
-    """이슈를 DB에 upsert"""
+def upsert_issues(issues: list) -> int:
+    """
+    이슈를 DB에 upsert (issue_sync.write_issue_rows). Returns: 일시적 오류로 반영하지 못한 행 수
+    - 실패한 배치는 이분해서 문제 행만 격리, github_id 충돌만 set-based update 한 번으로 반영
+    - 요청 간격은 고정 sleep 대신 일시적 오류율에 따라 조절
+    """
     if not issues:
-        return
-
-    # 배치로 upsert
-    batch_size = 100
-    batch_ok = 0
-    row_fallback_ok = 0
-    row_fallback_failed = 0
-
-    def upsert_single_with_fallback(issue: dict) -> bool:
-        """단건 upsert. github_id 충돌 시 github_id 기준 update로 복구."""
-        nonlocal row_fallback_ok, row_fallback_failed
-        try:
-            supabase.from_("issues").upsert(
-                [issue],
-                on_conflict="url"
-            ).execute()
-            row_fallback_ok += 1
-            return True
-        except Exception as e:
-            message = str(e).lower()
-            if "github_id" in message or "idx_issues_github_id" in message:
-                try:
-                    supabase.from_("issues").update(issue).eq("github_id", issue["github_id"]).execute()
-                    row_fallback_ok += 1
-                    return True
-                except Exception as update_err:
-                    print(f"Fallback update failed (github_id={issue['github_id']}): {update_err}")
-            else:
-                print(f"Single upsert failed (github_id={issue['github_id']}): {e}")
-
-            row_fallback_failed += 1
-            return False
+        return 0
 
-    for i in range(0, len(issues), batch_size):
-        batch = issues[i:i + batch_size]
-        transformed = [transform_issue(issue) for issue in batch]
-
-        try:
-            supabase.from_("issues").upsert(
-                transformed,
-                on_conflict="url"
-            ).execute()
-            batch_ok += 1
-            print(f"Upserted batch {i // batch_size + 1}/{(len(issues) - 1) // batch_size + 1}")
-        except Exception as e:
-            print(f"Error upserting batch: {e}")
-            # 배치 실패 시 레코드 단위로 재시도해 누락 최소화
-            for row in transformed:
-                upsert_single_with_fallback(row)
+    # 내용이 바뀐 이슈만 전송
+    rows = filter_changed(supabase, [transform_issue(issue) for issue in issues], change_stats)
+    if not rows:
+        metrics.add_rows("issues.upsert", rows_in=len(issues))
+        return 0
 
-        time.sleep(0.5)
+    pacer = AdaptivePacer()
+    written, recovered, transient = write_issue_rows(supabase, rows, pacer)
+    metrics.add_rows("issues.upsert", rows_in=len(issues), rows_out=written + recovered)
 
     print(
-        f"Upsert summary: batch_ok={batch_ok}, "
-        f"row_fallback_ok={row_fallback_ok}, row_fallback_failed={row_fallback_failed}"
+        f"Upsert summary: upserted={written}, github_id_updated={recovered}, "
+        f"failed={len(rows) - written - recovered} ({transient} transient), pacing_wait={pacer.total_wait:.1f}s, "
+        f"{change_stats.summary()}"
     )
+    return transient
+
+
+def build_issue_state_query(rows: list[dict]) -> tuple[str, dict]:
+    """
+    이슈 목록을 레포별 alias 쿼리 하나로 변환
+    r0: repository(owner: $o0, name: $n0) { i12: issue(number: 12) { state } ... }
+    """
+    by_repo: dict[str, list[int]] = {}
+    for row in rows:
+        by_repo.setdefault(row["repo_full_name"], []).append(int(row["issue_number"]))
+
+    params = []
+    fields = []
+    variables = {}
+    for i, (repo_full_name, numbers) in enumerate(by_repo.items()):
+        owner, _, name = repo_full_name.partition("/")
+        issues = " ".join(f"i{number}: issue(number: {number}) {{ state }}" for number in sorted(set(numbers)))
+        params.append(f"$o{i}: String!, $n{i}: String!")
+        fields.append(f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ {issues} }}")
+        variables[f"o{i}"] = owner
+        variables[f"n{i}"] = name
+
+    query = f"query({', '.join(params)}) {{\n  " + "\n  ".join(fields) + "\n}"
+    return query, variables
+
+
+def fetch_closed_issue_ids(rows: list[dict]) -> tuple[list[int], dict[str, str]] | None:
+    """
+    최대 100개 이슈 상태를 GraphQL 요청 1번으로 확인.
+    닫혔거나 더 이상 조회되지 않는 이슈(삭제/이전/레포 삭제, NOT_FOUND)의 id 반환.
+    요청 자체가 실패하면 None (해당 이슈는 다음 실행에서 다시 확인)
+    Returns: (닫힌 이슈 id 목록, NOT_FOUND 외의 오류로 조회하지 못한 레포 → 오류 type)
+    """
+    query, variables = build_issue_state_query(rows)
+    body = post_graphql(query, variables, HEADERS, graphql_limiter, f"{len(rows)} issue states")
+    if body is None:
+        return None
+
+    data = body.get("data") or {}
+    errors = body.get("errors") or []
+    not_found = set()
+    repo_errors = {}
+    for error in errors:
+        path = tuple(error.get("path") or ())
+        if error.get("type") == "NOT_FOUND" and path:
+            not_found.add(path)
+        elif len(path) == 1:
+            repo_errors[path[0]] = error.get("type") or "UNKNOWN"
+
+    # alias별 오류가 하나도 없이 data가 비었으면 요청 전체 실패
+    if not data and not any(error.get("path") for error in errors):
+        print(f"GraphQL state query failed: {errors}")
+        return None
+
+    aliases = {}
+    for row in rows:
+        aliases.setdefault(row["repo_full_name"], f"r{len(aliases)}")
+
+    closed = []
+    blocked = {}
+    for row in rows:
+        repo_alias = aliases[row["repo_full_name"]]
+        issue_alias = f"i{row['issue_number']}"
+        repo = data.get(repo_alias)
+        if repo is None:
+            if (repo_alias,) in not_found:
+                closed.append(row["id"])
+            else:
+                blocked[row["repo_full_name"]] = repo_errors.get(repo_alias, "UNKNOWN")
+            continue
+        issue = repo.get(issue_alias)
+        if issue is None:
+            if (repo_alias, issue_alias) in not_found:
+                closed.append(row["id"])
+            continue
+        if issue.get("state") != "OPEN":
+            closed.append(row["id"])
+    return closed, blocked
+
+
+def load_reconcile_backoff() -> tuple[set[str], set[str]]:
+    """
+    실패 기록이 있는 레포 (reconcile_backoff.sql)
+    Returns: (재시도 시각 전이라 이번에 건너뛸 레포, 재시도 시각이 지나 다시 확인할 레포)
+    """
+    try:
+        result = supabase.from_("repos") \
+            .select("repo_full_name, reconcile_retry_at") \
+            .gt("reconcile_failures", 0) \
+            .execute()
+    except Exception as e:
+        print(f"Reconcile backoff unavailable, checking all repos: {e}")
+        return set(), set()
+
+    now = datetime.now(timezone.utc)
+    waiting, retrying = set(), set()
+    for row in result.data or []:
+        retry_at = row.get("reconcile_retry_at")
+        if retry_at and datetime.fromisoformat(retry_at.replace("Z", "+00:00")) > now:
+            waiting.add(row["repo_full_name"])
+        else:
+            retrying.add(row["repo_full_name"])
+    return waiting, retrying
+
+
+def record_reconcile_results(blocked: set[str], recovered: set[str]) -> None:
+    """막힌 레포는 다음 확인을 미루고, backoff 후 확인에 성공한 레포는 초기화"""
+    if not blocked and not recovered:
+        return
+    try:
+        supabase.rpc("record_reconcile_results", {
+            "blocked": sorted(blocked),
+            "recovered": sorted(recovered),
+            "base_hours": RECONCILE_BACKOFF_HOURS,
+            "max_hours": RECONCILE_BACKOFF_MAX_HOURS,
+        }).execute()
+    except Exception as e:
+        print(f"Error recording reconcile backoff: {e}")
+
+
+def iter_open_issue_pages(page_size: int = RECONCILE_PAGE_SIZE):
+    """is_open 이슈를 (updated_at, id) keyset pagination으로 순회 (오래 갱신 안 된 것부터)"""
+    last = None
+    while True:
+        query = supabase.from_("issues") \
+            .select("id, repo_full_name, issue_number, updated_at") \
+            .eq("is_open", True) \
+            .not_.is_("updated_at", "null")
+        if last:
+            query = query.or_(
+                f'updated_at.gt."{last["updated_at"]}",'
+                f'and(updated_at.eq."{last["updated_at"]}",id.gt.{last["id"]})'
+            )
+        result = query.order("updated_at").order("id").limit(page_size).execute()
+
+        rows = result.data or []
+        if rows:
+            yield rows
+        if len(rows) < page_size:
+            return
+        last = rows[-1]
+
+
+def delete_issue_ids(ids: list[int]) -> int:
+    """id 목록 일괄 삭제. Returns: 실제로 삭제된 행 수 (그 사이 이미 지워진 행은 제외)"""
+    deleted = 0
+    for i in range(0, len(ids), 100):
+        batch = ids[i:i + 100]
+        try:
+            result = supabase.from_("issues") \
+                .delete(count=CountMethod.exact, returning=ReturnMethod.minimal) \
+                .in_("id", batch) \
+                .execute()
+            deleted += result.count or 0
+        except Exception as e:
+            print(f"Delete error: {e}")
+    return deleted
 
 
 def mark_closed_issues():
-    """DB에 있지만 더 이상 열려있지 않은 이슈 처리"""
-    # 최근 업데이트된 이슈 중 닫힌 것 확인
-    print("Checking for closed issues...")
-
-    result = supabase.from_("issues") \
-        .select("github_id") \
-        .eq("is_open", True) \
-        .order("updated_at", desc=True) \
-        .limit(500) \
-        .execute()
-
-    if not result.data:
+    """
+    DB에 열린 상태로 남아 있지만 GitHub에서 닫힌 이슈 삭제.
+    모든 is_open 이슈를 keyset pagination으로 훑으며 GraphQL 요청당 100개씩 상태를 확인한다.
+    (REST는 이슈 1개당 요청 1번)
+    """
+    if not GITHUB_TOKEN:
+        print("Closed issues check skipped (GraphQL requires GITHUB_TOKEN)")
         return
 
-    github_ids = [row["github_id"] for row in result.data]
-
-    # GitHub API로 상태 확인 (배치로)
-    closed_ids = []
-    for gid in github_ids[:100]:  # Rate limit 고려해서 100개만
-        # 이슈 상태 확인은 개별 API 호출 필요
-        # 여기서는 스킵하고 다음 ETL에서 자연스럽게 업데이트되도록 함
-        pass
-
-    print(f"Closed issues check skipped (will be updated naturally)")
-
-
+    print("Checking for closed issues...")
+    waiting, retrying = load_reconcile_backoff()
+    checked = 0
+    closed_total = 0
+    requests_made = 0
+    failed_chunks = 0
+    skipped = 0
+    blocked = {}
+    answered = set()
+    started = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=RECONCILE_WORKERS) as pool:
+        for rows in iter_open_issue_pages():
+            # backoff 중인 레포는 GraphQL 요청에서 제외 (keyset 순회는 그대로)
+            pending = [row for row in rows if row["repo_full_name"] not in waiting]
+            skipped += len(rows) - len(pending)
+            chunks = [pending[i:i + RECONCILE_BATCH_SIZE] for i in range(0, len(pending), RECONCILE_BATCH_SIZE)]
+            closed = []
+            for chunk, result in zip(chunks, pool.map(fetch_closed_issue_ids, chunks)):
+                requests_made += 1
+                if result is None:
+                    failed_chunks += 1
+                    continue
+                chunk_closed, chunk_blocked = result
+                blocked.update(chunk_blocked)
+                answered.update(row["repo_full_name"] for row in chunk if row["repo_full_name"] not in chunk_blocked)
+                checked += sum(1 for row in chunk if row["repo_full_name"] not in chunk_blocked)
+                closed.extend(chunk_closed)
+
+            # keyset 커서는 값 기준이라 순회 중 삭제해도 다음 페이지가 밀리지 않음
+            deleted = delete_issue_ids(closed)
+            closed_total += deleted
+            metrics.add_rows("issues.reconcile", rows_in=len(rows), rows_out=deleted)
+            print(f"  Checked {checked} open issues, {closed_total} closed")
+
+    if blocked:
+        sample = ", ".join(f"{repo} ({error})" for repo, error in sorted(blocked.items())[:10])
+        print(f"  {len(blocked)} repos not readable (backing off): {sample}")
+    metrics.count("github.reconcile_blocked_repos", len(blocked))
+    metrics.count("github.reconcile_backoff_skipped", skipped)
+    record_reconcile_results(set(blocked), (retrying & answered) - set(blocked))
+
+    print(f"Closed issues: {closed_total} deleted out of {checked} checked "
+          f"({requests_made} GraphQL requests, {checked / max(requests_made, 1):.0f} issues/request, "
+          f"{failed_chunks} failed, {len(blocked)} repos blocked, {skipped} skipped in backoff, "
+          f"{time.monotonic() - started:.0f}s)")
+
+
+@record_run("fetch_issues_github")
 def main():
     print("=" * 50)
     print("GitHub Good First Issues ETL")
     print("=" * 50)
 
     # Rate limit 확인
-    resp = requests.get("https://api.github.com/rate_limit", headers=HEADERS)
+    resp = session.get(f"{GITHUB_API_URL}/rate_limit", headers=HEADERS, timeout=30)
     if resp.status_code == 200:
         limits = resp.json()["resources"]
         search = limits["search"]
@@ -233,12 +477,38 @@ def main():
         print(f"Search API: {search['remaining']}/{search['limit']}")
         print(f"Core API: {core['remaining']}/{core['limit']}")
 
+    # 증분 범위 결정
+    since = None
+    if not FULL_RESYNC:
+        try:
+            watermark = checkpoint_store.get(CHECKPOINT_SOURCE)
+        except Exception as e:
+            print(f"Error reading watermark: {e}")
+            watermark = None
+        if watermark:
+            since = watermark - timedelta(minutes=WATERMARK_LAG_MINUTES)
+            print(f"Incremental sync since {since.isoformat()}")
+
     # 이슈 수집
-    issues = fetch_good_first_issues()
+    issues, search_failures = fetch_good_first_issues(since)
 
     # DB에 저장
     print("Saving to database...")
-    upsert_issues(issues)
+    write_failures = upsert_issues(issues)
+
+    # 닫힌 이슈 정리
+    mark_closed_issues()
+
+    # 검색과 저장이 모두 성공했을 때만 watermark 전진
+    # (빠진 created: 범위나 저장 실패 행이 있으면 다음 실행이 같은 since부터 다시 검색)
+    tracker = WatermarkTracker()
+    for issue in issues:
+        tracker.observe(issue.get("updated_at"))
+    if search_failures or write_failures:
+        print(f"{search_failures} failed search calls, {write_failures} failed writes, watermark not advanced")
+    elif tracker.value:
+        checkpoint_store.set(CHECKPOINT_SOURCE, tracker.value)
+        print(f"Watermark advanced to {tracker.value.isoformat()}")
 
     print("=" * 50)
     print(f"Done! Processed {len(issues)} issues")
@@ -0,0 +1,225 @@
+"""
+GH Archive 파일 오프라인 수집: 로컬 디렉터리의 YYYY-MM-DD-H.json.gz → Supabase
+BigQuery(githubarchive.day.*) 대신 https://data.gharchive.org/ 시간별 파일을 직접 읽는 대체 소스
+- 파일 단위로 프로세스 풀에 분배, gzip 스트리밍 해제 + 줄 단위 파싱 (파일 전체를 메모리에 올리지 않음)
+- json.loads 전에 "IssuesEvent" 부분 문자열로 먼저 거름 (대부분의 줄은 다른 이벤트)
+- BigQuery 쿼리의 WHERE와 같은 라벨 조건으로 후보만 남기고, 같은 컬럼 이름의 행으로 변환
+- URL, 발생 시각, 이벤트 id 순으로 정렬한 뒤 issue_sync.classify_rows → sync_issue_events (BigQuery 경로와 동일)
+- BigQuery 클라이언트/GCP 자격 증명 없이 Supabase만 있으면 동작
+- watermark는 소스 "gharchive_files"로 따로 저장 → 같은 디렉터리를 다시 돌리면 새 파일만 처리
+
+사용법: python gharchive_files.py ./gharchive [--since 2024-01-01] [--until 2024-02-01] [--workers 4]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from labels import is_good_first_label
+from metrics import record_run
+
+CHECKPOINT_SOURCE = "gharchive_files"
+ISSUES_EVENT_MARKER = b'"IssuesEvent"'
+FILE_NAME = re.compile(r"^(\d{4}-\d{2}-\d{2})-(\d{1,2})\.json\.gz$")
+ACTIONS = frozenset(("opened", "labeled", "reopened", "closed", "unlabeled"))
+
+# build_issue_events_query의 SELECT 컬럼과 같은 이름 (classify_event/build_issue가 그대로 사용)
+ArchiveRow = namedtuple("ArchiveRow", [
+    "repo_name", "event_created_at", "event_id", "action", "github_id", "issue_number", "title", "url",
+    "author", "labels_json", "state", "issue_created_at", "comment_count", "removed_label",
+])
+
+
+def archive_hour(path: str) -> datetime | None:
+    """파일 이름의 시각 (YYYY-MM-DD-H.json.gz), 형식이 다르면 None"""
+    match = FILE_NAME.match(os.path.basename(path))
+    if not match:
+        return None
+    day = datetime.strptime(match.group(1), "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    return day + timedelta(hours=int(match.group(2)))
+
+
+def list_archive_files(directory: str, since: datetime | None = None, until: datetime | None = None) -> list[str]:
+    """[since, until) 시간대의 파일을 시각 순으로 (since는 그 시각을 포함하는 파일부터)"""
+    files = []
+    for name in os.listdir(directory):
+        hour = archive_hour(name)
+        if hour is None:
+            continue
+        if since and hour + timedelta(hours=1) <= since:
+            continue
+        if until and hour >= until:
+            continue
+        files.append((hour, os.path.join(directory, name)))
+    return [path for _, path in sorted(files)]
+
+
+def is_candidate(action: str, issue: dict, removed_label: str | None) -> bool:
+    """BigQuery 쿼리의 WHERE CASE action ...와 같은 조건"""
+    if action == "unlabeled":
+        return is_good_first_label(removed_label or "")
+    labels = issue.get("labels") or []
+    has_good_first = any(isinstance(l, dict) and is_good_first_label(l.get("name") or "") for l in labels)
+    if action == "closed":
+        return has_good_first
+    return issue.get("state") == "open" and has_good_first
+
+
+def to_row(event: dict) -> ArchiveRow | None:
+    """IssuesEvent 한 건 → ArchiveRow (후보가 아니면 None)"""
+    payload = event.get("payload") or {}
+    action = payload.get("action")
+    if action not in ACTIONS:
+        return None
+    issue = payload.get("issue") or {}
+    removed_label = (payload.get("label") or {}).get("name")
+    if not is_candidate(action, issue, removed_label):
+        return None
+
+    def scalar(value):
+        # JSON_EXTRACT_SCALAR처럼 문자열로
+        return None if value is None else str(value)
+
+    return ArchiveRow(
+        repo_name=(event.get("repo") or {}).get("name") or "",
+        event_created_at=event.get("created_at"),
+        event_id=int(event["id"]) if str(event.get("id") or "").isdigit() else None,
+        action=action,
+        github_id=scalar(issue.get("id")),
+        issue_number=scalar(issue.get("number")),
+        title=issue.get("title"),
+        url=issue.get("html_url"),
+        author=(issue.get("user") or {}).get("login"),
+        labels_json=json.dumps(issue.get("labels") or []),
+        state=issue.get("state"),
+        issue_created_at=issue.get("created_at"),
+        comment_count=scalar(issue.get("comments")),
+        removed_label=removed_label,
+    )
+
+
+def parse_archive_file(path: str) -> tuple[list[ArchiveRow], dict]:
+    """
+    (프로세스 풀 워커) 파일 하나를 스트리밍으로 읽어 후보 행과 통계 반환
+    Returns: (rows, {"lines", "issues_events", "bytes", "seconds"})
+    """
+    started = time.process_time()
+    rows = []
+    lines = issues_events = 0
+
+    with gzip.open(path, "rb") as f:
+        for line in f:
+            lines += 1
+            if ISSUES_EVENT_MARKER not in line:
+                continue
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if event.get("type") != "IssuesEvent":
+                continue  # 다른 이벤트 본문에 문자열만 들어 있는 경우
+            issues_events += 1
+            row = to_row(event)
+            if row:
+                rows.append(row)
+
+    stats = {
+        "lines": lines,
+        "issues_events": issues_events,
+        "bytes": os.path.getsize(path),
+        "seconds": time.process_time() - started,
+    }
+    return rows, stats
+
+
+def read_archive_rows(files: list[str], workers: int, totals: dict | None = None) -> list[ArchiveRow]:
+    """
+    파일들을 프로세스 풀에서 병렬로 파싱해 후보 행을 (url, 발생 시각, 이벤트 id) 순으로 반환
+    (fold_issue_events가 URL별로 연속된 정렬 스트림을 기대. 후보 행은 전체 이벤트의 일부라 메모리에서 정렬)
+    totals: 파일 통계 합계를 채울 dict
+    """
+    totals = totals if totals is not None else {}
+    for key in ("files", "lines", "issues_events", "bytes", "seconds"):
+        totals.setdefault(key, 0)
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for path, (file_rows, stats) in zip(files, pool.map(parse_archive_file, files)):
+            rows.extend(file_rows)
+            totals["files"] += 1
+            for key, value in stats.items():
+                totals[key] += value
+            print(f"  {os.path.basename(path)}: {stats['lines']} events, "
+                  f"{stats['issues_events']} IssuesEvent, {len(file_rows)} candidates")
+
+    rows.sort(key=lambda row: (row.url or "", row.event_created_at or "", row.event_id or 0))
+    return rows
+
+
+@record_run("gharchive_files")
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", help="YYYY-MM-DD-H.json.gz 파일이 있는 디렉터리")
+    parser.add_argument("--since", help="이 날짜(UTC, YYYY-MM-DD)부터. 없으면 저장된 watermark부터")
+    parser.add_argument("--until", help="이 날짜(UTC, YYYY-MM-DD) 전까지")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    # Supabase 클라이언트는 메인 프로세스에서만 (워커는 파싱만 하므로 import하지 않음)
+    import issue_sync
+    from checkpoint import WatermarkTracker, get_checkpoint_store
+
+    checkpoint_store = get_checkpoint_store(issue_sync.supabase)
+
+    print("=" * 50)
+    print(f"GoodFirst ETL (GH Archive files) - {datetime.now(timezone.utc).isoformat()}")
+    print("=" * 50)
+
+    if args.since:
+        since = datetime.strptime(args.since, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    else:
+        since = checkpoint_store.get(CHECKPOINT_SOURCE)
+    until = datetime.strptime(args.until, "%Y-%m-%d").replace(tzinfo=timezone.utc) if args.until else None
+
+    files = list_archive_files(args.directory, since, until)
+    print(f"Files: {len(files)} in {args.directory} (since {since.isoformat() if since else 'beginning'})")
+    if not files:
+        return
+
+    started = time.monotonic()
+    totals = {}
+    rows = read_archive_rows(files, args.workers, totals)
+    parse_wall = time.monotonic() - started
+    print(f"Parsed {totals['lines']} events ({totals['bytes'] / 1e6:.0f} MB gz) in {parse_wall:.1f}s "
+          f"with {args.workers} workers: {totals['issues_events']} IssuesEvent, {len(rows)} candidates")
+    if totals["seconds"]:
+        print(f"  {totals['lines'] / totals['seconds']:.0f} events/sec/core")
+
+    issue_sync.membership.refresh(issue_sync.supabase)
+    tracker = WatermarkTracker()
+    saved, deleted_closed, deleted_unlabeled = issue_sync.sync_issue_events(
+        issue_sync.classify_rows(rows, tracker)
+    )
+    issue_sync.membership.save()
+    print(f"✓ Upserted {saved} issues ({issue_sync.change_stats.summary()})")
+    print(f"✓ Deleted {deleted_closed} closed issues ({issue_sync.membership.summary()})")
+    print(f"✓ Deleted {deleted_unlabeled} unlabeled issues")
+
+    if any(issue_sync.write_failures.values()):
+        print(f"Write failures {issue_sync.write_failures}, watermark not advanced")
+    elif tracker.value:
+        checkpoint_store.set(CHECKPOINT_SOURCE, tracker.value)
+        print(f"✓ Watermark ({CHECKPOINT_SOURCE}) advanced to {tracker.value.isoformat()}")
+
+    print("=" * 50)
+    print(f"Done in {time.monotonic() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+GitHub API 공용 유틸
+- rate limit 헤더 기반 토큰 버킷
+- keep-alive 커넥션 풀을 공유하는 HTTP 세션
+"""
+
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import instrument_github_session, metrics
+
+# 로컬 가짜 서버로 처리량을 측정할 때 바꿔서 사용
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+GITHUB_GRAPHQL_URL = os.environ.get("GITHUB_GRAPHQL_URL", f"{GITHUB_API_URL}/graphql")
+HTTP_POOL_SIZE = 32
+MAX_RATE_LIMIT_RETRIES = 5
+
+
+def create_session(pool_size: int = HTTP_POOL_SIZE) -> requests.Session:
+    """워커 스레드들이 함께 쓰는 세션 (호스트당 최대 pool_size개 커넥션 재사용)"""
+    s = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+session = instrument_github_session(create_session())
+
+
+class RateLimiter:
+    """
+    여러 워커가 공유하는 토큰 버킷.
+    - 응답의 X-RateLimit-Remaining/X-RateLimit-Reset으로 리필 속도를 매번 재계산
+      (남은 쿼터를 리셋 시각까지 균등 분배)
+    - 쿼터 소진 시 pause_until()로 모든 워커를 함께 정지
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate  # 초당 토큰
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.remaining = None
+        self.reset_at = 0.0
+        self.paused_until = 0.0
+        self.total_wait = 0.0
+        self._last_refill = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def acquire(self) -> float:
+        """토큰 1개 획득 (필요하면 대기). 대기한 시간(초) 반환"""
+        waited = 0.0
+        with self._cond:
+            while True:
+                pause = self.paused_until - time.time()
+                if pause > 0:
+                    wait = pause
+                else:
+                    self._refill()
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        self.total_wait += waited
+                        metrics.add_wait("github.rate_limit", waited)
+                        return waited
+                    wait = (1 - self.tokens) / self.rate if self.rate > 0 else 1.0
+                start = time.monotonic()
+                self._cond.wait(timeout=wait)
+                waited += time.monotonic() - start
+
+    def update_from_headers(self, headers) -> None:
+        """응답 헤더로 남은 쿼터/리셋 시각 갱신 후 리필 속도 재계산"""
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+
+        remaining = int(remaining)
+        reset = float(reset)
+
+        with self._cond:
+            # 동시 요청의 응답 순서가 뒤바뀔 수 있으므로 같은 윈도우에서는 작은 값만 신뢰
+            if reset == self.reset_at and self.remaining is not None and remaining > self.remaining:
+                return
+
+            self.remaining = remaining
+            self.reset_at = reset
+            window = max(reset - time.time(), 1.0)
+
+            if remaining <= 0:
+                self._pause_locked(reset + 1)
+            else:
+                self._refill()
+                self.rate = remaining / window
+                self.tokens = min(self.tokens, remaining)
+            self._cond.notify_all()
+
+    def pause_until(self, timestamp: float) -> None:
+        """모든 워커를 timestamp(epoch 초)까지 정지"""
+        with self._cond:
+            self._pause_locked(timestamp)
+            self._cond.notify_all()
+
+    def _pause_locked(self, timestamp: float):
+        if timestamp > self.paused_until:
+            self.paused_until = timestamp
+            print(f"Rate limited. Pausing all workers for {timestamp - time.time():.0f}s...")
+
+
+def is_rate_limited(resp) -> bool:
+    """403/429 응답이 rate limit 때문인지 판정 (권한 문제 403과 구분)"""
+    if resp.status_code not in (403, 429):
+        return False
+    if resp.headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in resp.headers:
+        return True
+    return "rate limit" in resp.text.lower()
+
+
+def rate_limit_reset_time(resp, default_wait: float = 60) -> float:
+    """rate limit 응답에서 재시도 가능한 시각(epoch 초) 계산 (Retry-After 우선)"""
+    retry_after = resp.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return time.time() + int(retry_after)
+    reset = int(resp.headers.get("X-RateLimit-Reset", 0))
+    if reset > time.time():
+        return reset + 1
+    return time.time() + default_wait
+
+
+def post_graphql(query: str, variables: dict, headers: dict, limiter: RateLimiter, label: str) -> dict | None:
+    """
+    GraphQL 요청 1회 (rate limit 응답이면 limiter로 모든 워커를 멈춘 뒤 재시도).
+    Returns: 응답 body (data/errors), 요청 자체가 실패하면 None
+    """
+    headers = {**headers, "Content-Type": "application/json"}
+
+    for _ in range(MAX_RATE_LIMIT_RETRIES):
+        limiter.acquire()
+        try:
+            resp = session.post(
+                GITHUB_GRAPHQL_URL,
+                json={"query": query, "variables": variables},
+                headers=headers,
+                timeout=30
+            )
+        except Exception as e:
+            print(f"GraphQL exception for {label}: {e}")
+            return None
+
+        limiter.update_from_headers(resp.headers)
+
+        if is_rate_limited(resp):
+            limiter.pause_until(rate_limit_reset_time(resp))
+            metrics.count("github.retries")
+            continue
+        if resp.status_code != 200:
+            print(f"GraphQL error {resp.status_code} for {label}")
+            return None
+
+        body = resp.json()
+        if any(error.get("type") == "RATE_LIMITED" for error in body.get("errors") or []):
+            limiter.pause_until(rate_limit_reset_time(resp))
+            metrics.count("github.retries")
+            continue
+        return body
+
+    print(f"Gave up on GraphQL {label} after {MAX_RATE_LIMIT_RETRIES} rate-limited attempts")
+    return None
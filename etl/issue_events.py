@@ -0,0 +1,26 @@
+"""
+이슈 이벤트 → 최종 상태 fold
+한 동기화 윈도우 안에서 열림/닫힘/재오픈/라벨 변경이 섞여도 URL당 최종 상태 하나만 남긴다.
+(DB/BigQuery 클라이언트 의존 없음 - 벤치마크에서 직접 import)
+"""
+
+from itertools import groupby
+from typing import Iterable, Iterator
+
+# (kind, url, issue): kind는 'upsert' | 'closed' | 'unlabeled', issue는 upsert일 때만
+IssueEvent = tuple[str, str, dict | None]
+
+
+def fold_issue_events(events: Iterable[IssueEvent]) -> Iterator[IssueEvent]:
+    """
+    URL별로 연속되고 URL 안에서는 발생 시각 순으로 정렬된 이벤트 스트림을 받아
+    URL당 최종 상태 이벤트 하나만 생성.
+    - 마지막 이벤트가 upsert → 마지막 시점의 이슈 내용으로 upsert
+    - 마지막 이벤트가 closed/unlabeled → delete
+    메모리는 URL 하나의 이벤트만큼만 사용.
+    """
+    for _, group in groupby(events, key=lambda event: event[1]):
+        final = None
+        for final in group:
+            pass
+        yield final
@@ -0,0 +1,282 @@
+"""
+이슈 이벤트 → Supabase 반영 (BigQuery와 무관한 공통 쓰기 경로)
+- 행 분류(classify_event) + URL별 fold(classify_rows)
+- 스트리밍 upsert/delete 버퍼 반영(sync_issue_events), 변경 감지, 저장 URL membership filter
+- 소스별 진입점(fetch_issues.py: BigQuery, gharchive_files.py: 로컬 GH Archive 파일)이 함께 사용
+  → import 시 Supabase 클라이언트만 만들고 GCP 자격 증명/BigQuery 클라이언트는 필요 없음
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Iterator
+
+from dotenv import load_dotenv
+from postgrest.types import ReturnMethod
+from supabase import Client, create_client
+
+from batching import is_data_error, is_foreign_key_violation, is_unique_violation, write_in_chunks
+from change_detection import ChangeStats, filter_changed
+from checkpoint import WatermarkTracker
+from issue_events import IssueEvent, fold_issue_events
+from labels import is_good_first_label
+from membership import IssueMembership
+from metrics import instrument_supabase, metrics
+from repos import upsert_repos
+
+load_dotenv()
+
+# Supabase 연결
+supabase: Client = instrument_supabase(create_client(
+    os.environ["SUPABASE_URL"],
+    os.environ["SUPABASE_KEY"]
+))
+
+FLUSH_SIZE = 1000  # 스트리밍 중 upsert/delete 버퍼 flush 단위
+UPSERT_BATCH_SIZE = 100
+GITHUB_ID_INDEX = "idx_issues_github_id"
+REPO_FK = "fk_issues_repo"
+
+# 변경 없는 이슈 skip 통계 (실행 단위)
+change_stats = ChangeStats()
+
+# 일시적 오류로 반영하지 못한 행 수 (실행 단위). 0이 아니면 watermark를 전진시키지 않음 → 다음 실행이 같은 구간을 다시 읽음
+# (데이터 오류로 실패한 행은 다시 읽어도 같은 결과라 집계하지 않음)
+write_failures = {"upsert": 0, "delete": 0}
+
+# 저장된 이슈 URL Bloom filter (closed/unlabeled 삭제 후보 필터링, 실행 간 유지)
+MEMBERSHIP_PATH = os.environ.get(
+    "MEMBERSHIP_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "issue_membership.bin")
+)
+MEMBERSHIP_MAX_AGE_HOURS = float(os.environ.get("MEMBERSHIP_MAX_AGE_HOURS", "24"))
+membership = IssueMembership(MEMBERSHIP_PATH, MEMBERSHIP_MAX_AGE_HOURS)
+
+
+def classify_rows(rows: Iterable, tracker: WatermarkTracker | None = None) -> Iterator[IssueEvent]:
+    """행 스트림 분류 + URL별 fold. tracker가 주어지면 처리한 이벤트의 최대 시각을 기록"""
+    def classified():
+        for row in rows:
+            if tracker:
+                tracker.observe(row.event_created_at)
+            event = classify_event(row)
+            if event:
+                yield event
+
+    return fold_issue_events(classified())
+
+
+def classify_event(row) -> IssueEvent | None:
+    """BigQuery 결과 행 하나를 (kind, url, issue)로 분류. 관심 없는 이벤트는 None"""
+    action = row.action
+    url = row.url
+
+    if not url:
+        return None
+
+    # 닫힌 이슈
+    if action == 'closed':
+        return 'closed', url, None
+
+    # 라벨 제거된 이슈 (good first issue 관련 라벨만)
+    if action == 'unlabeled':
+        removed_label = row.removed_label or ""
+        if is_good_first_label(removed_label):
+            return 'unlabeled', url, None
+        return None
+
+    # 새 이슈 / 라벨 추가 / 재오픈 (opened, labeled, reopened)
+    if action in ('opened', 'labeled', 'reopened') and row.state == 'open':
+        labels = []
+        if row.labels_json:
+            try:
+                labels_data = json.loads(row.labels_json)
+                labels = [l.get("name", "") for l in labels_data if isinstance(l, dict)]
+            except json.JSONDecodeError:
+                labels = []
+
+        if any(is_good_first_label(label) for label in labels):
+            return 'upsert', url, build_issue(row, labels)
+
+    return None
+
+
+def build_issue(row, labels: list[str]) -> dict:
+    """BigQuery 결과 행을 issues 테이블 행으로 변환"""
+    repo_parts = row.repo_name.split("/")
+    owner = repo_parts[0] if len(repo_parts) > 0 else ""
+    repo = repo_parts[1] if len(repo_parts) > 1 else row.repo_name
+
+    return {
+        "github_id": int(row.github_id) if row.github_id else None,
+        "issue_number": int(row.issue_number) if row.issue_number else 0,
+        "repo_full_name": row.repo_name,
+        "repo_owner": owner,
+        "repo_name": repo,
+        "title": row.title[:500] if row.title else "",
+        "url": row.url,
+        "labels": labels,
+        "created_at": row.issue_created_at,
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+        "comment_count": int(row.comment_count) if row.comment_count else 0,
+        "is_open": True
+    }
+
+
+def sync_issue_events(events: Iterable[IssueEvent],
+                      on_new_repos: Callable[[list[str]], None] | None = None) -> tuple[int, int, int]:
+    """
+    이벤트 스트림을 받아 URL 기준 last-event-wins로 중복 제거하며
+    upsert/delete 버퍼가 FLUSH_SIZE에 도달할 때마다 DB에 반영.
+    DB 쓰기는 별도 스레드에서 진행되어 BigQuery 결과 다운로드와 겹친다 (버퍼는 최대 2개만 유지).
+    on_new_repos: repos에 새로 추가된 레포 이름을 받을 콜백 (pipeline.py의 enrich 단계)
+
+    Returns: (saved, deleted_closed, deleted_unlabeled)
+    """
+    pending_upserts: dict[str, dict] = {}
+    pending_deletes: dict[str, str] = {}  # url -> 'closed' | 'unlabeled'
+    totals = {"upsert": 0, "closed": 0, "unlabeled": 0}
+    events_seen = 0
+
+    def write(upserts: list[dict], deletes: dict[str, str]):
+        totals["upsert"] += upsert_issues(upserts, on_new_repos)
+        for kind in ("closed", "unlabeled"):
+            totals[kind] += delete_issues([url for url, k in deletes.items() if k == kind])
+
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        in_flight = None
+
+        def flush():
+            nonlocal pending_upserts, pending_deletes, in_flight
+            if in_flight:
+                in_flight.result()
+            in_flight = writer.submit(write, list(pending_upserts.values()), pending_deletes)
+            pending_upserts, pending_deletes = {}, {}
+
+        for kind, url, issue in events:
+            events_seen += 1
+            if kind == 'upsert':
+                pending_deletes.pop(url, None)
+                pending_upserts[url] = issue
+            else:
+                pending_upserts.pop(url, None)
+                pending_deletes[url] = kind
+
+            if len(pending_upserts) >= FLUSH_SIZE or len(pending_deletes) >= FLUSH_SIZE:
+                flush()
+
+        flush()
+        in_flight.result()
+
+    print(f"  Processed {events_seen} events")
+    return totals["upsert"], totals["closed"], totals["unlabeled"]
+
+
+def resolve_github_id_conflicts(client, rows: list[dict]) -> int:
+    """
+    url 기준 upsert가 github_id unique 위반으로 실패한 행을 github_id 기준으로 한 번에 update
+    (bulk_issue_github_id.sql). 레포 이전 등으로 URL만 바뀐 이슈가 여기에 해당.
+    다른 이유로 실패한 행(FK 위반, 잘못된 데이터 등)은 UPDATE 전체를 실패시키므로 호출자가 걸러서 전달.
+    RPC 실패는 호출자에게 그대로 전달. Returns: 반영된 행 수
+    """
+    rows = [row for row in rows if row.get("github_id")]
+    if not rows:
+        return 0
+    result = client.rpc("bulk_update_issues_by_github_id", {"payload": rows}).execute()
+    return int(result.data or 0)
+
+
+def is_issue_data_error(error: Exception) -> bool:
+    """
+    재시도해도 같은 결과인 issues 쓰기 오류인지.
+    fk_issues_repo 위반(23503)은 레포 행 쓰기 실패/경합 때문이라 일시적 오류로 취급 (이분하지 않고 재시도 후 실패 집계)
+    """
+    return is_data_error(error) and not is_foreign_key_violation(error, REPO_FK)
+
+
+def write_issue_rows(client, rows: list[dict], pacer=None,
+                     on_new_repos: Callable[[list[str]], None] | None = None) -> tuple[int, int, int]:
+    """
+    issues 행을 url 기준으로 upsert
+    - issues.repo_full_name → repos 참조이므로 레포 행 먼저 보장, 레포를 쓰지 못한 이슈는 보내지 않음
+    - 실패한 배치는 이분해서 문제 행만 격리 (batching.write_in_chunks)
+    - 격리된 행 중 github_id 충돌(idx_issues_github_id 위반)만 set-based update 한 번으로 반영
+    Returns: (upsert된 행 수, github_id로 반영된 행 수, 일시적 오류로 반영하지 못한 행 수)
+    """
+    held: list[dict] = []
+    transient = 0
+    new_repos, failed_repos = upsert_repos(client, rows, pacer)
+    print(f"  Added {len(new_repos)} new repos")
+    if new_repos and on_new_repos:
+        on_new_repos(new_repos)
+
+    if failed_repos:
+        blocked = {row["repo_full_name"]: is_data_error(error) for row, error in failed_repos}
+        held = [row for row in rows if row["repo_full_name"] in blocked]
+        rows = [row for row in rows if row["repo_full_name"] not in blocked]
+        transient += sum(1 for row in held if not blocked[row["repo_full_name"]])
+        print(f"  Held {len(held)} issues whose repo could not be written")
+
+    def write(chunk: list[dict]):
+        client.table("issues").upsert(chunk, on_conflict="url", returning=ReturnMethod.minimal).execute()
+
+    written, failed = write_in_chunks(rows, write, UPSERT_BATCH_SIZE, label="issue", pacer=pacer,
+                                      data_error=is_issue_data_error)
+    transient += sum(1 for _, error in failed if not is_issue_data_error(error))
+
+    conflicts = [row for row, error in failed if is_unique_violation(error, GITHUB_ID_INDEX)]
+    recovered = 0
+    try:
+        recovered = resolve_github_id_conflicts(client, conflicts)
+    except Exception as e:
+        print(f"  github_id conflict update failed: {e}")
+        transient += len(conflicts)
+
+    skipped = len(held) + len(failed) - transient - recovered
+    if skipped > 0:
+        print(f"  Skipped {skipped} issues with data errors (not retried)")
+    return written, recovered, transient
+
+
+def upsert_issues(issues: list[dict], on_new_repos: Callable[[list[str]], None] | None = None) -> int:
+    """이슈를 DB에 upsert (write_issue_rows). 일시적 오류로 실패한 행은 write_failures에 집계"""
+    # 내용이 바뀐 이슈만 전송
+    received = len(issues)
+    issues = filter_changed(supabase, issues, change_stats)
+    if not issues:
+        metrics.add_rows("issues.upsert", rows_in=received)
+        return 0
+
+    written, recovered, transient = write_issue_rows(supabase, issues, on_new_repos=on_new_repos)
+    # 저장된 행이 필터에서 빠지지 않도록 실패 여부와 무관하게 추가 (false positive는 no-op DELETE 한 번)
+    membership.add([issue["url"] for issue in issues])
+    write_failures["upsert"] += transient
+
+    total = written + recovered
+    metrics.add_rows("issues.upsert", rows_in=received, rows_out=total)
+    return total
+
+
+def delete_issues(urls: list[str]) -> int:
+    """이슈 삭제 (membership filter에 없는 URL = 저장된 적 없는 이슈는 요청하지 않음)"""
+    received = len(urls)
+    urls = membership.filter(urls)
+    if not urls:
+        metrics.add_rows("issues.delete", rows_in=received)
+        return 0
+
+    batch_size = 100
+    total = 0
+
+    for i in range(0, len(urls), batch_size):
+        batch = urls[i:i + batch_size]
+        try:
+            result = supabase.table("issues").delete().in_("url", batch).execute()
+            total += len(result.data) if result.data else 0
+        except Exception as e:
+            print(f"  Delete error: {e}")
+            write_failures["delete"] += len(batch)
+
+    metrics.add_rows("issues.delete", rows_in=received, rows_out=total)
+    return total
@@ -0,0 +1,91 @@
+"""
+Good-first 계열 라벨 판정
+- 판정에 필요한 구문/토큰을 미리 컴파일한 정규식 하나로 한 번에 추출
+- 같은 라벨 문자열이 수백만 번 반복되므로 원본 라벨 기준 LRU 캐시
+- 같은 규칙 테이블로 BigQuery temp UDF를 생성 (쿼리 단계 사전 필터, 최종 판정은 Python)
+(DB/BigQuery 클라이언트 의존 없음 - 벤치마크에서 직접 import)
+"""
+
+import re
+from functools import lru_cache
+
+LABEL_CACHE_SIZE = 65536
+
+# 판정 규칙 (정규화된 라벨 기준) - Python 판정과 BigQuery UDF가 함께 사용
+# 구문은 부분 문자열 일치 (예: "good first issues"도 포함), 토큰은 토큰 단위 일치.
+PHRASES = ("good first issue", "goodfirstissue", "first timers only", "up for grabs", "low hanging fruit")
+TOKENS = ("beginner", "newcomer", "newcomers", "starter", "starters", "easy")
+# (토큰, 함께 있어야 하는 토큰들): beginners + only, first + issue/contributor(s)
+TOKEN_PAIRS = (
+    ("beginners", ("only",)),
+    ("first", ("issue", "contributor", "contributors")),
+)
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+# 정규화된 라벨(소문자 영숫자 토큰 + 공백 1개 구분)에서 판정에 필요한 신호만 한 번에 추출.
+# 토큰은 영숫자, 구분자는 공백뿐이라 \b가 토큰 경계와 정확히 일치한다.
+_SIGNAL_TOKENS = TOKENS + tuple(token for first, partners in TOKEN_PAIRS for token in (first, *partners))
+_SIGNALS = re.compile(
+    "|".join(re.escape(phrase) for phrase in PHRASES)
+    + r"|\b(?:" + "|".join(_SIGNAL_TOKENS) + r")\b"
+)
+
+# 하나만 있어도 good-first로 판정하는 신호
+_DECISIVE = frozenset(PHRASES + TOKENS)
+
+
+def normalize_label(label: str) -> str:
+    """라벨명을 비교 가능한 canonical key로 정규화."""
+    return _NON_ALNUM.sub(" ", (label or "").lower()).strip()
+
+
+@lru_cache(maxsize=LABEL_CACHE_SIZE)
+def is_good_first_label(label: str) -> bool:
+    """라벨명이 good-first 계열인지 판정."""
+    signals = set(_SIGNALS.findall(normalize_label(label)))
+    if not signals:
+        return False
+    if not signals.isdisjoint(_DECISIVE):
+        return True
+    return any(first in signals and not signals.isdisjoint(partners) for first, partners in TOKEN_PAIRS)
+
+
+def _sql_words(tokens) -> str:
+    return r"\b(" + "|".join(tokens) + r")\b"
+
+
+def bigquery_label_udfs() -> str:
+    """
+    같은 규칙의 BigQuery temp UDF 정의 (쿼리 맨 앞에 붙여 사용)
+    - is_good_first_label(label STRING) -> BOOL
+    - has_good_first_label(labels_json STRING) -> BOOL: 라벨 JSON 배열 중 하나라도 good-first
+    """
+    conditions = [
+        f"REGEXP_CONTAINS(n, r'{'|'.join(PHRASES)}')",
+        f"REGEXP_CONTAINS(n, r'{_sql_words(TOKENS)}')",
+    ] + [
+        f"(REGEXP_CONTAINS(n, r'{_sql_words([first])}') AND REGEXP_CONTAINS(n, r'{_sql_words(partners)}'))"
+        for first, partners in TOKEN_PAIRS
+    ]
+    match = "\n            OR ".join(conditions)
+
+    return f"""
+    CREATE TEMP FUNCTION gfi_normalize(label STRING) AS (
+        TRIM(REGEXP_REPLACE(LOWER(IFNULL(label, '')), r'[^a-z0-9]+', ' '))
+    );
+    CREATE TEMP FUNCTION gfi_match(n STRING) AS (
+        n != '' AND (
+            {match}
+        )
+    );
+    CREATE TEMP FUNCTION is_good_first_label(label STRING) AS (
+        gfi_match(gfi_normalize(label))
+    );
+    CREATE TEMP FUNCTION has_good_first_label(labels_json STRING) AS (
+        EXISTS(
+            SELECT 1 FROM UNNEST(JSON_EXTRACT_ARRAY(labels_json)) AS l
+            WHERE is_good_first_label(JSON_EXTRACT_SCALAR(l, '$.name'))
+        )
+    );
+    """
@@ -0,0 +1,166 @@
+"""
+저장된 이슈 URL 멤버십 필터 (Bloom filter, etl/.cache에 저장)
+- closed/unlabeled 이벤트는 GitHub 전체 이슈 대상 → 대부분 우리 DB에 없는 URL
+- 삭제 전에 필터로 걸러서 실제로 저장된(것일 수 있는) URL만 DELETE 요청
+- false positive는 no-op DELETE 한 번
+- 증분 refresh: id > (마지막 id - MEMBERSHIP_ID_MARGIN) 행을 추가 (BIGSERIAL은 커밋 순서대로 보이지 않으므로
+  동시에 쓰던 다른 실행의 늦게 커밋된 낮은 id도 다시 훑음). 같은 프로세스에서 쓴 URL(github_id 충돌로 URL을 바꾼 행 포함)은 바로 추가
+- false negative가 생길 수 있는 경우: 다른 프로세스(fetch_issues_github)가 기존 행의 url만 바꾼 경우(id 그대로),
+  margin보다 오래 늦게 커밋된 행 → 다음 전체 재구성까지 그 URL의 삭제가 걸러짐 (reconcile 워크플로가 닫힌 이슈를 따로 정리)
+- 오래되면(기본 24시간) 또는 용량을 넘으면 전체 재구성 (위 누락과 삭제된 URL 정리)
+"""
+
+import hashlib
+import json
+import math
+import os
+import time
+
+MEMBERSHIP_PAGE_SIZE = 1000
+MEMBERSHIP_FALSE_POSITIVE_RATE = 0.001
+MIN_CAPACITY = 100_000
+MEMBERSHIP_ID_MARGIN = 5000  # 증분 refresh 때 마지막 id 아래로 다시 훑을 범위
+
+
+class BloomFilter:
+    """bytearray 비트 배열 + blake2b double hashing"""
+
+    def __init__(self, capacity: int, fp_rate: float = MEMBERSHIP_FALSE_POSITIVE_RATE,
+                 bits: bytearray | None = None, num_hashes: int | None = None):
+        self.capacity = capacity
+        if bits is None:
+            size = math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2))
+            bits = bytearray((size + 7) // 8)
+        self.bits = bits
+        self.num_bits = len(bits) * 8
+        self.num_hashes = num_hashes or max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str) -> None:
+        """이미 있는 키는 count에 넣지 않음 (margin 재스캔으로 같은 URL을 여러 번 추가하므로)"""
+        added = False
+        for pos in self._positions(key):
+            if not self.bits[pos >> 3] & (1 << (pos & 7)):
+                self.bits[pos >> 3] |= 1 << (pos & 7)
+                added = True
+        if added:
+            self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class IssueMembership:
+    """issues.url 멤버십. refresh 전에는 필터링하지 않음 (모든 URL 통과)"""
+
+    def __init__(self, path: str, max_age_hours: float = 24):
+        self.path = path
+        self.max_age_seconds = max_age_hours * 3600
+        self.bloom: BloomFilter | None = None
+        self.built_at = 0.0
+        self.max_id = 0
+        self.checked = 0
+        self.skipped = 0
+
+    def refresh(self, client) -> None:
+        """파일에서 불러와 새로 들어온 행(id > max_id - margin)만 추가. 없거나 오래됐으면 전체 재구성"""
+        try:
+            if not self._load() or time.time() - self.built_at > self.max_age_seconds:
+                self._rebuild(client)
+                return
+            added = self._add_rows_after(client, max(self.max_id - MEMBERSHIP_ID_MARGIN, 0))
+            if self.bloom.count > self.bloom.capacity:
+                self._rebuild(client)
+                return
+            print(f"  Membership filter: {self.bloom.count} urls ({added} rows scanned since last run)")
+        except Exception as e:
+            # 필터 없이도 동작은 같음 (모든 delete 전송)
+            print(f"  Membership filter unavailable, deleting without filter: {e}")
+            self.bloom = None
+
+    def _rebuild(self, client) -> None:
+        started = time.monotonic()
+        total = client.table("issues").select("id", count="exact").limit(1).execute().count or 0
+        self.bloom = BloomFilter(max(total * 2, MIN_CAPACITY))
+        self.built_at = time.time()
+        self.max_id = 0
+        self._add_rows_after(client, 0)
+        print(f"  Membership filter rebuilt: {self.bloom.count} urls in {time.monotonic() - started:.1f}s")
+
+    def _add_rows_after(self, client, after_id: int) -> int:
+        """id keyset으로 after_id 이후 행의 URL 추가"""
+        added = 0
+        while True:
+            result = client.table("issues") \
+                .select("id, url") \
+                .gt("id", after_id) \
+                .order("id") \
+                .limit(MEMBERSHIP_PAGE_SIZE) \
+                .execute()
+            rows = result.data or []
+            for row in rows:
+                self.bloom.add(row["url"])
+            added += len(rows)
+            if rows:
+                after_id = rows[-1]["id"]
+                self.max_id = max(self.max_id, after_id)
+            if len(rows) < MEMBERSHIP_PAGE_SIZE:
+                return added
+
+    def add(self, urls: list[str]) -> None:
+        """ETL이 방금 쓴 URL (같은 실행 안의 이후 삭제가 걸러지지 않도록, github_id 경로로 바뀐 URL 포함)"""
+        if self.bloom is None:
+            return
+        for url in urls:
+            self.bloom.add(url)
+
+    def filter(self, urls: list[str]) -> list[str]:
+        """저장돼 있을 수 있는 URL만 남김"""
+        if self.bloom is None:
+            return urls
+        kept = [url for url in urls if url in self.bloom]
+        self.checked += len(urls)
+        self.skipped += len(urls) - len(kept)
+        return kept
+
+    def summary(self) -> str:
+        if self.bloom is None:
+            return "membership filter off"
+        ratio = self.skipped / self.checked * 100 if self.checked else 0
+        return f"membership filter skipped {self.skipped}/{self.checked} delete candidates ({ratio:.1f}%)"
+
+    def _load(self) -> bool:
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, "rb") as f:
+            header = json.loads(f.readline())
+            bits = bytearray(f.read())
+        self.bloom = BloomFilter(header["capacity"], bits=bits, num_hashes=header["num_hashes"])
+        self.bloom.count = header["count"]
+        self.built_at = header["built_at"]
+        self.max_id = header["max_id"]
+        return True
+
+    def save(self) -> None:
+        if self.bloom is None:
+            return
+        header = {
+            "capacity": self.bloom.capacity,
+            "num_hashes": self.bloom.num_hashes,
+            "count": self.bloom.count,
+            "built_at": self.built_at,
+            "max_id": self.max_id,
+        }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps(header).encode() + b"\n")
+            f.write(self.bloom.bits)
+        os.replace(tmp_path, self.path)  # 중간에 죽어도 파일이 깨지지 않도록
@@ -0,0 +1,292 @@
+"""
+ETL 실행 계측 (진입점 main마다 JSON 요약 1줄)
+- 서비스 호출: Supabase(PostgREST)/GitHub 요청별 지연 히스토그램, 상태 코드, 바이트
+- BigQuery job: 스캔/과금 바이트, slot-ms, 캐시 적중, job 시간, dry run 수
+- rate limit/pacing 대기 시간, 재시도 횟수, 단계별 읽은/쓴 행 수
+- 실행이 끝나면 "ETL_METRICS {...}" 한 줄 출력 (ETL_METRICS_PATH가 있으면 같은 JSON을 JSONL로 추가)
+
+사용법:
+    supabase = instrument_supabase(create_client(...))
+
+    @record_run("fetch_issues")
+    def main(): ...
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+METRICS_PATH = os.environ.get("ETL_METRICS_PATH", "")
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class Histogram:
+    """고정 버킷 지연 히스토그램 (ms). 백분위는 해당 버킷의 상한으로 근사"""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, ms: float) -> None:
+        index = len(LATENCY_BUCKETS_MS)
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if ms <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, p: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = p * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return float(LATENCY_BUCKETS_MS[i]) if i < len(LATENCY_BUCKETS_MS) else self.max
+        return self.max
+
+    def to_dict(self) -> dict:
+        bounds = [str(b) for b in LATENCY_BUCKETS_MS] + ["+Inf"]
+        return {
+            "count": self.count,
+            "sum_ms": round(self.total, 1),
+            "max_ms": round(self.max, 1),
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "buckets": {bound: n for bound, n in zip(bounds, self.counts) if n},
+        }
+
+
+class CallStats:
+    """(서비스, 작업) 하나의 호출 통계"""
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.statuses: dict[str, int] = {}
+        self.errors = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def to_dict(self) -> dict:
+        return {
+            **self.latency.to_dict(),
+            "errors": self.errors,
+            "statuses": self.statuses,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+        }
+
+
+class RunMetrics:
+    """실행 하나의 계측값 (여러 워커 스레드에서 동시에 기록)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.run = None
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started_at = datetime.now(timezone.utc)
+            self._started = time.monotonic()
+            self.calls: dict[tuple[str, str], CallStats] = {}
+            self.counters: dict[str, int] = {}
+            self.waits: dict[str, float] = {}
+            self.rows: dict[str, dict[str, int]] = {}
+            self.bigquery_jobs: list[dict] = []
+            self.dry_runs = 0
+
+    def observe_call(self, service: str, operation: str, seconds: float, status: int | None = None,
+                     bytes_sent: int = 0, bytes_received: int = 0) -> None:
+        """status None = 응답을 받지 못함 (연결 오류/타임아웃)"""
+        with self._lock:
+            stats = self.calls.setdefault((service, operation), CallStats())
+            stats.latency.observe(seconds * 1000)
+            key = str(status) if status is not None else "exception"
+            stats.statuses[key] = stats.statuses.get(key, 0) + 1
+            if status is None or status >= 400:
+                stats.errors += 1
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def add_wait(self, name: str, seconds: float) -> None:
+        if seconds <= 0:
+            return
+        with self._lock:
+            self.waits[name] = self.waits.get(name, 0.0) + seconds
+
+    def add_rows(self, name: str, rows_in: int = 0, rows_out: int = 0) -> None:
+        with self._lock:
+            rows = self.rows.setdefault(name, {"in": 0, "out": 0})
+            rows["in"] += rows_in
+            rows["out"] += rows_out
+
+    def record_bigquery_job(self, job, project: str, rows: int | None = None) -> None:
+        """완료된 query job 기록 (실패/취소된 job도 스캔했으면 과금되므로 호출자가 result() 이후 호출)"""
+        started, ended = getattr(job, "started", None), getattr(job, "ended", None)
+        entry = {
+            "job_id": getattr(job, "job_id", None),
+            "project": project,
+            "bytes_processed": getattr(job, "total_bytes_processed", None) or 0,
+            "bytes_billed": getattr(job, "total_bytes_billed", None) or 0,
+            "slot_ms": getattr(job, "slot_millis", None) or 0,
+            "cache_hit": bool(getattr(job, "cache_hit", False)),
+            "seconds": round((ended - started).total_seconds(), 3) if started and ended else None,
+            "rows": rows,
+        }
+        with self._lock:
+            self.bigquery_jobs.append(entry)
+
+    def record_dry_run(self) -> None:
+        with self._lock:
+            self.dry_runs += 1
+
+    def summary(self, status: str = "ok") -> dict:
+        with self._lock:
+            services: dict[str, dict] = {}
+            for (service, operation), stats in sorted(self.calls.items()):
+                services.setdefault(service, {})[operation] = stats.to_dict()
+            service_seconds = {
+                service: round(sum(op["sum_ms"] for op in ops.values()) / 1000, 3)
+                for service, ops in services.items()
+            }
+            jobs = list(self.bigquery_jobs)
+            job_seconds = sum(job["seconds"] or 0 for job in jobs)
+            if jobs:
+                service_seconds["bigquery"] = round(job_seconds, 3)
+
+            return {
+                "run": self.run,
+                "status": status,
+                "started_at": self.started_at.isoformat(),
+                "wall_seconds": round(time.monotonic() - self._started, 3),
+                # 스레드가 겹쳐 호출하므로 합이 wall time보다 클 수 있음
+                "service_seconds": service_seconds,
+                "calls": services,
+                "bigquery": {
+                    "jobs": len(jobs),
+                    "dry_runs": self.dry_runs,
+                    "bytes_processed": sum(job["bytes_processed"] for job in jobs),
+                    "bytes_billed": sum(job["bytes_billed"] for job in jobs),
+                    "slot_ms": sum(job["slot_ms"] for job in jobs),
+                    "cache_hits": sum(job["cache_hit"] for job in jobs),
+                    "job_list": jobs,
+                },
+                "waits_seconds": {name: round(seconds, 3) for name, seconds in sorted(self.waits.items())},
+                "counters": dict(sorted(self.counters.items())),
+                "rows": dict(sorted(self.rows.items())),
+            }
+
+    def emit(self, status: str = "ok") -> dict:
+        summary = self.summary(status)
+        line = json.dumps(summary, separators=(",", ":"), default=str)
+        print(f"ETL_METRICS {line}")
+        if METRICS_PATH:
+            try:
+                with open(METRICS_PATH, "a") as f:
+                    f.write(line + "\n")
+            except OSError as e:
+                print(f"Error writing metrics to {METRICS_PATH}: {e}")
+        return summary
+
+
+metrics = RunMetrics()
+
+
+def record_run(name: str):
+    """
+    main을 감싸 실행 단위로 계측을 초기화하고 끝날 때(예외 포함) 요약 출력.
+    다른 run 안에서 호출되면 (pipeline, bench 등) 바깥 run에 합산만 함
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if metrics.run is not None:
+                return fn(*args, **kwargs)
+
+            metrics.reset()
+            metrics.run = name
+            status = "ok"
+            try:
+                return fn(*args, **kwargs)
+            except BaseException as e:
+                status = f"error: {type(e).__name__}"
+                raise
+            finally:
+                metrics.emit(status)
+                metrics.run = None
+        return wrapper
+    return decorator
+
+
+# ----- Supabase (postgrest httpx 세션 event hook) -----
+
+POSTGREST_VERBS = {"GET": "select", "HEAD": "count", "POST": "insert", "PATCH": "update", "DELETE": "delete"}
+
+
+def postgrest_operation(request) -> str:
+    """/rest/v1/issues + POST(merge-duplicates) → "upsert issues", /rest/v1/rpc/x → "rpc x" """
+    path = urlsplit(str(request.url)).path
+    resource = path.split("/rest/v1/", 1)[-1].strip("/")
+    if resource.startswith("rpc/"):
+        return f"rpc {resource[4:]}"
+    verb = POSTGREST_VERBS.get(request.method, request.method.lower())
+    if verb == "insert" and "resolution=" in request.headers.get("prefer", ""):
+        verb = "upsert"
+    return f"{verb} {resource}"
+
+
+def _on_supabase_response(response) -> None:
+    # hook 시점에는 body를 아직 읽지 않음 → 읽어야 전체 응답 시간/크기가 확정 (postgrest도 어차피 읽음)
+    response.read()
+    request = response.request
+    metrics.observe_call(
+        "supabase", postgrest_operation(request), response.elapsed.total_seconds(), response.status_code,
+        bytes_sent=len(request.content or b""), bytes_received=len(response.content),
+    )
+
+
+def instrument_supabase(client):
+    """create_client 결과의 PostgREST 세션에 응답 hook 등록 (테이블/RPC 호출 전부 계측). client를 그대로 반환"""
+    hooks = client.postgrest.session.event_hooks["response"]
+    if _on_supabase_response not in hooks:
+        hooks.append(_on_supabase_response)
+    return client
+
+
+# ----- GitHub (requests 세션 hook) -----
+
+def github_operation(url: str) -> str:
+    """/search/issues → "search", /repos/o/r → "repos", /graphql → "graphql" """
+    parts = urlsplit(url).path.strip("/").split("/")
+    return parts[0] or "root"
+
+
+def _on_github_response(resp, *args, **kwargs) -> None:
+    body = resp.request.body or b""
+    metrics.observe_call(
+        "github", github_operation(resp.url), resp.elapsed.total_seconds(), resp.status_code,
+        bytes_sent=len(body), bytes_received=len(resp.content),
+    )
+
+
+def instrument_github_session(session):
+    """github_api.session에 응답 hook 등록 (요청 시작 ~ 헤더 수신 시간)"""
+    hooks = session.hooks["response"]
+    if _on_github_response not in hooks:
+        hooks.append(_on_github_response)
+    return session
@@ -0,0 +1,310 @@
+"""
+파이프라인 ETL 러너 (fetch_issues.py + 새 레포 enrich를 한 프로세스에서 겹쳐 실행)
+fetch(BigQuery 결과 페이지) → classify(분류 + URL별 fold) → write(upsert/delete) → enrich(새 레포 메타데이터)
+- 단계 사이는 bounded queue: 뒤 단계가 느리면 앞 단계가 기다리므로 메모리가 늘지 않음
+- 단계마다 스레드 하나, 네트워크 대기가 서로 겹치므로 전체 시간 ≈ 가장 느린 단계
+- 보존 기간 정리(cleanup)는 시작과 동시에 별도 스레드로
+- 단계별 처리량/대기 시간, 큐 깊이(평균/최대)를 주기적으로, 그리고 마지막에 출력
+
+사용법: python pipeline.py
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import fetch_issues
+import issue_sync
+from checkpoint import WatermarkTracker
+from metrics import record_run
+
+ROW_BATCH_SIZE = 500  # fetch → classify 전달 단위 (행)
+EVENT_BATCH_SIZE = 500  # classify → write 전달 단위 (이벤트)
+QUEUE_SIZE = 8  # 단계 사이 큐에 쌓을 수 있는 배치 수
+REPORT_INTERVAL_SECONDS = 10
+SAMPLE_INTERVAL_SECONDS = 0.5
+
+_DONE = object()
+
+
+class PipelineStopped(Exception):
+    """다른 단계가 실패해 파이프라인이 중단됨"""
+
+
+class Channel:
+    """단계 사이 bounded queue (깊이 샘플링, 대기 시간 측정, 중단 신호 지원)"""
+
+    def __init__(self, name: str, stop: threading.Event, maxsize: int = QUEUE_SIZE):
+        self.name = name
+        self.stop = stop
+        self.queue = queue.Queue(maxsize)
+        self.put_wait = 0.0  # 생산자가 큐가 가득 차서 기다린 시간
+        self.get_wait = 0.0  # 소비자가 큐가 비어서 기다린 시간
+        self.samples = 0
+        self.depth_sum = 0
+        self.depth_max = 0
+
+    def put(self, item) -> None:
+        start = time.monotonic()
+        while not self.stop.is_set():
+            try:
+                self.queue.put(item, timeout=SAMPLE_INTERVAL_SECONDS)
+                self.put_wait += time.monotonic() - start
+                return
+            except queue.Full:
+                continue
+        raise PipelineStopped()
+
+    def close(self) -> None:
+        self.put(_DONE)
+
+    def __iter__(self):
+        while True:
+            start = time.monotonic()
+            while True:
+                try:
+                    item = self.queue.get(timeout=SAMPLE_INTERVAL_SECONDS)
+                    break
+                except queue.Empty:
+                    if self.stop.is_set():
+                        raise PipelineStopped()
+            self.get_wait += time.monotonic() - start
+            if item is _DONE:
+                return
+            yield item
+
+    def sample(self) -> None:
+        depth = self.queue.qsize()
+        self.samples += 1
+        self.depth_sum += depth
+        self.depth_max = max(self.depth_max, depth)
+
+    def describe(self) -> str:
+        avg = self.depth_sum / self.samples if self.samples else 0
+        return f"{self.name}: depth {self.queue.qsize()}/{self.queue.maxsize} (avg {avg:.1f}, max {self.depth_max})"
+
+
+class Stage:
+    """
+    단계 스레드 + 처리량 집계. 실패하면 stop을 걸어 다른 단계도 멈춘다
+    completed: 입력 끝까지 처리하고 정상 종료했는지 (실패/중단된 단계는 False)
+    """
+
+    def __init__(self, name: str, unit: str, fn, stop: threading.Event,
+                 inbox: Channel | None = None, outbox: Channel | None = None):
+        self.name = name
+        self.unit = unit
+        self.fn = fn
+        self.stop = stop
+        self.inbox = inbox
+        self.outbox = outbox
+        self.items = 0
+        self.started = 0.0
+        self.finished = 0.0
+        self.error: Exception | None = None
+        self.completed = False
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def _run(self):
+        self.started = time.monotonic()
+        try:
+            self.fn(self)
+            if self.outbox:
+                self.outbox.close()
+            self.completed = True
+        except PipelineStopped:
+            print(f"[{self.name}] stopped")
+        except Exception as e:
+            print(f"[{self.name}] failed: {e}")
+            self.error = e
+            self.stop.set()
+        finally:
+            self.finished = time.monotonic()
+
+    def start(self):
+        self.thread.start()
+
+    @property
+    def elapsed(self) -> float:
+        end = self.finished or time.monotonic()
+        return end - self.started if self.started else 0.0
+
+    @property
+    def busy(self) -> float:
+        """입력 대기/출력 대기를 뺀 실제 작업 시간"""
+        waited = (self.inbox.get_wait if self.inbox else 0) + (self.outbox.put_wait if self.outbox else 0)
+        return max(self.elapsed - waited, 0.0)
+
+    def describe(self) -> str:
+        rate = self.items / self.elapsed if self.elapsed else 0
+        return (f"{self.name}: {self.items} {self.unit} in {self.elapsed:.1f}s "
+                f"({rate:.0f} {self.unit}/s, busy {self.busy:.1f}s)")
+
+
+def batched(items, size: int):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def run_pipeline(cutoff: datetime, end: datetime) -> dict:
+    stop = threading.Event()
+    rows_q = Channel("rows", stop)
+    events_q = Channel("events", stop)
+    repos_q = Channel("new_repos", stop, maxsize=QUEUE_SIZE * 4)
+    channels = [rows_q, events_q, repos_q]
+    tracker = WatermarkTracker()
+    result = {}
+
+    def fetch(stage: Stage):
+        for batch in batched(fetch_issues.fetch_issue_event_rows(cutoff, end), ROW_BATCH_SIZE):
+            stage.items += len(batch)
+            rows_q.put(batch)
+
+    def classify(stage: Stage):
+        def rows():
+            for batch in rows_q:
+                yield from batch
+
+        for batch in batched(issue_sync.classify_rows(rows(), tracker), EVENT_BATCH_SIZE):
+            stage.items += len(batch)
+            events_q.put(batch)
+
+    def write(stage: Stage):
+        def events():
+            for batch in events_q:
+                stage.items += len(batch)
+                yield from batch
+
+        result["saved"], result["closed"], result["unlabeled"] = issue_sync.sync_issue_events(
+            events(), on_new_repos=repos_q.put
+        )
+
+    def enrich(stage: Stage):
+        # 보강 실패는 동기화 결과에 영향 없음 → 예외로 다른 단계를 멈추지 않고 나머지는 흘려보냄
+        # (enrich_repos는 import 시 캐시를 열고 GitHub 설정을 읽으므로 이 단계에서만 로드)
+        try:
+            import enrich_repos
+            enabled = bool(enrich_repos.GITHUB_TOKEN)
+            if not enabled:
+                print("[enrich] GITHUB_TOKEN not set, skipping new repo enrichment")
+        except Exception as e:
+            print(f"[enrich] disabled: {e}")
+            enabled = False
+
+        if not enabled:
+            for _ in repos_q:
+                pass
+            return
+
+        enriched = 0
+        try:
+            with ThreadPoolExecutor(max_workers=enrich_repos.ENRICH_WORKERS) as pool:
+                for repos in repos_q:
+                    stage.items += len(repos)
+                    try:
+                        rows = []
+                        for repo, metadata in enrich_repos.iter_repo_metadata(pool, repos):
+                            row = enrich_repos.enrichment_row(repo, metadata)
+                            if row:
+                                rows.append(row)
+                        enriched += enrich_repos.bulk_update_repo_metadata(rows)
+                    except Exception as e:
+                        print(f"[enrich] failed for {len(repos)} repos: {e}")
+                    enrich_repos.cache.flush()
+        finally:
+            # PipelineStopped로 빠져나가도 받아 둔 캐시 항목은 저장
+            enrich_repos.cache.close()
+        result["enriched"] = enriched
+
+    def cleanup(stage: Stage):
+        # 정리 실패도 동기화 결과와 무관 → 다른 단계를 멈추지 않음
+        try:
+            stage.items += fetch_issues.cleanup_old_issues()
+        except Exception as e:
+            print(f"[cleanup] failed: {e}")
+
+    stages = [
+        Stage("fetch", "rows", fetch, stop, outbox=rows_q),
+        Stage("classify", "events", classify, stop, inbox=rows_q, outbox=events_q),
+        Stage("write", "events", write, stop, inbox=events_q, outbox=repos_q),
+        Stage("enrich", "repos", enrich, stop, inbox=repos_q),
+        Stage("cleanup", "rows", cleanup, stop),
+    ]
+
+    started = time.monotonic()
+    for stage in stages:
+        stage.start()
+
+    last_report = started
+    while any(stage.thread.is_alive() for stage in stages):
+        time.sleep(SAMPLE_INTERVAL_SECONDS)
+        for channel in channels:
+            channel.sample()
+        if time.monotonic() - last_report >= REPORT_INTERVAL_SECONDS:
+            last_report = time.monotonic()
+            print("  [pipeline] " + " | ".join(f"{s.name} {s.items}" for s in stages)
+                  + " || " + " | ".join(c.describe() for c in channels))
+
+    wall = time.monotonic() - started
+    print("=" * 50)
+    print("Pipeline stages:")
+    for stage in stages:
+        print(f"  {stage.describe()}")
+    print("Queues:")
+    for channel in channels:
+        print(f"  {channel.describe()}")
+    slowest = max(stages, key=lambda s: s.busy)
+    print(f"Wall time {wall:.1f}s, sum of stage busy time {sum(s.busy for s in stages):.1f}s, "
+          f"slowest stage {slowest.name} ({slowest.busy:.1f}s)")
+
+    result["failed"] = [stage.name for stage in stages if stage.error]
+    result["incomplete"] = [stage.name for stage in stages if not stage.completed]
+    result["watermark"] = tracker.value
+    return result
+
+
+@record_run("pipeline")
+def main():
+    print("=" * 50)
+    print(f"GoodFirst ETL pipeline - {datetime.now(timezone.utc).isoformat()}")
+    print("=" * 50)
+
+    now = datetime.now(timezone.utc)
+    cutoff = fetch_issues.get_sync_cutoff(now)
+    print(f"Syncing from: {cutoff.isoformat()}")
+
+    issue_sync.membership.refresh(issue_sync.supabase)
+    result = run_pipeline(cutoff, now)
+    issue_sync.membership.save()
+
+    print(f"✓ Upserted {result.get('saved', 0)} issues ({issue_sync.change_stats.summary()})")
+    print(f"✓ Deleted {result.get('closed', 0)} closed issues ({issue_sync.membership.summary()})")
+    print(f"✓ Deleted {result.get('unlabeled', 0)} unlabeled issues")
+    print(f"✓ Enriched {result.get('enriched', 0)} new repos")
+
+    # fetch/classify/write가 모두 입력 끝까지 처리했을 때만 watermark 전진 (enrich/cleanup 실패는 무관)
+    # 다른 단계 실패로 중단된 단계도 미완료: tracker는 classify가 읽은 만큼 이미 전진했지만 write는 못 했을 수 있음
+    if set(result["incomplete"]) & {"fetch", "classify", "write"}:
+        print(f"Pipeline failed in {result['failed']} (incomplete: {result['incomplete']}), watermark not advanced")
+        raise SystemExit(1)
+    if any(issue_sync.write_failures.values()):
+        print(f"Write failures {issue_sync.write_failures}, watermark not advanced")
+    elif result["watermark"]:
+        fetch_issues.checkpoint_store.set(fetch_issues.CHECKPOINT_SOURCE, result["watermark"])
+        print(f"✓ Watermark advanced to {result['watermark'].isoformat()}")
+
+    print(f"BigQuery usage (rolling 30d): {fetch_issues.budgeter.summary()}")
+    print("=" * 50)
+    print("ETL complete!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+GH Archive 테이블 선택 플래너
+[start, end) 범위를 스캔 바이트가 가장 적은 month/day/hour 테이블 조합으로 분할
+- 달 전체가 포함되면 month 테이블 1개
+- 하루 전체가 포함되면 day 테이블
+- 하루 일부만 포함되면 그 날의 hour 테이블들 (wildcard + _TABLE_SUFFIX로 해당 시간만 스캔)
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+
+@dataclass
+class TableSegment:
+    kind: str  # 'month' | 'day' | 'hour'
+    table: str  # FROM 절에 들어갈 테이블 (hour는 wildcard)
+    suffix_range: tuple[str, str] | None = None  # hour wildcard의 _TABLE_SUFFIX 범위
+
+    @property
+    def suffix_filter(self) -> str:
+        if not self.suffix_range:
+            return ""
+        return f" AND _TABLE_SUFFIX BETWEEN '{self.suffix_range[0]}' AND '{self.suffix_range[1]}'"
+
+    def __str__(self) -> str:
+        if self.suffix_range:
+            return f"{self.table}[{self.suffix_range[0]}-{self.suffix_range[1]}]"
+        return self.table
+
+
+def _month_bounds(day: datetime) -> tuple[datetime, datetime]:
+    first = day.replace(day=1)
+    next_month = (first + timedelta(days=32)).replace(day=1)
+    return first, next_month
+
+
+def plan_tables(start: datetime, end: datetime) -> list[TableSegment]:
+    """[start, end)를 덮는 가장 저렴한 테이블 조합"""
+    start = start.astimezone(timezone.utc)
+    end = end.astimezone(timezone.utc)
+    segments = []
+
+    day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    while day < end:
+        month_start, month_end = _month_bounds(day)
+        if day == month_start and start <= month_start and month_end <= end:
+            segments.append(TableSegment("month", f"githubarchive.month.{day.strftime('%Y%m')}"))
+            day = month_end
+            continue
+
+        next_day = day + timedelta(days=1)
+        if start <= day and next_day <= end:
+            segments.append(TableSegment("day", f"githubarchive.day.{day.strftime('%Y%m%d')}"))
+        else:
+            # 하루 일부 → 포함되는 시간대의 hour 테이블만
+            first_hour = max(start, day).hour
+            last_moment = min(end, next_day) - timedelta(microseconds=1)
+            segments.append(TableSegment(
+                "hour",
+                f"githubarchive.hour.{day.strftime('%Y%m%d')}*",
+                (f"{first_hour:02d}", f"{last_moment.hour:02d}")
+            ))
+        day = next_day
+
+    return segments
+
+
+def describe_plan(segments: list[TableSegment]) -> str:
+    counts = {}
+    for segment in segments:
+        counts[segment.kind] = counts.get(segment.kind, 0) + 1
+    parts = ", ".join(f"{count} {kind}" for kind, count in counts.items())
+    return f"{parts}: {segments[0]} ~ {segments[-1]}" if segments else "no tables"
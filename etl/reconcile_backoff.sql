@@ -0,0 +1,53 @@
+-- ============================================
+-- 닫힌 이슈 정합성 확인 backoff (fetch_issues_github.mark_closed_issues)
+-- Run this in Supabase SQL Editor (repos_dimension.sql, reconcile_open_issues.sql 이후)
+-- ============================================
+
+-- GraphQL이 NOT_FOUND 외의 오류(FORBIDDEN: SAML/IP 제한 org 등)를 돌려주는 레포는
+-- 매 실행 다시 조회해도 같은 결과 → 실패 횟수에 따라 다음 확인 시각을 미룸
+ALTER TABLE repos ADD COLUMN IF NOT EXISTS reconcile_failures INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE repos ADD COLUMN IF NOT EXISTS reconcile_retry_at TIMESTAMPTZ;
+
+-- 실행 시작 시 backoff 중인 레포만 조회 (대부분 0이라 작은 partial index)
+CREATE INDEX IF NOT EXISTS idx_repos_reconcile_backoff
+ON repos(repo_full_name) WHERE reconcile_failures > 0;
+
+-- blocked: 이번에 실패한 레포 → 실패 횟수 + 1, base_hours * 2^(이전 실패 횟수) 뒤 (최대 max_hours) 재시도
+-- recovered: backoff 후 다시 확인에 성공한 레포 → 초기화
+CREATE OR REPLACE FUNCTION public.record_reconcile_results(
+    blocked text[],
+    recovered text[],
+    base_hours integer,
+    max_hours integer
+)
+RETURNS integer
+LANGUAGE plpgsql
+SET search_path = public
+AS $func$
+DECLARE
+    updated integer;
+BEGIN
+    UPDATE repos
+    SET reconcile_failures = reconcile_failures + 1,
+        reconcile_retry_at = NOW() + make_interval(
+            hours => LEAST(base_hours * POWER(2, LEAST(reconcile_failures, 16))::integer, max_hours)
+        )
+    WHERE repo_full_name = ANY(blocked);
+    GET DIAGNOSTICS updated = ROW_COUNT;
+
+    UPDATE repos
+    SET reconcile_failures = 0,
+        reconcile_retry_at = NULL
+    WHERE repo_full_name = ANY(recovered)
+      AND reconcile_failures > 0;
+
+    RETURN updated;
+END;
+$func$;
+
+-- ETL(service_role)에서만 호출
+REVOKE EXECUTE ON FUNCTION public.record_reconcile_results(text[], text[], integer, integer)
+    FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.record_reconcile_results(text[], text[], integer, integer) TO service_role;
+
+NOTIFY pgrst, 'reload schema';
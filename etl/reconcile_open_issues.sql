@@ -0,0 +1,16 @@
+-- ============================================
+-- 닫힌 이슈 정합성 확인 (fetch_issues_github.mark_closed_issues)
+-- Run this in Supabase SQL Editor
+-- ============================================
+
+-- keyset pagination 대상에서 빠지지 않도록 updated_at이 없는 행 채우기
+UPDATE issues
+SET updated_at = COALESCE(fetched_at, created_at, NOW())
+WHERE updated_at IS NULL;
+
+-- is_open 이슈를 (updated_at, id) 순으로 순회
+CREATE INDEX IF NOT EXISTS idx_issues_open_updated_id
+ON issues(updated_at, id)
+WHERE is_open = TRUE;
+
+NOTIFY pgrst, 'reload schema';
@@ -5,15 +5,17 @@ Refresh Materialized Views in Supabase
 import os
 from dotenv import load_dotenv
 from supabase import create_client
+from metrics import instrument_supabase, record_run
 
 load_dotenv()
 
-supabase = create_client(
+supabase = instrument_supabase(create_client(
     os.environ["SUPABASE_URL"],
     os.environ["SUPABASE_KEY"]
-)
+))
 
 
+@record_run("refresh_stats")
 def main():
     print("Refreshing materialized views...")
 
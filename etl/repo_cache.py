@@ -0,0 +1,142 @@
+"""
+레포 메타데이터 로컬 캐시 (SQLite)
+- repo_full_name 단위 TTL + LRU eviction
+- ETag/Last-Modified 저장 → 만료 후 조건부 요청(If-None-Match)으로 재검증
+- 쓰기 commit_every건마다 commit → 실행이 중간에 끊겨도(중단/타임아웃) 받아 둔 항목은 남음
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class CacheEntry:
+    metadata: dict | None  # None = 삭제된 레포 (404)
+    etag: str | None
+    last_modified: str | None
+    expires_at: float
+
+    @property
+    def is_fresh(self) -> bool:
+        return self.expires_at > time.time()
+
+
+class RepoMetadataCache:
+    """repo_full_name → 메타데이터 캐시. 워커 스레드에서 동시에 사용 가능"""
+
+    def __init__(self, path: str, ttl_seconds: float = 24 * 3600, max_entries: int = 50000,
+                 commit_every: int = 100):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.commit_every = commit_every
+        self._uncommitted = 0
+        self._closed = False
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS repo_metadata (
+                repo_full_name TEXT PRIMARY KEY,
+                metadata TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_repo_metadata_access ON repo_metadata(last_access)")
+        self._conn.commit()
+
+    def get(self, repo_full_name: str) -> CacheEntry | None:
+        """캐시 항목 조회 (만료된 항목도 재검증용으로 반환)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT metadata, etag, last_modified, expires_at FROM repo_metadata WHERE repo_full_name = ?",
+                (repo_full_name,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE repo_metadata SET last_access = ? WHERE repo_full_name = ?",
+                (time.time(), repo_full_name)
+            )
+
+        metadata = json.loads(row[0]) if row[0] is not None else None
+        return CacheEntry(metadata=metadata, etag=row[1], last_modified=row[2], expires_at=row[3])
+
+    def put(self, repo_full_name: str, metadata: dict | None,
+            etag: str | None = None, last_modified: str | None = None) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO repo_metadata
+                    (repo_full_name, metadata, etag, last_modified, expires_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    repo_full_name,
+                    json.dumps(metadata) if metadata is not None else None,
+                    etag,
+                    last_modified,
+                    now + self.ttl_seconds,
+                    now,
+                )
+            )
+            self._written()
+
+    def touch(self, repo_full_name: str) -> None:
+        """304 재검증 성공 → TTL 연장"""
+        now = time.time()
+        with self._lock:
+            self.revalidated += 1
+            self._conn.execute(
+                "UPDATE repo_metadata SET expires_at = ?, last_access = ? WHERE repo_full_name = ?",
+                (now + self.ttl_seconds, now, repo_full_name)
+            )
+            self._written()
+
+    def _written(self) -> None:
+        """put/touch 한 건 기록 (lock 안에서 호출)"""
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self._conn.commit()
+            self._uncommitted = 0
+
+    def flush(self) -> None:
+        """지금까지 쓴 항목 commit (배치 끝마다 호출)"""
+        with self._lock:
+            if not self._closed:
+                self._conn.commit()
+                self._uncommitted = 0
+
+    def close(self) -> None:
+        """max_entries 초과분을 오래 안 쓴 순서로 제거 후 저장. 두 번 호출해도 안전"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            count = self._conn.execute("SELECT COUNT(*) FROM repo_metadata").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    """
+                    DELETE FROM repo_metadata WHERE repo_full_name IN (
+                        SELECT repo_full_name FROM repo_metadata ORDER BY last_access LIMIT ?
+                    )
+                    """,
+                    (overflow,)
+                )
+            self._conn.commit()
+            self._conn.close()
+
+    def summary(self) -> str:
+        return f"Cache: {self.hits} hits, {self.misses} misses, {self.revalidated} revalidated (304)"
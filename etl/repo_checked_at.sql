@@ -0,0 +1,45 @@
+-- ============================================
+-- 레포 보강 여부 마커 (enrich_repos.py, pipeline.py)
+-- Run this in Supabase SQL Editor (repos_dimension.sql 이후)
+-- ============================================
+
+-- stars/language IS NULL 기준은 GitHub에서 language가 없는 레포를 매 실행마다 다시 조회함
+-- → 보강을 시도한 시각을 따로 기록하고 checked_at IS NULL인 레포만 대상으로
+ALTER TABLE repos ADD COLUMN IF NOT EXISTS checked_at TIMESTAMPTZ;
+
+-- 이미 보강된 레포는 확인된 것으로 처리
+UPDATE repos SET checked_at = NOW()
+WHERE checked_at IS NULL AND stars IS NOT NULL;
+
+-- 보강 대상 조회용: 새 레포만 들어 있는 작은 partial index
+DROP INDEX IF EXISTS idx_repos_unenriched;
+CREATE INDEX IF NOT EXISTS idx_repos_unchecked
+ON repos(repo_full_name) WHERE checked_at IS NULL;
+
+-- 보강 RPC: 메타데이터와 함께 checked_at 기록
+-- (삭제된 레포는 stars/language NULL로 들어와도 checked_at이 채워져 재시도하지 않음)
+CREATE OR REPLACE FUNCTION public.bulk_update_repo_metadata(payload jsonb)
+RETURNS integer
+LANGUAGE plpgsql
+SET search_path = public
+AS $func$
+DECLARE
+    updated integer;
+BEGIN
+    UPDATE repos r
+    SET stars = p.stars,
+        language = p.language,
+        checked_at = NOW()
+    FROM jsonb_to_recordset(payload) AS p(repo_full_name text, stars integer, language text)
+    WHERE r.repo_full_name = p.repo_full_name;
+
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
+END;
+$func$;
+
+-- ETL(service_role)에서만 호출
+REVOKE EXECUTE ON FUNCTION public.bulk_update_repo_metadata(jsonb) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.bulk_update_repo_metadata(jsonb) TO service_role;
+
+NOTIFY pgrst, 'reload schema';
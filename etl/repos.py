@@ -0,0 +1,43 @@
+"""
+repos 차원 테이블 관리 (repos_dimension.sql)
+issues.repo_full_name이 repos를 참조하므로 이슈 upsert 전에 레포 행을 먼저 보장
+"""
+
+from batching import AdaptivePacer, write_in_chunks
+
+REPO_UPSERT_CHUNK_SIZE = 1000
+
+
+def repo_rows(issues: list[dict]) -> list[dict]:
+    """이슈 목록에서 중복 없는 repos 행 추출"""
+    rows = {}
+    for issue in issues:
+        name = issue.get("repo_full_name")
+        if name and name not in rows:
+            rows[name] = {
+                "repo_full_name": name,
+                "repo_owner": issue.get("repo_owner", ""),
+                "repo_name": issue.get("repo_name", ""),
+            }
+    return list(rows.values())
+
+
+def upsert_repos(client, issues: list[dict], pacer: AdaptivePacer | None = None) -> tuple[list[str], list]:
+    """
+    이슈에 등장한 레포 중 repos에 없는 것만 insert (기존 stars/language는 유지)
+    일시적 오류는 batching.write_in_chunks가 재시도, 그래도 실패한 레포는 호출자에게 반환
+    (그 레포의 이슈는 fk_issues_repo 위반으로 어차피 쓸 수 없음)
+    Returns: (새로 추가된 레포 이름 목록, 실패한 (repos 행, 오류) 목록)
+    """
+    inserted = []
+
+    def write(chunk: list[dict]):
+        result = client.table("repos").upsert(
+            chunk,
+            on_conflict="repo_full_name",
+            ignore_duplicates=True
+        ).execute()
+        inserted.extend(row["repo_full_name"] for row in result.data or [])
+
+    _, failed = write_in_chunks(repo_rows(issues), write, REPO_UPSERT_CHUNK_SIZE, label="repo", pacer=pacer)
+    return inserted, failed
@@ -0,0 +1,178 @@
+-- ============================================
+-- Repos dimension table
+-- stars/language를 이슈마다 복사하지 않고 레포당 1행으로 저장
+-- Run this in Supabase SQL Editor (bulk_repo_metadata.sql 이후)
+-- ============================================
+
+-- 1. repos 테이블
+-- ============================================
+CREATE TABLE IF NOT EXISTS repos (
+    repo_full_name TEXT PRIMARY KEY,
+    repo_owner TEXT NOT NULL,
+    repo_name TEXT NOT NULL,
+    stars INTEGER,
+    language TEXT,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_repos_stars_desc ON repos(stars DESC NULLS LAST);
+CREATE INDEX IF NOT EXISTS idx_repos_language ON repos(language) WHERE language IS NOT NULL;
+
+-- 보강 대상 조회용 (repo_checked_at.sql에서 idx_repos_unchecked로 교체)
+CREATE INDEX IF NOT EXISTS idx_repos_unenriched
+ON repos(repo_full_name) WHERE stars IS NULL OR language IS NULL;
+
+ALTER TABLE repos ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Public read access" ON repos;
+CREATE POLICY "Public read access" ON repos
+    FOR SELECT USING (true);
+
+
+-- 2. 기존 issues 데이터로 repos 채우기
+-- ============================================
+INSERT INTO repos (repo_full_name, repo_owner, repo_name, stars, language)
+SELECT repo_full_name, MAX(repo_owner), MAX(repo_name), MAX(stars), MAX(language)
+FROM issues
+GROUP BY repo_full_name
+ON CONFLICT (repo_full_name) DO NOTHING;
+
+
+-- 3. issues → repos 참조
+-- ============================================
+ALTER TABLE issues DROP CONSTRAINT IF EXISTS fk_issues_repo;
+ALTER TABLE issues
+    ADD CONSTRAINT fk_issues_repo FOREIGN KEY (repo_full_name)
+    REFERENCES repos(repo_full_name) NOT VALID;
+ALTER TABLE issues VALIDATE CONSTRAINT fk_issues_repo;
+
+
+-- 4. 프론트엔드 조회용 뷰 (issues + repos의 stars/language)
+-- ============================================
+CREATE OR REPLACE VIEW issue_feed
+WITH (security_invoker = true)
+AS
+SELECT
+    i.id,
+    i.github_id,
+    i.repo_full_name,
+    i.repo_owner,
+    i.repo_name,
+    i.issue_number,
+    i.title,
+    i.url,
+    i.author,
+    i.labels,
+    i.comment_count,
+    i.created_at,
+    i.updated_at,
+    i.is_open,
+    r.stars,
+    r.language
+FROM issues i
+JOIN repos r ON r.repo_full_name = i.repo_full_name;
+
+GRANT SELECT ON issue_feed TO anon, authenticated;
+
+
+-- 5. Materialized views를 repos 기준으로 재생성
+-- ============================================
+DROP MATERIALIZED VIEW IF EXISTS repo_stats CASCADE;
+
+CREATE MATERIALIZED VIEW repo_stats AS
+SELECT
+    i.repo_full_name,
+    r.repo_owner,
+    r.repo_name,
+    COUNT(*) AS issue_count,
+    r.language,
+    r.stars,
+    MAX(i.created_at) AS last_issue_at
+FROM issues i
+JOIN repos r ON r.repo_full_name = i.repo_full_name
+WHERE i.is_open = true
+GROUP BY i.repo_full_name, r.repo_owner, r.repo_name, r.language, r.stars;
+
+CREATE UNIQUE INDEX idx_repo_stats_pk ON repo_stats(repo_full_name);
+CREATE INDEX idx_repo_stats_owner ON repo_stats(repo_owner);
+CREATE INDEX idx_repo_stats_stars ON repo_stats(stars DESC NULLS LAST);
+CREATE INDEX idx_repo_stats_issues ON repo_stats(issue_count DESC);
+CREATE INDEX idx_repo_stats_lang ON repo_stats(language);
+CREATE INDEX idx_repo_stats_search ON repo_stats USING gin(repo_full_name gin_trgm_ops);
+
+DROP MATERIALIZED VIEW IF EXISTS org_stats CASCADE;
+
+CREATE MATERIALIZED VIEW org_stats AS
+SELECT
+    r.repo_owner AS org_name,
+    COUNT(DISTINCT i.repo_full_name) AS repo_count,
+    COUNT(*) AS issue_count,
+    MAX(r.stars) AS max_stars,
+    MODE() WITHIN GROUP (ORDER BY r.language) AS top_language
+FROM issues i
+JOIN repos r ON r.repo_full_name = i.repo_full_name
+WHERE i.is_open = true
+GROUP BY r.repo_owner;
+
+CREATE UNIQUE INDEX idx_org_stats_pk ON org_stats(org_name);
+CREATE INDEX idx_org_stats_issues ON org_stats(issue_count DESC);
+CREATE INDEX idx_org_stats_repos ON org_stats(repo_count DESC);
+CREATE INDEX idx_org_stats_stars ON org_stats(max_stars DESC NULLS LAST);
+CREATE INDEX idx_org_stats_search ON org_stats USING gin(org_name gin_trgm_ops);
+
+DROP MATERIALIZED VIEW IF EXISTS language_stats CASCADE;
+
+CREATE MATERIALIZED VIEW language_stats AS
+SELECT
+    r.language,
+    COUNT(*) AS issue_count,
+    COUNT(DISTINCT i.repo_full_name) AS repo_count
+FROM issues i
+JOIN repos r ON r.repo_full_name = i.repo_full_name
+WHERE i.is_open = true AND r.language IS NOT NULL
+GROUP BY r.language
+ORDER BY issue_count DESC;
+
+CREATE UNIQUE INDEX idx_language_stats_pk ON language_stats(language);
+
+GRANT SELECT ON repo_stats TO anon, authenticated;
+GRANT SELECT ON org_stats TO anon, authenticated;
+GRANT SELECT ON language_stats TO anon, authenticated;
+
+
+-- 6. 보강 RPC: issues 대신 repos만 갱신 (레포당 1행)
+-- ============================================
+CREATE OR REPLACE FUNCTION public.bulk_update_repo_metadata(payload jsonb)
+RETURNS integer
+LANGUAGE plpgsql
+SET search_path = public
+AS $func$
+DECLARE
+    updated integer;
+BEGIN
+    UPDATE repos r
+    SET stars = p.stars,
+        language = p.language
+    FROM jsonb_to_recordset(payload) AS p(repo_full_name text, stars integer, language text)
+    WHERE r.repo_full_name = p.repo_full_name;
+
+    GET DIAGNOSTICS updated = ROW_COUNT;
+    RETURN updated;
+END;
+$func$;
+
+
+-- 7. issues의 중복 컬럼 제거 (이제 repos에서 조회)
+-- ============================================
+DROP INDEX IF EXISTS idx_issues_open_lang_stars;
+ALTER TABLE issues DROP COLUMN IF EXISTS stars;
+ALTER TABLE issues DROP COLUMN IF EXISTS language;
+
+
+-- 8. 재생성한 view 초기 refresh + schema cache reload
+-- ============================================
+REFRESH MATERIALIZED VIEW repo_stats;
+REFRESH MATERIALIZED VIEW org_stats;
+REFRESH MATERIALIZED VIEW language_stats;
+
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,75 @@
+"""
+보존 기간 정리 (fetch_issues.cleanup_old_issues)
+- created_at 구간 단위로 나눠 삭제: 문장 하나가 오래 잡고 있지 않도록 (장애 후 밀린 정리도 구간별로)
+- count=exact + return=minimal: 삭제된 행 대신 Content-Range의 개수만 받음
+- 구간 크기는 삭제 건수에 맞춰 조절 (많으면 절반, 적으면 두 배, 실패하면 절반으로 재시도)
+"""
+
+from datetime import datetime, timedelta
+
+from postgrest.types import CountMethod, ReturnMethod
+
+RETENTION_TARGET_ROWS = 5000  # 구간 하나에서 지울 목표 행 수
+RETENTION_MIN_WINDOW = timedelta(hours=1)
+RETENTION_MAX_WINDOW = timedelta(days=31)
+RETENTION_INITIAL_WINDOW = timedelta(days=1)
+
+
+def oldest_created_at(client, cutoff: datetime) -> datetime | None:
+    result = client.table("issues") \
+        .select("created_at") \
+        .lt("created_at", cutoff.isoformat()) \
+        .order("created_at") \
+        .limit(1) \
+        .execute()
+    if not result.data:
+        return None
+    return datetime.fromisoformat(result.data[0]["created_at"].replace("Z", "+00:00"))
+
+
+def delete_window(client, start: datetime, end: datetime) -> int:
+    result = client.table("issues") \
+        .delete(count=CountMethod.exact, returning=ReturnMethod.minimal) \
+        .gte("created_at", start.isoformat()) \
+        .lt("created_at", end.isoformat()) \
+        .execute()
+    return result.count or 0
+
+
+def delete_expired_in_windows(client, cutoff: datetime) -> int:
+    """가장 오래된 행부터 cutoff까지 created_at 구간별로 삭제"""
+    start = oldest_created_at(client, cutoff)
+    if start is None:
+        return 0
+
+    window = RETENTION_INITIAL_WINDOW
+    deleted = 0
+    statements = 0
+    while start < cutoff:
+        end = min(start + window, cutoff)
+        try:
+            count = delete_window(client, start, end)
+        except Exception as e:
+            if window <= RETENTION_MIN_WINDOW:
+                print(f"  Retention delete failed for {start.isoformat()} ~ {end.isoformat()}: {e}")
+                break
+            window = max(window / 2, RETENTION_MIN_WINDOW)
+            continue
+
+        statements += 1
+        deleted += count
+        start = end
+        if count == 0:
+            # 빈 구간이면 다음 남은 행으로 바로 건너뜀
+            start = oldest_created_at(client, cutoff)
+            if start is None:
+                break
+        elif count > RETENTION_TARGET_ROWS:
+            window = max(window / 2, RETENTION_MIN_WINDOW)
+        elif count < RETENTION_TARGET_ROWS / 4:
+            window = min(window * 2, RETENTION_MAX_WINDOW)
+
+    if statements:
+        print(f"  Retention: {deleted} rows in {statements} windowed deletes")
+    return deleted
+
@@ -0,0 +1,23 @@
+"""
+etl 모듈 오프라인 테스트 공통 설정
+- etl/ 스크립트들은 평평한 모듈이므로 etl/ 를 import 경로에 추가
+- issue_sync 등은 import 시 Supabase 클라이언트를 만들므로 접속하지 않는 더미 값 설정
+  (실제 호출은 테스트에서 fake_supabase.FakeSupabase로 교체)
+
+실행: cd etl && python -m pytest -q tests
+"""
+
+import os
+import sys
+import tempfile
+
+ETL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ETL_DIR)
+
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_KEY", "test")
+os.environ.setdefault("ETL_STATE_BACKEND", "sqlite")
+# 로컬 캐시/상태 파일이 etl/.cache를 건드리지 않도록
+_STATE_DIR = tempfile.mkdtemp(prefix="etl-tests-")
+os.environ.setdefault("ETL_STATE_PATH", os.path.join(_STATE_DIR, "etl_state.sqlite3"))
+os.environ.setdefault("MEMBERSHIP_PATH", os.path.join(_STATE_DIR, "issue_membership.bin"))
@@ -0,0 +1,142 @@
+"""
+테스트용 인메모리 Supabase 클라이언트 (쓰기 경로가 쓰는 PostgREST 빌더 호출만)
+- issues(url 키), repos(repo_full_name 키) 저장, issues upsert 시 fk_issues_repo 검사
+- fail()로 특정 테이블/작업(+행 조건)에 SQLSTATE 코드가 있는 APIError 또는 5xx 주입
+- 조회는 빈 결과 (변경 감지/membership은 "저장된 것 없음"으로 동작)
+"""
+
+from postgrest.exceptions import APIError
+
+
+def api_error(code: str, message: str = "") -> APIError:
+    return APIError({"code": code, "message": message or code, "details": None, "hint": None})
+
+
+def unavailable() -> APIError:
+    """응답 본문 없는 5xx (PostgREST가 SQLSTATE 대신 HTTP 상태를 code로 채움)"""
+    return APIError({"code": "503", "message": "Service Unavailable", "details": None, "hint": None})
+
+
+class Result:
+    def __init__(self, data=None, count=None):
+        self.data = data
+        self.count = count
+
+
+class Query:
+    def __init__(self, client, table: str, op: str | None = None, payload=None):
+        self.client = client
+        self.table = table
+        self.op = op
+        self.payload = payload
+        self.options = {}
+        self.filters = []
+
+    def select(self, *columns, **options):
+        self.op = "select"
+        self.options = options
+        return self
+
+    def upsert(self, payload, **options):
+        self.op = "upsert"
+        self.payload = payload if isinstance(payload, list) else [payload]
+        self.options = options
+        return self
+
+    def delete(self, **options):
+        self.op = "delete"
+        self.options = options
+        return self
+
+    def _filter(self, op: str, column: str, value):
+        self.filters.append((op, column, value))
+        return self
+
+    def eq(self, column, value):
+        return self._filter("eq", column, value)
+
+    def gt(self, column, value):
+        return self._filter("gt", column, value)
+
+    def gte(self, column, value):
+        return self._filter("gte", column, value)
+
+    def lt(self, column, value):
+        return self._filter("lt", column, value)
+
+    def in_(self, column, values):
+        return self._filter("in", column, list(values))
+
+    def order(self, *args, **kwargs):
+        return self
+
+    def limit(self, *args, **kwargs):
+        return self
+
+    def execute(self) -> Result:
+        return self.client.execute(self)
+
+
+class FakeSupabase:
+    KEYS = {"issues": "url", "repos": "repo_full_name"}
+
+    def __init__(self):
+        self.tables = {"issues": {}, "repos": {}}
+        self.requests: list[tuple[str, str, int]] = []  # (table, op, 행 수)
+        self.rpc_payloads: list[list[dict]] = []
+        self.faults = []
+
+    def fail(self, table: str, op: str, error, when=None) -> None:
+        """table/op 요청에 error 발생. when(row)이 있으면 그 조건의 행이 포함된 요청만"""
+        self.faults.append((table, op, error, when))
+
+    def table(self, name: str) -> Query:
+        return Query(self, name)
+
+    def rpc(self, name: str, params: dict) -> Query:
+        return Query(self, name, "rpc", params)
+
+    def execute(self, query: Query) -> Result:
+        rows = query.payload if query.op == "upsert" else []
+        if query.op == "rpc":
+            rows = query.payload.get("payload") or []
+        self.requests.append((query.table, query.op, len(rows)))
+
+        for table, op, error, when in self.faults:
+            if table == query.table and op == query.op and (when is None or any(when(row) for row in rows)):
+                raise error() if callable(error) else error
+
+        if query.op == "select":
+            return Result([], 0)
+        if query.op == "upsert":
+            return self.upsert(query)
+        if query.op == "delete":
+            return self.delete(query)
+        if query.op == "rpc" and query.table == "bulk_update_issues_by_github_id":
+            self.rpc_payloads.append(rows)
+            return Result(len(rows))
+        return Result(None)
+
+    def upsert(self, query: Query) -> Result:
+        stored = self.tables.setdefault(query.table, {})
+        key = self.KEYS.get(query.table, "id")
+        if query.table == "issues":
+            for row in query.payload:
+                if row["repo_full_name"] not in self.tables["repos"]:
+                    raise api_error("23503", 'insert or update on table "issues" violates foreign key '
+                                             'constraint "fk_issues_repo"')
+        inserted = []
+        for row in query.payload:
+            if row[key] in stored and query.options.get("ignore_duplicates"):
+                continue
+            stored[row[key]] = dict(row)
+            inserted.append(row)
+        return Result(inserted)
+
+    def delete(self, query: Query) -> Result:
+        stored = self.tables.setdefault(query.table, {})
+        deleted = []
+        for op, column, value in query.filters:
+            if op == "in":
+                deleted += [stored.pop(v) for v in value if v in stored]
+        return Result(deleted, len(deleted))
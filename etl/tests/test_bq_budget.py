@@ -0,0 +1,45 @@
+from bq_budget import QueryBudgeter
+
+GB = 1 << 30
+
+
+class MemoryUsageStore:
+    def __init__(self, usage: dict[str, int] | None = None):
+        self.usage = dict(usage or {})
+
+    def load(self, since) -> dict[str, int]:
+        return dict(self.usage)
+
+    def add(self, project, day, used_bytes) -> None:
+        self.usage[project] = self.usage.get(project, 0) + used_bytes
+
+
+def make_budgeter(usage: dict[str, int]) -> QueryBudgeter:
+    return QueryBudgeter(["a", "b", "c"], MemoryUsageStore(usage), monthly_budget=10 * GB)
+
+
+def test_candidates_prefer_projects_that_fit():
+    budgeter = make_budgeter({"a": 9 * GB, "b": 2 * GB, "c": 5 * GB})
+    # 3 GB는 b, c만 감당 → 그 뒤에 남은 예산 순으로 a
+    assert budgeter.candidates(3 * GB) == [1, 2, 0]
+
+
+def test_exhausted_project_is_never_a_candidate():
+    budgeter = make_budgeter({})
+    budgeter.mark_exhausted("b")
+    assert budgeter.candidates(GB) == [0, 2]
+
+
+def test_exhausted_project_excluded_when_estimate_is_zero():
+    # dry run 예상치가 없으면(0) remaining 0인 exhausted 프로젝트도 "감당 가능"으로 보였음
+    budgeter = make_budgeter({"a": 10 * GB})
+    budgeter.mark_exhausted("b")
+    budgeter.mark_exhausted("c")
+    assert budgeter.candidates(0) == [0]
+
+
+def test_all_exhausted_returns_no_candidates():
+    budgeter = make_budgeter({})
+    for project in ("a", "b", "c"):
+        budgeter.mark_exhausted(project)
+    assert budgeter.candidates(0) == []
@@ -0,0 +1,53 @@
+"""
+같은 created_at(초 단위)의 이벤트는 GitHub 이벤트 id 순으로 fold (파일/결과 순서와 무관하게 같은 최종 상태)
+"""
+
+import gzip
+import json
+
+from gharchive_files import read_archive_rows
+from issue_events import fold_issue_events
+from issue_sync import classify_event
+
+URL = "https://github.com/o/r/issues/1"
+
+
+def event(event_id: int, action: str, state: str) -> dict:
+    return {
+        "id": str(event_id),
+        "type": "IssuesEvent",
+        "created_at": "2024-01-01T00:10:00Z",
+        "repo": {"name": "o/r"},
+        "payload": {
+            "action": action,
+            "issue": {
+                "id": 1001, "number": 1, "title": "issue", "html_url": URL, "user": {"login": "u"},
+                "labels": [{"name": "good first issue"}], "state": state,
+                "created_at": "2024-01-01T00:10:00Z", "comments": 0,
+            },
+        },
+    }
+
+
+def final_state(tmp_path, events: list[dict]) -> str:
+    path = tmp_path / "2024-01-01-0.json.gz"
+    with gzip.open(path, "wt") as f:
+        for e in events:
+            f.write(json.dumps(e) + "\n")
+    rows = read_archive_rows([str(path)], workers=1)
+    [(kind, url, _)] = fold_issue_events(c for c in map(classify_event, rows) if c)
+    assert url == URL
+    return kind
+
+
+def test_same_second_events_fold_in_event_id_order(tmp_path):
+    opened, closed = event(101, "opened", "open"), event(102, "closed", "closed")
+
+    assert final_state(tmp_path, [opened, closed]) == "closed"
+    assert final_state(tmp_path, [closed, opened]) == "closed"
+
+
+def test_reopen_in_same_second_wins_over_close(tmp_path):
+    closed, reopened = event(201, "closed", "closed"), event(202, "reopened", "open")
+
+    assert final_state(tmp_path, [reopened, closed]) == "upsert"
@@ -0,0 +1,72 @@
+"""
+labels.bigquery_label_udfs()가 만드는 SQL 판정이 labels.is_good_first_label과 같은지 오프라인 검사
+(check_label_sql.py는 같은 비교를 실제 BigQuery에서 실행)
+생성된 UDF 본문의 REGEXP_REPLACE/REGEXP_CONTAINS/AND/OR를 Python으로 옮겨 평가 - 패턴은 RE2/re 공통 문법만 사용
+"""
+
+import re
+
+import pytest
+
+from bench_labels import COMMON_LABELS, build_corpus
+from labels import bigquery_label_udfs, is_good_first_label
+
+UDFS = bigquery_label_udfs()
+
+
+def udf_body(name: str) -> str:
+    match = re.search(rf"CREATE TEMP FUNCTION {name}\([^)]*\) AS \((.*?)\n    \);", UDFS, re.S)
+    assert match, f"{name} not found in bigquery_label_udfs()"
+    return match.group(1)
+
+
+def compile_normalize():
+    body = udf_body("gfi_normalize")
+    pattern = re.search(r"REGEXP_REPLACE\(LOWER\(IFNULL\(label, ''\)\), r'([^']*)', ' '\)", body).group(1)
+    compiled = re.compile(pattern)
+    return lambda label: compiled.sub(" ", (label or "").lower()).strip()
+
+
+def compile_match():
+    expr = re.sub(
+        r"REGEXP_CONTAINS\(n, r'([^']*)'\)",
+        lambda m: f"contains({m.group(1)!r}, n)",
+        udf_body("gfi_match"),
+    )
+    expr = re.sub(r"\bAND\b", "and", re.sub(r"\bOR\b", "or", expr))
+    assert "REGEXP" not in expr, expr
+    return eval(f"lambda n: {expr.strip()}", {"contains": lambda pattern, n: re.search(pattern, n) is not None})
+
+
+sql_normalize = compile_normalize()
+sql_match = compile_match()
+
+
+def sql_is_good_first_label(label: str) -> bool:
+    return bool(sql_match(sql_normalize(label)))
+
+
+def fixture_labels() -> list[str]:
+    vocab, _ = build_corpus(3000, 0, seed=7)
+    return sorted(set(vocab) | set(COMMON_LABELS) | {"", "   ", "FIRST", "first", "Issue-First", "easy_"})
+
+
+@pytest.mark.parametrize("label", COMMON_LABELS)
+def test_common_labels_match_python(label):
+    assert sql_is_good_first_label(label) == is_good_first_label(label)
+
+
+def test_corpus_matches_python():
+    labels = fixture_labels()
+    mismatches = [label for label in labels if sql_is_good_first_label(label) != is_good_first_label(label)]
+    assert not mismatches, mismatches[:20]
+    # 양쪽 판정이 모두 나오는 코퍼스인지 (전부 False면 비교가 의미 없음)
+    assert any(is_good_first_label(label) for label in labels)
+    assert not all(is_good_first_label(label) for label in labels)
+
+
+def test_has_good_first_label_checks_each_name():
+    # 배열 UDF는 각 원소의 $.name을 같은 is_good_first_label로 판정
+    body = udf_body("has_good_first_label")
+    assert "JSON_EXTRACT_ARRAY(labels_json)" in body
+    assert "is_good_first_label(JSON_EXTRACT_SCALAR(l, '$.name'))" in body
@@ -0,0 +1,86 @@
+"""
+닫힌 이슈 정합성 확인: GraphQL alias별 오류 분류와 NOT_FOUND 외 오류 레포의 backoff
+"""
+
+import pytest
+
+import fetch_issues_github as fig
+
+
+def row(issue_id: int, repo: str, number: int) -> dict:
+    return {"id": issue_id, "repo_full_name": repo, "issue_number": number, "updated_at": "2024-01-01T00:00:00Z"}
+
+
+def graphql_response(rows: list[dict], repo_errors: dict[str, str], closed: set[int] = frozenset()) -> dict:
+    """build_issue_state_query와 같은 alias 규칙으로 응답 생성 (repo_errors: 레포 → 오류 type)"""
+    aliases = {}
+    for r in rows:
+        aliases.setdefault(r["repo_full_name"], f"r{len(aliases)}")
+    data, errors = {}, []
+    for repo, alias in aliases.items():
+        if repo in repo_errors:
+            data[alias] = None
+            errors.append({"type": repo_errors[repo], "path": [alias]})
+            continue
+        data[alias] = {
+            f"i{r['issue_number']}": {"state": "CLOSED" if r["id"] in closed else "OPEN"}
+            for r in rows if r["repo_full_name"] == repo
+        }
+    body = {"data": data}
+    if errors:
+        body["errors"] = errors
+    return body
+
+
+@pytest.fixture
+def graphql(monkeypatch):
+    state = {"repo_errors": {}, "closed": set(), "requests": []}
+
+    def post_graphql(query, variables, headers, limiter, label):
+        rows = state["rows"]
+        repos = {f"{variables[f'o{i}']}/{variables[f'n{i}']}" for i in range(len(variables) // 2)}
+        chunk = [r for r in rows if r["repo_full_name"] in repos and f"i{r['issue_number']}:" in query]
+        state["requests"].append(len(chunk))
+        return graphql_response(chunk, state["repo_errors"], state["closed"])
+
+    monkeypatch.setattr(fig, "post_graphql", post_graphql)
+    return state
+
+
+def test_forbidden_repo_is_blocked_not_closed(graphql):
+    rows = [row(1, "o/gone", 1), row(2, "o/saml", 2), row(3, "o/ok", 3), row(4, "o/ok", 4)]
+    graphql.update(rows=rows, repo_errors={"o/gone": "NOT_FOUND", "o/saml": "FORBIDDEN"}, closed={4})
+
+    closed, blocked = fig.fetch_closed_issue_ids(rows)
+
+    assert sorted(closed) == [1, 4]
+    assert blocked == {"o/saml": "FORBIDDEN"}
+
+
+def test_all_aliases_forbidden_is_not_a_failed_request(monkeypatch):
+    rows = [row(1, "o/saml", 1)]
+    # alias 하나뿐이면 GraphQL이 data 자체를 null로 줄 수 있음
+    monkeypatch.setattr(fig, "post_graphql", lambda *args: {
+        "data": None, "errors": [{"type": "FORBIDDEN", "path": ["r0"]}],
+    })
+
+    assert fig.fetch_closed_issue_ids(rows) == ([], {"o/saml": "FORBIDDEN"})
+
+
+def test_mark_closed_issues_backs_off_blocked_repos(graphql, monkeypatch):
+    rows = [row(1, "o/waiting", 1), row(2, "o/saml", 2), row(3, "o/retry", 3), row(4, "o/ok", 4)]
+    graphql.update(rows=rows, repo_errors={"o/saml": "FORBIDDEN"}, closed={4})
+    deleted, recorded = [], []
+    monkeypatch.setattr(fig, "GITHUB_TOKEN", "token")
+    monkeypatch.setattr(fig, "iter_open_issue_pages", lambda: iter([rows]))
+    monkeypatch.setattr(fig, "delete_issue_ids", lambda ids: deleted.extend(ids) or len(ids))
+    monkeypatch.setattr(fig, "load_reconcile_backoff", lambda: ({"o/waiting"}, {"o/retry", "o/saml"}))
+    monkeypatch.setattr(fig, "record_reconcile_results", lambda blocked, recovered: recorded.append((blocked, recovered)))
+
+    fig.mark_closed_issues()
+
+    # backoff 중인 레포는 요청하지 않음
+    assert graphql["requests"] == [3]
+    assert deleted == [4]
+    # 막힌 레포는 다시 미루고, backoff 후 응답한 레포는 초기화
+    assert recorded == [({"o/saml"}, {"o/retry"})]
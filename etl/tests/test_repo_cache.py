@@ -0,0 +1,40 @@
+import sqlite3
+
+from repo_cache import RepoMetadataCache
+
+
+def stored(path: str) -> dict:
+    """다른 프로세스가 보는 commit된 항목 (repo → etag)"""
+    conn = sqlite3.connect(path)
+    try:
+        return dict(conn.execute("SELECT repo_full_name, etag FROM repo_metadata").fetchall())
+    finally:
+        conn.close()
+
+
+def test_entries_committed_without_close(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = RepoMetadataCache(path, commit_every=2)
+    cache.put("o/a", {"stars": 1}, etag='"a"')
+    cache.put("o/b", {"stars": 2}, etag='"b"')
+    cache.put("o/c", {"stars": 3})
+
+    # close() 없이 끊긴 실행: commit_every에 도달한 항목은 다른 연결에서 보임
+    assert stored(path) == {"o/a": '"a"', "o/b": '"b"'}
+
+    cache.flush()
+    assert set(stored(path)) == {"o/a", "o/b", "o/c"}
+
+
+def test_close_is_idempotent(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = RepoMetadataCache(path)
+    cache.put("o/a", None)
+    cache.close()
+    cache.close()
+    cache.flush()
+
+    reopened = RepoMetadataCache(path)
+    entry = reopened.get("o/a")
+    assert entry is not None and entry.metadata is None
+    reopened.close()
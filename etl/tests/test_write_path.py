@@ -0,0 +1,246 @@
+"""
+issues 쓰기 경로: 청크 이분/재시도(batching), 오류 분류와 github_id 충돌 반영(issue_sync.write_issue_rows),
+일시적 실패 시 watermark 보류(gharchive_files.main, 다른 진입점과 같은 guard)
+"""
+
+import gzip
+import json
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+import batching
+import issue_sync
+from batching import MAX_TRANSIENT_RETRIES, write_in_chunks
+from checkpoint import get_checkpoint_store
+from fake_supabase import FakeSupabase, api_error, unavailable
+from membership import IssueMembership
+
+
+@pytest.fixture(autouse=True)
+def no_pacing(monkeypatch):
+    monkeypatch.setattr(batching.time, "sleep", lambda seconds: None)
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    fake = FakeSupabase()
+    monkeypatch.setattr(issue_sync, "supabase", fake)
+    monkeypatch.setattr(issue_sync, "membership", IssueMembership(str(tmp_path / "membership.bin")))
+    monkeypatch.setitem(issue_sync.write_failures, "upsert", 0)
+    monkeypatch.setitem(issue_sync.write_failures, "delete", 0)
+    return fake
+
+
+def issue_row(n: int, repo: str = "o/r") -> dict:
+    owner, name = repo.split("/")
+    return {
+        "github_id": 1000 + n,
+        "issue_number": n,
+        "repo_full_name": repo,
+        "repo_owner": owner,
+        "repo_name": name,
+        "title": f"issue {n}",
+        "url": f"https://github.com/{repo}/issues/{n}",
+        "labels": ["good first issue"],
+        "created_at": "2024-01-01T00:00:00+00:00",
+        "updated_at": "2024-01-01T00:00:00+00:00",
+        "comment_count": 0,
+        "is_open": True,
+    }
+
+
+def issue_requests(client: FakeSupabase) -> list[int]:
+    return [size for table, op, size in client.requests if (table, op) == ("issues", "upsert")]
+
+
+# ----- batching.write_in_chunks -----
+
+def test_data_error_bisects_to_the_bad_row():
+    calls = []
+
+    def write(chunk):
+        calls.append(len(chunk))
+        if 5 in chunk:
+            raise api_error("22P02", "invalid input syntax")
+
+    written, failed = write_in_chunks(list(range(8)), write, chunk_size=8)
+
+    assert written == 7
+    assert [row for row, _ in failed] == [5]
+    assert calls == [8, 4, 4, 2, 1, 1, 2]  # O(log n) 요청으로 격리
+
+
+def test_transient_error_retries_whole_chunk_without_splitting():
+    calls = []
+
+    def write(chunk):
+        calls.append(len(chunk))
+        raise unavailable()
+
+    written, failed = write_in_chunks(list(range(10)), write, chunk_size=10)
+
+    assert written == 0
+    assert len(failed) == 10
+    assert calls == [10] * (MAX_TRANSIENT_RETRIES + 1)
+
+
+def test_transient_error_recovers_on_retry():
+    calls = []
+
+    def write(chunk):
+        calls.append(len(chunk))
+        if len(calls) == 1:
+            raise unavailable()
+
+    assert write_in_chunks(list(range(10)), write, chunk_size=10) == (10, [])
+    assert calls == [10, 10]
+
+
+# ----- issue_sync.write_issue_rows -----
+
+def test_clean_rows_are_written_with_their_repos(client):
+    rows = [issue_row(n, repo) for n, repo in enumerate(["o/a", "o/b", "o/a"])]
+
+    assert issue_sync.write_issue_rows(client, rows) == (3, 0, 0)
+    assert set(client.tables["repos"]) == {"o/a", "o/b"}
+    assert len(client.tables["issues"]) == 3
+
+
+def test_github_id_conflicts_go_to_the_bulk_update(client):
+    rows = [issue_row(n) for n in range(6)]
+    moved, bad = rows[1], rows[4]
+    client.fail("issues", "upsert",
+                api_error("23505", 'duplicate key value violates unique constraint "idx_issues_github_id"'),
+                when=lambda row: row["url"] == moved["url"])
+    client.fail("issues", "upsert", api_error("22001", "value too long"),
+                when=lambda row: row["url"] == bad["url"])
+
+    written, recovered, transient = issue_sync.write_issue_rows(client, rows)
+
+    assert (written, recovered, transient) == (4, 1, 0)
+    # 데이터 오류 행은 RPC에 보내지 않음 (UPDATE 전체가 실패하므로)
+    assert client.rpc_payloads == [[moved]]
+
+
+def test_failed_github_id_update_counts_as_transient(client):
+    rows = [issue_row(n) for n in range(3)]
+    client.fail("issues", "upsert",
+                api_error("23505", 'duplicate key value violates unique constraint "idx_issues_github_id"'),
+                when=lambda row: row["url"] == rows[0]["url"])
+    client.fail("bulk_update_issues_by_github_id", "rpc", unavailable)
+
+    assert issue_sync.write_issue_rows(client, rows) == (2, 0, 1)
+
+
+def test_server_errors_are_transient_and_not_bisected(client):
+    rows = [issue_row(n) for n in range(150)]
+    client.fail("issues", "upsert", unavailable)
+
+    assert issue_sync.write_issue_rows(client, rows) == (0, 0, 150)
+    # 청크(100, 50)마다 재시도만, 이분 없음
+    assert issue_requests(client) == [100] * (MAX_TRANSIENT_RETRIES + 1) + [50] * (MAX_TRANSIENT_RETRIES + 1)
+
+
+def test_repo_fk_violation_is_transient_and_not_bisected(client):
+    rows = [issue_row(n) for n in range(10)]
+    # repos 행은 써졌다고 응답했지만 issues 쓰기 시점에 없음 (다른 프로세스가 지움 등)
+    client.fail("issues", "upsert", api_error(
+        "23503", 'insert or update on table "issues" violates foreign key constraint "fk_issues_repo"'))
+
+    assert issue_sync.write_issue_rows(client, rows) == (0, 0, 10)
+    assert issue_requests(client) == [10] * (MAX_TRANSIENT_RETRIES + 1)
+
+
+def test_issues_of_unwritten_repos_are_held(client):
+    rows = [issue_row(0, "o/a"), issue_row(1, "o/b"), issue_row(2, "o/a")]
+    client.fail("repos", "upsert", unavailable)
+
+    # 예전에는 repos 오류를 무시하고 issues를 보내 FK 위반 → 행마다 이분 → 데이터 오류로 버려짐
+    assert issue_sync.write_issue_rows(client, rows) == (0, 0, 3)
+    assert issue_requests(client) == []
+
+
+def test_issues_of_invalid_repos_are_skipped_not_held(client):
+    rows = [issue_row(0, "o/bad"), issue_row(1, "o/ok")]
+    client.fail("repos", "upsert", api_error("23502", "null value in column"),
+                when=lambda row: row["repo_full_name"] == "o/bad")
+
+    # 다시 읽어도 같은 결과인 데이터 오류 → watermark를 막지 않음
+    assert issue_sync.write_issue_rows(client, rows) == (1, 0, 0)
+
+
+def test_upsert_issues_records_transient_failures(client):
+    client.fail("issues", "upsert", unavailable)
+
+    issue_sync.upsert_issues([issue_row(n) for n in range(3)])
+
+    assert issue_sync.write_failures == {"upsert": 3, "delete": 0}
+
+
+# ----- watermark (gharchive_files.main) -----
+
+def archive_event(n: int, minute: int) -> dict:
+    created = f"2024-01-01T00:{minute:02d}:00Z"
+    return {
+        "type": "IssuesEvent",
+        "created_at": created,
+        "repo": {"name": "o/r"},
+        "payload": {
+            "action": "opened",
+            "issue": {
+                "id": 1000 + n, "number": n, "title": f"issue {n}",
+                "html_url": f"https://github.com/o/r/issues/{n}", "user": {"login": "u"},
+                "labels": [{"name": "good first issue"}], "state": "open",
+                "created_at": created, "comments": 0,
+            },
+        },
+    }
+
+
+@pytest.fixture
+def run_archive(client, monkeypatch, tmp_path):
+    archive = tmp_path / "archive"
+    archive.mkdir()
+    with gzip.open(archive / "2024-01-01-0.json.gz", "wt") as f:
+        for n, minute in ((1, 10), (2, 20)):
+            f.write(json.dumps(archive_event(n, minute)) + "\n")
+    monkeypatch.setenv("ETL_STATE_PATH", str(tmp_path / "etl_state.sqlite3"))
+
+    def run():
+        import gharchive_files
+        monkeypatch.setattr(sys, "argv", ["gharchive_files.py", str(archive), "--since", "2024-01-01",
+                                          "--workers", "1"])
+        gharchive_files.main()
+        return get_checkpoint_store().get(gharchive_files.CHECKPOINT_SOURCE)
+
+    return run
+
+
+def test_watermark_advances_when_all_writes_succeed(client, run_archive):
+    assert run_archive() == datetime(2024, 1, 1, 0, 20, tzinfo=timezone.utc)
+    assert len(client.tables["issues"]) == 2
+
+
+def test_watermark_held_on_transient_write_failure(client, run_archive):
+    client.fail("issues", "upsert", unavailable)
+
+    assert run_archive() is None
+    assert issue_sync.write_failures["upsert"] == 2
+
+
+def test_watermark_held_when_repo_write_fails(client, run_archive):
+    client.fail("repos", "upsert", unavailable)
+
+    assert run_archive() is None
+    assert not client.tables["issues"]
+
+
+def test_watermark_advances_past_permanent_data_errors(client, run_archive):
+    # 다시 읽어도 실패할 행 때문에 watermark가 영원히 멈추지 않음
+    client.fail("issues", "upsert", api_error("22001", "value too long"),
+                when=lambda row: row["issue_number"] == 2)
+
+    assert run_archive() == datetime(2024, 1, 1, 0, 20, tzinfo=timezone.utc)
+    assert len(client.tables["issues"]) == 1
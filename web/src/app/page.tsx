@@ -46,8 +46,9 @@ async function getIssues(params: {
   const to = from + PAGE_SIZE - 1
   const sort = params.sort || 'newest'
 
+  // issue_feed: issues joined with repos for stars/language
   let query = supabase
-    .from('issues')
+    .from('issue_feed')
     .select('*', { count: 'exact' })
     .eq('is_open', true)
 